@@ -1,6 +1,5 @@
-from fastapi import Depends, HTTPException
-from jose import jwt, JWTError
-from core.config import jwt_settings
+from fastapi import Depends, HTTPException, Request
+from core.security import get_token_payload
 from fastapi import Security
 from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 
@@ -16,6 +15,7 @@ def verify_token(access_token=Security(APIKeyHeader(name="access-token"))):
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(verify_token),
     # token: str = Depends(oauth2_scheme),
     user_service: UserService = Depends(UserService)
@@ -25,12 +25,13 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, jwt_settings.SECRET_KEY, algorithms=[jwt_settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    # RequestMiddleware 에서 같은 token 을 검증했으면 그 결과를 사용
+    if getattr(request.state, "access_token", None) == token:
+        payload = request.state.token_payload
+    else:
+        payload = get_token_payload(token)
+    email: str = payload.get("sub") if payload else None
+    if email is None:
         raise credentials_exception
     user = await user_service.get_user_by_email(email)
     if user is None:
@@ -8,6 +8,8 @@ from .statistic import router as statistic_router
 from .custom_product import router as custom_product_router
 from .notice import router as notice_router
 from .faq import router as faq_router
+from .kamis import router as kamis_router
+from .security import router as security_router
 
 router = APIRouter(prefix="/v1")
 
@@ -19,4 +21,6 @@ router.include_router(past_order_router)
 router.include_router(custom_product_router)
 router.include_router(statistic_router)
 router.include_router(notice_router)
-router.include_router(faq_router)
\ No newline at end of file
+router.include_router(faq_router)
+router.include_router(kamis_router)
+router.include_router(security_router)
\ No newline at end of file
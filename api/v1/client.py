@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta, date
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
 
 from core.decorator.decorator import handle_exceptions
@@ -107,27 +107,32 @@ async def delete_client(client_id: int,
 @router.get("/clients/{client_id}/quotations",
             response_model=ApiResponse[ClientPaginatedResponse],
             summary="거래처 견적서 조회 ",
-            description="거래처의 모든 견적서를 조회 합니다. page -> 페이지 시작 번호, page_size -> 페이지 당 반환 개수")
+            description="거래처의 모든 견적서를 조회 합니다. cursor -> 이전 응답의 next_cursor (첫 페이지는 생략), "
+                        "page_size -> 페이지 당 반환 개수, include_total -> 전체 개수 포함 여부")
 @handle_exceptions(ClientPaginatedResponse)
 async def get_quotations(client_id: int, quotation_service: QuotationService = Depends(QuotationService),
-                         page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+                         cursor: Optional[str] = Query(None), page_size: int = Query(10, ge=1, le=100),
+                         include_total: bool = Query(False),
                          current_user: User = Depends(get_current_user)):
-    quotations = await quotation_service.get_paginated_quotations_for_client(client_id, page, page_size)
+    quotations = await quotation_service.get_paginated_quotations_for_client(client_id, cursor, page_size,
+                                                                             include_total)
     return quotations
 
 
 @router.get("/clients/{client_id}/quotations/date",
             response_model=ApiResponse[ClientPaginatedResponse],
             summary="거래처 견적서 기간에 따른 조회 ",
-            description="거래처의 기간 별 모든 견적서를 조회 합니다. page -> 페이지 시작 번호, page_size -> 페이지 당 반환 개수")
+            description="거래처의 기간 별 모든 견적서를 조회 합니다. cursor -> 이전 응답의 next_cursor (첫 페이지는 생략), "
+                        "page_size -> 페이지 당 반환 개수, include_total -> 전체 개수 포함 여부")
 @handle_exceptions(ClientPaginatedResponse)
 async def get_quotations(
         client_id: int,
         date_range_type: DateRangeType = Query(..., description="기간 옵션 선택 WEEK -> 일주일, MONTH -> 한달, CUSTOM -> 사용자 직접 입력"),
         start_date: datetime = Query(None, description="CUSTOM 선택 시 시작일 (YYYY-MM-DD)"),
         end_date: datetime = Query(None, description="CUSTOM 선택 시 종료일 (YYYY-MM-DD)"),
-        page: int = Query(1, ge=1, description="페이지 번호"),
+        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
         page_size: int = Query(10, ge=1, le=100, description="페이지 사이즈"),
+        include_total: bool = Query(False, description="전체 개수 포함 여부"),
         quotation_service: QuotationService = Depends(QuotationService),
         current_user: User = Depends(get_current_user)
 ):
@@ -145,8 +150,8 @@ async def get_quotations(
         start_date = start_date.date()
         end_date = end_date.date()
 
-    quotations = await quotation_service.get_paginated_quotations_by_date_range(client_id, start_date, end_date, page,
-                                                                                page_size)
+    quotations = await quotation_service.get_paginated_quotations_by_date_range(client_id, start_date, end_date, cursor,
+                                                                                page_size, include_total)
     return quotations
 
 
@@ -0,0 +1,49 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+
+from api.dependencies import get_admin_user
+from core.decorator.decorator import handle_exceptions
+from core.response.api_response import ApiResponse
+from models import User
+from schemas.kamis import KamisProductMappingForm, KamisProductMappingRead, KamisSyncResult
+from service.kamis_sync import KamisSyncService
+
+router = APIRouter(tags=["10. kamis"])
+
+
+@router.get("/kamis/mappings",
+            response_model=ApiResponse[List[KamisProductMappingRead]],
+            summary="KAMIS 품목 연결 정보 조회",
+            description="KAMIS 품목(부류/품목/품종/등급 코드)과 물품의 연결 정보를 조회합니다.")
+@handle_exceptions(List[KamisProductMappingRead])
+async def get_kamis_mappings(kamis_sync_service: KamisSyncService = Depends(KamisSyncService),
+                             current_user: User = Depends(get_admin_user)):
+    mappings = await kamis_sync_service.get_mappings()
+    return [KamisProductMappingRead.model_validate(x) for x in mappings]
+
+
+@router.put("/kamis/mappings",
+            response_model=ApiResponse[List[KamisProductMappingRead]],
+            summary="KAMIS 품목 연결 정보 교체",
+            description="KAMIS 품목과 물품의 연결 정보 전체를 교체합니다. price_multiplier -> KAMIS 가격을 물품 단위 가격으로 바꾸는 배수")
+@handle_exceptions(List[KamisProductMappingRead])
+async def replace_kamis_mappings(mappings: List[KamisProductMappingForm],
+                                 kamis_sync_service: KamisSyncService = Depends(KamisSyncService),
+                                 current_user: User = Depends(get_admin_user)):
+    mappings = await kamis_sync_service.replace_mappings(mappings)
+    return [KamisProductMappingRead.model_validate(x) for x in mappings]
+
+
+@router.post("/kamis/sync",
+             response_model=ApiResponse[KamisSyncResult],
+             summary="KAMIS 도매 시세로 물품 가격 갱신",
+             description="연결된 KAMIS 품목의 기간별 도매 시세를 조회해 최근 평균 가격으로 물품 가격을 일괄 변경합니다. "
+                         "기간 미지정 시 최근 7일, dry_run=true 이면 변경 내역만 반환합니다.")
+@handle_exceptions(KamisSyncResult)
+async def sync_kamis_prices(start_date: Optional[date] = Query(None),
+                            end_date: Optional[date] = Query(None),
+                            dry_run: bool = Query(False),
+                            kamis_sync_service: KamisSyncService = Depends(KamisSyncService),
+                            current_user: User = Depends(get_admin_user)):
+    return await kamis_sync_service.sync_prices(start_date, end_date, dry_run)
@@ -1,11 +1,17 @@
-from typing import List, Sequence
-from fastapi import UploadFile, File, APIRouter, Depends, Query
+from datetime import datetime
+from typing import List, Sequence, Optional
+from fastapi import UploadFile, File, APIRouter, Depends, Query, Header, Response
+from starlette.responses import StreamingResponse
 
 from api.dependencies import get_current_user
 from core.decorator.decorator import handle_exceptions
 from models import User
-from schemas.product import ProductRead, ProductCreate, to_product_read, ProductCount
+from schemas.product import ProductRead, ProductCreate, to_product_read, ProductCount, ProductUploadResult, \
+    VegetablePriceUpdateResult, CatalogSnapshot, ProductAliasForm
+from schemas.upload_job import UploadJobRead, UploadJobKind
+from service.catalog import CatalogService, catalog_etag
 from service.product import ProductService
+from service.upload_job import UploadJobService
 from core.response.api_response import ApiResponse
 from core.response.code.error_status import ErrorStatus
 from core.response.handler.exception_handler import GeneralException
@@ -14,15 +20,49 @@ router = APIRouter(tags=["3. product"])
 
 
 @router.post("/products/upload",
-             response_model=ApiResponse,
+             response_model=ApiResponse[ProductUploadResult],
              summary="물건 견적서 파일 업로드",
-             description="물건 견적서 excel 파일을 업로드해서 Product 모델로 저장합니다.")
-@handle_exceptions()
+             description="물건 견적서 excel 파일을 업로드해서 Product 모델로 저장합니다. 추가/수정/변경 없음 건수를 반환합니다.")
+@handle_exceptions(ProductUploadResult)
 async def upload_excel(file: UploadFile = File(...),
                        product_service: ProductService = Depends(ProductService),
                        current_user: User = Depends(get_current_user)):
-    await product_service.upload_products(file)
-    return ApiResponse.on_success()
+    return await product_service.upload_products(file)
+
+
+@router.get("/products/catalog",
+            response_model=ApiResponse[CatalogSnapshot],
+            summary="물품 카탈로그 스냅샷/변경분 조회",
+            description="전체 물품 목록을 카탈로그 버전(ETag)과 함께 반환합니다. "
+                        "since(이전 응답의 synced_at)를 지정하면 그 이후 추가/수정된 물품과 삭제된 물품 id만 반환하며, "
+                        "If-None-Match 가 현재 ETag 와 같으면 304를 반환합니다.")
+@handle_exceptions(CatalogSnapshot)
+async def get_catalog_snapshot(since: Optional[datetime] = Query(None),
+                               if_none_match: Optional[str] = Header(None),
+                               catalog_service: CatalogService = Depends(CatalogService),
+                               current_user: User = Depends(get_current_user)):
+    catalog_version = await catalog_service.get_catalog_version()
+    headers = {"ETag": catalog_etag(catalog_version)} if catalog_version is not None else {}
+    if catalog_version is not None and if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    body = await catalog_service.get_snapshot(catalog_version, since)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/products/export",
+            summary="전체 물품 excel 파일로 추출",
+            description="전체 물품을 분류 별 sheet 로 작성한 excel 파일을 내려받습니다. "
+                        "sheet 이름으로 쓸 수 없는 분류('/' 포함, 31자 초과)도 보존되도록 분류 열을 함께 기록합니다. "
+                        "파일 형식은 물품 견적서 파일 업로드(/products/upload)와 같아 수정 후 그대로 업로드할 수 있습니다.")
+async def export_products_to_excel_file(product_service: ProductService = Depends(ProductService),
+                                        current_user: User = Depends(get_current_user)):
+    content, filename = await product_service.export_products()
+    headers = {
+        'Content-Disposition': f'attachment; filename*=UTF-8\'\'{filename}'
+    }
+    return StreamingResponse(content, headers=headers,
+                             media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
 
 
 @router.get("/products/{category}",
@@ -95,17 +135,57 @@ async def update_vegetable_product_price(product_id: int, price: int,
 
 
 @router.patch("/products/vegetable/file",
-              response_model=ApiResponse,
+              response_model=ApiResponse[VegetablePriceUpdateResult],
               summary="vegetable(야채) 물품 가격 엑셀 파일로 변경",
-              description="야채 물품의 가격을 엑셀 파일을 통해 변경합니다.")
-@handle_exceptions()
+              description="야채 물품의 가격을 엑셀 파일을 통해 변경합니다. "
+                          "이름이 조금 다른 물품은 유사도로 매칭하며, 애매한 이름은 ambiguous 에 후보와 함께 반환합니다. "
+                          "dry_run=true 이면 변경하지 않고 가격 변경 내역과 매칭 결과만 반환합니다.")
+@handle_exceptions(VegetablePriceUpdateResult)
 async def update_vegetable_product_price(file: UploadFile = File(...),
+                                         dry_run: bool = Query(False),
                                          product_service: ProductService = Depends(ProductService),
                                          current_user: User = Depends(get_current_user)):
-    await product_service.update_vegetable_product_price_from_file(file)
+    return await product_service.update_vegetable_product_price_from_file(file, dry_run)
+
+
+@router.put("/products/aliases",
+            response_model=ApiResponse,
+            summary="가격표 물품 이름 별칭 등록",
+            description="야채 가격 파일 반영 결과의 ambiguous(검토 필요) 이름을 확인한 물품과 연결합니다. "
+                        "등록한 이름은 다음 파일부터 바로 해당 물품으로 매칭됩니다.")
+@handle_exceptions()
+async def save_product_aliases(aliases: List[ProductAliasForm],
+                               product_service: ProductService = Depends(ProductService),
+                               current_user: User = Depends(get_current_user)):
+    await product_service.save_product_aliases({x.alias: x.product_id for x in aliases})
     return ApiResponse.on_success()
 
 
+@router.post("/products/upload/jobs",
+             response_model=ApiResponse[UploadJobRead],
+             summary="물품/야채 가격 excel 파일 업로드 작업 등록",
+             description="파일을 저장한 뒤 파싱/저장 작업을 등록하고 작업 id를 바로 반환합니다. "
+                         "kind -> product(물품 목록), vegetable_price(야채 가격, dry_run 가능)")
+@handle_exceptions(UploadJobRead)
+async def submit_upload_job(file: UploadFile = File(...),
+                            kind: UploadJobKind = Query(UploadJobKind.PRODUCT),
+                            dry_run: bool = Query(False),
+                            upload_job_service: UploadJobService = Depends(UploadJobService),
+                            current_user: User = Depends(get_current_user)):
+    return await upload_job_service.submit_job(file, kind, dry_run)
+
+
+@router.get("/products/upload/jobs/{job_id}",
+            response_model=ApiResponse[UploadJobRead],
+            summary="업로드 작업 진행 상태 조회",
+            description="업로드 작업의 상태(PARSING/WRITING/COMPLETED/FAILED), 처리된 행 수와 결과를 조회합니다.")
+@handle_exceptions(UploadJobRead)
+async def get_upload_job(job_id: str,
+                         upload_job_service: UploadJobService = Depends(UploadJobService),
+                         current_user: User = Depends(get_current_user)):
+    return await upload_job_service.get_job(job_id)
+
+
 @router.get("/products/search/recent",
             response_model=ApiResponse[List[ProductRead]],
             summary="검색제안/자동완성 기능",
@@ -1,17 +1,20 @@
 from datetime import date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
-from starlette.responses import  StreamingResponse
+from starlette.responses import  StreamingResponse, FileResponse
 
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user, get_admin_user
 from core.decorator.decorator import handle_exceptions
 from models import User
 from schemas.quotation import QuotationCreate, QuotationAdd, QuotationUpdate, QuotationRead, QuotationInfo, \
-     QuotationProductUpdate
+     QuotationProductUpdate, QuotationTotalDrift, QuotationSearchResponse, QuotationCacheMetrics, \
+     QuotationUpdateResult
+from schemas.export_job import ExportJobCreate, ExportJobRead
+from service.export_job import ExportJobService
 from service.quotation import QuotationService
 from core.response.api_response import ApiResponse
 from core.response.code.error_status import ErrorStatus
-from core.response.handler.exception_handler import GeneralException
+from core.response.handler.exception_handler import GeneralException, ServiceException
 
 router = APIRouter(tags=["4. quotation"])
 
@@ -30,18 +33,18 @@ async def create_quotation(quotation: QuotationCreate,
 
 
 @router.put("/quotations/{quotation_id}/modify",
-             response_model=ApiResponse,
+             response_model=ApiResponse[QuotationUpdateResult],
              summary="견적서 수정",
-             description="견적서를 수정합니다.")
-@handle_exceptions()
+             description="견적서를 수정합니다. 변경된 물품만 반영하고 추가/수정/삭제된 물품 수를 반환합니다.")
+@handle_exceptions(QuotationUpdateResult)
 async def update_quotation(
     quotation_id: int,
     quotation_data: QuotationUpdate,
     quotation_service: QuotationService = Depends(QuotationService),
     current_user: User = Depends(get_current_user)
 ):
-    await quotation_service.update_quotation(quotation_id, quotation_data)
-    return ApiResponse.on_success()
+    result = await quotation_service.update_quotation(quotation_id, quotation_data)
+    return result
 
 
 @router.delete("/quotations/{quotation_id}/delete",
@@ -112,16 +115,37 @@ async def get_quotation_products(quotation_id: int,
     return quotation
 
 
+@router.get("/quotations/cache/metrics",
+            response_model=ApiResponse[QuotationCacheMetrics],
+            summary="견적서 조회 캐시 지표 (관리자)",
+            description="견적서 조회 캐시의 적중률, 무효화 횟수, 캐시 문서 경과 시간을 조회합니다. (워커 프로세스 단위)")
+@handle_exceptions(QuotationCacheMetrics)
+async def get_quotation_info_cache_metrics(admin_user: User = Depends(get_admin_user)):
+    return QuotationService.get_quotation_info_cache_metrics()
+
+
 @router.get("/quotations/{quotation_id}/total",
             response_model=ApiResponse[int],
-            summary="견적서 합계 금액 업데이트",
-            description="견적서의 합계 금액을 업데이트 합니다.")
+            summary="견적서 합계 금액 조회",
+            description="견적서의 합계 금액을 조회 합니다. 합계 금액은 견적서 물품 변경 시 자동으로 갱신됩니다.")
 @handle_exceptions(int)
-async def update_total_price(quotation_id: int,
-                             quotation_service: QuotationService = Depends(QuotationService),
-                             current_user: User = Depends(get_current_user)):
-    updated_sum = await quotation_service.update_total_price(quotation_id)
-    return updated_sum
+async def get_total_price(quotation_id: int,
+                          quotation_service: QuotationService = Depends(QuotationService),
+                          current_user: User = Depends(get_current_user)):
+    total_price = await quotation_service.get_total_price(quotation_id)
+    return total_price
+
+
+@router.post("/quotations/total/reconcile",
+             response_model=ApiResponse[List[QuotationTotalDrift]],
+             summary="견적서 합계 금액 일괄 보정 (관리자)",
+             description="견적서 물품 합계와 다른 견적서 합계 금액을 찾아 수정합니다. dry_run -> 수정 없이 불일치 목록만 조회")
+@handle_exceptions(List[QuotationTotalDrift])
+async def reconcile_total_prices(dry_run: bool = Query(False, description="수정 없이 불일치 목록만 조회"),
+                                 quotation_service: QuotationService = Depends(QuotationService),
+                                 admin_user: User = Depends(get_admin_user)):
+    drifts = await quotation_service.reconcile_total_prices(dry_run)
+    return drifts
 
 
 @router.patch("/quotations/{quotation_id}/quotation/check",
@@ -163,6 +187,23 @@ async def get_quotations_search(start: Optional[str] = Query(None, description="
     return quotations
 
 
+@router.get("/quotations/search/name",
+            response_model=ApiResponse[QuotationSearchResponse],
+            summary="견적서 이름 검색",
+            description="견적서 이름을 전문 검색하여 최신순으로 조회 합니다. "
+                        "cursor -> 이전 응답의 next_cursor (첫 페이지는 생략), limit -> 반환 개수")
+@handle_exceptions(QuotationSearchResponse)
+async def search_quotations_by_name(query: str = Query(..., min_length=1, description="검색어"),
+                                    start: Optional[str] = Query(None, description="시작일('2024-01-01' 형식)"),
+                                    end: Optional[str] = Query(None, description="종료일('2024-01-01' 형식)"),
+                                    cursor: Optional[str] = Query(None),
+                                    limit: int = Query(20, ge=1, le=100),
+                                    quotation_service: QuotationService = Depends(QuotationService),
+                                    current_user: User = Depends(get_current_user)):
+    result = await quotation_service.search_quotations_by_name(query, start, end, cursor, limit)
+    return result
+
+
 @router.get("/quotations/extract/{quotation_id}",
             summary="견적서 excel 파일로 추출",
             description="거래처 견적서를 excel 파일로 추출합니다.")
@@ -182,22 +223,64 @@ async def extract_quotations_to_excel_file(quotation_id: int,
             description="오늘 날짜의 모든 견적서를 excel 파일로 추출하고 zip으로 압축합니다.")
 async def extract_today_quotations_to_zip(
         input_date: date,
+        stream: bool = Query(True, description="zip 파일 스트리밍 전송 여부"),
         quotation_service: QuotationService = Depends(QuotationService),
         current_user: User = Depends(get_current_user)
 ):
-    zip_buffer, filename = await quotation_service.extract_today_quotations_to_zip(input_date)
+    if stream:
+        content, filename = await quotation_service.stream_today_quotations_to_zip(input_date)
+    else:
+        content, filename = await quotation_service.extract_today_quotations_to_zip(input_date)
 
     headers = {
         'Content-Disposition': f'attachment; filename*=UTF-8\'\'{filename}'
     }
 
     return StreamingResponse(
-        zip_buffer,
+        content,
         headers=headers,
         media_type='application/zip'
     )
 
 
+@router.post("/quotations/exports",
+             response_model=ApiResponse[ExportJobRead],
+             summary="견적서 excel/zip 추출 작업 등록",
+             description="견적서 추출 작업을 등록하고 작업 id를 반환합니다. kind -> quotation(견적서 1개, quotation_id 필요), "
+                         "daily(해당 날짜 전체 zip, input_date 필요). 변경되지 않은 견적서는 기존 결과 파일을 재사용합니다.")
+@handle_exceptions(ExportJobRead)
+async def submit_export_job(job_create: ExportJobCreate,
+                            export_job_service: ExportJobService = Depends(ExportJobService),
+                            current_user: User = Depends(get_current_user)):
+    job = await export_job_service.submit_job(job_create)
+    return job
+
+
+@router.get("/quotations/exports/{job_id}",
+            response_model=ApiResponse[ExportJobRead],
+            summary="견적서 추출 작업 상태 조회",
+            description="견적서 추출 작업의 진행 상태를 조회합니다.")
+@handle_exceptions(ExportJobRead)
+async def get_export_job(job_id: str,
+                         export_job_service: ExportJobService = Depends(ExportJobService),
+                         current_user: User = Depends(get_current_user)):
+    job = await export_job_service.get_job(job_id)
+    return job
+
+
+@router.get("/quotations/exports/{job_id}/download",
+            summary="견적서 추출 결과 다운로드",
+            description="완료된 견적서 추출 작업의 결과 파일을 다운로드합니다.")
+async def download_export_job(job_id: str,
+                              export_job_service: ExportJobService = Depends(ExportJobService),
+                              current_user: User = Depends(get_current_user)):
+    try:
+        path, filename, media_type = await export_job_service.get_job_artifact(job_id)
+    except ServiceException as e:
+        return ApiResponse.on_failure(e.error_status)
+    return FileResponse(path, filename=filename, media_type=media_type)
+
+
 @router.get("/quotations/search/date/{input_date}",
             response_model=ApiResponse[List[QuotationRead]],
             summary="사용자 입력 날짜 기반 견적서 조회",
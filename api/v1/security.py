@@ -0,0 +1,51 @@
+from typing import List
+from fastapi import APIRouter, Depends
+
+from api.dependencies import get_admin_user
+from core.decorator.decorator import handle_exceptions
+from core.response.api_response import ApiResponse
+from models import User
+from schemas.alert import AlertMetrics
+from schemas.ip_ban import IpBanMetrics, IpBanRead
+from service.alert import alert_dispatcher
+from service.ip_ban import ip_ban_list
+
+router = APIRouter(tags=["11. security"])
+
+
+@router.get("/security/ip-bans",
+            response_model=ApiResponse[List[IpBanRead]],
+            summary="차단된 IP 목록 조회 (관리자)",
+            description="차단 목록/없는 경로 요청이 반복되어 차단된 IP 와 차단 만료 시각(epoch)을 조회합니다.")
+@handle_exceptions(List[IpBanRead])
+async def get_ip_bans(admin_user: User = Depends(get_admin_user)):
+    return await ip_ban_list.get_bans()
+
+
+@router.delete("/security/ip-bans/{ip}",
+               response_model=ApiResponse,
+               summary="IP 차단 해제 (관리자)",
+               description="IP 차단을 해제합니다. 다른 worker 에는 다음 동기화(5초 이내)에 반영됩니다.")
+@handle_exceptions()
+async def delete_ip_ban(ip: str, admin_user: User = Depends(get_admin_user)):
+    await ip_ban_list.unban(ip)
+    return ApiResponse.on_success()
+
+
+@router.get("/security/ip-bans/metrics",
+            response_model=ApiResponse[IpBanMetrics],
+            summary="IP 차단 지표 (관리자)",
+            description="bans/unbans -> 전체 차단/해제(만료 포함) 횟수, "
+                        "banned/rejected/hits -> 이 worker 의 차단 IP 수, 거절한 요청 수, 기록한 의심 요청 수")
+@handle_exceptions(IpBanMetrics)
+async def get_ip_ban_metrics(admin_user: User = Depends(get_admin_user)):
+    return await ip_ban_list.metrics()
+
+
+@router.get("/security/alerts/metrics",
+            response_model=ApiResponse[AlertMetrics],
+            summary="알림 전송 지표 (관리자)",
+            description="Discord 알림 큐의 대기/전송/중복 제외/버림/실패 건수를 조회합니다. (워커 프로세스 단위)")
+@handle_exceptions(AlertMetrics)
+async def get_alert_metrics(admin_user: User = Depends(get_admin_user)):
+    return alert_dispatcher.metrics()
@@ -0,0 +1,129 @@
+import logging
+import os
+import re
+import time
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from core.utils import load_blacklist
+
+logger = logging.getLogger(__name__)
+
+# blacklist 파일 변경 여부를 확인하는 최소 간격(초)
+BLACKLIST_RELOAD_INTERVAL = float(os.getenv("BLACKLIST_RELOAD_INTERVAL", "5"))
+
+_REGEX_META = set(".^$*+?{}[]|()")
+_QUANTIFIERS = set("*?{")
+_ALTERNATION = re.compile(r"(?<!\\)\|")
+
+
+def literal_prefix(pattern: str) -> Tuple[str, bool]:
+    """ 정규식 앞부분의 문자 그대로 일치해야 하는 부분과, 패턴 전체가 문자열인지 여부 반환
+
+    예) r"/cgi-bin/authLogin\\.cgi" -> ("/cgi-bin/authLogin.cgi", True), "/phpMyAdmin-.*/setup" -> ("/phpMyAdmin-", False)
+    """
+    prefix, i = [], 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            # \d, \w 처럼 문자 집합을 뜻하는 escape 는 문자열로 취급하지 않음
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                return "".join(prefix), False
+            char, step = pattern[i + 1], 2
+        elif char in _REGEX_META:
+            return "".join(prefix), False
+        else:
+            step = 1
+        # 뒤에 수량자가 있으면 이 문자는 없을 수도 있으므로 제외
+        if i + step < len(pattern) and pattern[i + step] in _QUANTIFIERS:
+            return "".join(prefix), False
+        prefix.append(char)
+        i += step
+    return "".join(prefix), True
+
+
+class BlacklistMatcher:
+    """ blacklist.txt 의 URL 패턴(re.match 기준)을 문자열 prefix trie 로 묶은 matcher
+
+    요청 경로를 trie 로 한 글자씩 따라가며 prefix 가 일치하는 패턴만 확인하므로,
+    패턴 수가 늘어도 검사 비용은 경로 길이에 비례한다. prefix 가 없는 패턴은 하나의 정규식으로 합쳐 확인한다.
+    allowed_prefixes 로 시작하는 경로는 검사하지 않으며 (해당 prefix 로 시작하는 패턴이 있으면 제외),
+    파일이 변경되면 다음 요청에서 다시 읽는다.
+    """
+    def __init__(self, file_path: str = "blacklist.txt", allowed_prefixes: Iterable[str] = ("/api/v1/",),
+                 reload_interval: float = BLACKLIST_RELOAD_INTERVAL):
+        self.file_path = file_path
+        self.allowed_prefixes = tuple(allowed_prefixes)
+        self.reload_interval = reload_interval
+        self.skip_prefixes: Tuple[str, ...] = ()
+        self.trie: dict = {}
+        self.fallback: List[Pattern] = []
+        self.size = 0
+        self.mtime: Optional[float] = None
+        self.checked_at = 0.0
+        self.load()
+
+    def load(self) -> None:
+        self.mtime = os.stat(self.file_path).st_mtime
+        self.checked_at = time.monotonic()
+        self.build(load_blacklist(self.file_path))
+
+    def build(self, patterns: List[str]) -> None:
+        trie, fallback, prefixes = {}, [], []
+        for pattern in patterns:
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                logger.error(f"blacklist 패턴 무시 {pattern!r}: {str(e)}")
+                continue
+
+            # 최상위 | 가 있으면 앞부분 prefix 로 시작하지 않아도 일치할 수 있으므로 정규식으로만 확인
+            prefix, is_literal = literal_prefix(pattern) if not _ALTERNATION.search(pattern) else ("", False)
+            prefixes.append(prefix)
+            if not prefix:
+                fallback.append(compiled)
+                continue
+            node = trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            # 문자열 패턴은 prefix 일치만으로 차단(None), 나머지는 정규식으로 확인
+            node.setdefault(None, []).append(None if is_literal else compiled)
+
+        self.trie = trie
+        self.fallback = fallback
+        if len(fallback) > 1:
+            try:
+                self.fallback = [re.compile("|".join(f"(?:{x.pattern})" for x in fallback))]
+            except re.error:
+                # (?i) 같은 전역 flag 가 있는 패턴은 합칠 수 없으므로 각각 확인
+                pass
+        self.skip_prefixes = tuple(x for x in self.allowed_prefixes if not any(p.startswith(x) for p in prefixes))
+        self.size = len(prefixes)
+
+    def reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self.checked_at < self.reload_interval:
+            return
+        self.checked_at = now
+        try:
+            if os.stat(self.file_path).st_mtime != self.mtime:
+                self.load()
+                logger.info(f"blacklist 다시 읽음: {self.size}개 패턴")
+        except OSError as e:
+            # 파일을 읽을 수 없으면 기존 패턴 유지
+            logger.error(f"blacklist 다시 읽기 실패: {str(e)}")
+
+    def is_blocked(self, path: str) -> bool:
+        self.reload_if_changed()
+        if path.startswith(self.skip_prefixes):
+            return False
+
+        node = self.trie
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            for compiled in node.get(None, ()):
+                if compiled is None or compiled.match(path):
+                    return True
+
+        return any(x.match(path) for x in self.fallback)
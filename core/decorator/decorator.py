@@ -2,6 +2,7 @@ import time
 import logging
 
 from pydantic import BaseModel
+from fastapi import Response
 from fastapi.security import OAuth2PasswordBearer
 from functools import wraps
 from typing import TypeVar, Type, Optional
@@ -38,7 +39,8 @@ def handle_exceptions(response_model: Optional[Type[T]] = None):
                 logger.info(
                     f"RequestID: {request_id} | UserID: {user_id} | IP: {ip} | Method: {method} | URL: {url} | Duration: {time.time() - start_time:.2f}s | Status: Success")
 
-                if isinstance(result, ApiResponse):
+                # 헤더/상태 코드를 직접 지정한 응답(Response)은 그대로 반환
+                if isinstance(result, (ApiResponse, Response)):
                     return result
                 elif response_model:
                     return ApiResponse[response_model].of(SuccessStatus.OK, result=result)
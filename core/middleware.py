@@ -4,14 +4,16 @@ import os
 import dotenv
 import sentry_sdk
 
-from fastapi import Request, FastAPI
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
 from contextvars import ContextVar
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
-from core.utils import get_user_id_from_token, load_blacklist
-from service.discord import send_discord_alert
+from core.blacklist import BlacklistMatcher
+from core.security import get_token_payload
+from service.alert import alert_dispatcher
+from service.ip_ban import ip_ban_list
 
 dotenv.load_dotenv()
 
@@ -27,76 +29,114 @@ url_context = ContextVar("url", default=None)
 ip_context = ContextVar("ip", default=None)
 
 
-class RequestMiddleware(BaseHTTPMiddleware):
-    """ 사용자 Request 정보 취득 목적을 위한 미들웨어"""
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request_id_context.set(request_id)
-        token = request.headers.get("access-token")
-        user_id = get_user_id_from_token(token)
+def get_client_ip(scope: Scope):
+    client = scope.get("client")
+    return client[0] if client else None
 
-        if user_id:
-            user_id_context.set(user_id)
 
-        method_context.set(request.method)
-        url_context.set(str(request.url))
+class IpBanMiddleware:
+    """ 차단된 IP 의 요청을 라우팅/로깅/알림 전에 바로 거절하는 미들웨어 (worker 메모리의 차단 목록만 확인) """
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        client_ip = request.client.host
-        ip_context.set(client_ip)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and ip_ban_list.is_banned(get_client_ip(scope)):
+            response = JSONResponse(
+                status_code=403,
+                content={"detail": "Access to this resource is forbidden."}
+            )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
-class URLPatternCheckMiddleware(BaseHTTPMiddleware):
+class RequestMiddleware:
+    """ 사용자 Request 정보 취득 목적을 위한 미들웨어
+
+    BaseHTTPMiddleware 와 달리 요청/응답을 별도 task 와 stream 으로 감싸지 않는 순수 ASGI 미들웨어
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        # 요청이 끝나면 값을 되돌려 같은 task 에서 처리되는 다음 요청에 남지 않도록 token 보관
+        tokens = []
+        try:
+            tokens.append((request_id_context, request_id_context.set(str(uuid.uuid4()))))
+            # token 은 여기서 한 번만 검증하고, 결과를 request.state 에 두어 get_current_user 에서 재사용
+            token = request.headers.get("access-token")
+            payload = get_token_payload(token)
+            scope.setdefault("state", {}).update(access_token=token, token_payload=payload)
+            user_id = payload.get("user_id") if payload else None
+
+            if user_id:
+                tokens.append((user_id_context, user_id_context.set(user_id)))
+
+            tokens.append((method_context, method_context.set(request.method)))
+            tokens.append((url_context, url_context.set(str(request.url))))
+
+            client_ip = request.client.host if request.client else None
+            tokens.append((ip_context, ip_context.set(client_ip)))
+
+            await self.app(scope, receive, send)
+        finally:
+            for context, context_token in reversed(tokens):
+                context.reset(context_token)
+
+
+class URLPatternCheckMiddleware:
     """ Request URL 패턴 파악을 목적을 위한 미들웨어 """
     def __init__(
             self,
-            app,
+            app: ASGIApp,
             url_pattern: str = r"^/api/v1/",
-            excluded_paths: list = None,
-            discord_webhook_url: str = os.getenv("DISCORD_WEB_HOOK")
+            excluded_paths: list = None
     ):
-        super().__init__(app)
-        self.url_pattern = url_pattern
-        self.excluded_paths = excluded_paths or []
-        self.discord_webhook_url = discord_webhook_url
-
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+        self.app = app
+        self.url_pattern = re.compile(url_pattern)
+        self.excluded_paths = tuple(excluded_paths or [])
 
-        if path == "" or path == "/":
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        if any(path.startswith(excluded) for excluded in self.excluded_paths):
-            return await call_next(request)
+        path = Request(scope).url.path
 
-        if not re.match(self.url_pattern, path):
-            error_message = f"잘못된 접근 경고: {path}"
-            sentry_sdk.capture_message(error_message, level="error")
+        if path == "" or path == "/" or path.startswith(self.excluded_paths) or self.url_pattern.match(path):
+            await self.app(scope, receive, send)
+            return
 
-            if self.discord_webhook_url:
-                await send_discord_alert(self.discord_webhook_url, error_message)
+        # 기준 이상 반복되면 IP 차단 (이후 요청은 IpBanMiddleware 에서 거절)
+        await ip_ban_list.record_hit(get_client_ip(scope))
 
-            return JSONResponse(status_code=404, content={"error": "Not Found"})
+        # Sentry/Discord 알림은 큐에 넣기만 하고 기다리지 않음 (같은 경로는 일정 시간 동안 한 번만 알림)
+        alert_dispatcher.alert(f"잘못된 접근 경고: {path}")
 
-        response = await call_next(request)
-        return response
+        response = JSONResponse(status_code=404, content={"error": "Not Found"})
+        await response(scope, receive, send)
 
 
-class BlacklistMiddleware(BaseHTTPMiddleware):
+class BlacklistMiddleware:
     """ 잘못된 접근의 URL 차단을 위한 미들웨어 """
-    def __init__(self, app: FastAPI, blacklist_file: str = "blacklist.txt"):
-        super().__init__(app)
-        self.blacklist_patterns = load_blacklist(blacklist_file)
-
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        for pattern in self.blacklist_patterns:
-            if re.match(pattern, path):
-                return JSONResponse(
-                    status_code=403,
-                    content={"detail": "Access to this resource is forbidden."}
-                )
-        response = await call_next(request)
-        return response
\ No newline at end of file
+    def __init__(self, app: ASGIApp, blacklist_file: str = "blacklist.txt", allowed_prefixes: tuple = ("/api/v1/",)):
+        self.app = app
+        self.blacklist = BlacklistMatcher(blacklist_file, allowed_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and self.blacklist.is_blocked(Request(scope).url.path):
+            await ip_ban_list.record_hit(get_client_ip(scope))
+            response = JSONResponse(
+                status_code=403,
+                content={"detail": "Access to this resource is forbidden."}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -90,3 +90,7 @@ class ErrorStatus(BaseCode):
 
     FAQ_NOT_FOUND = ("4001", "요청한 FAQ를 찾을 수 없습니다.", "FAQ")
 
+    EXPORT_JOB_NOT_FOUND = ("4001", "요청한 추출 작업을 찾을 수 없습니다.", "EXPORT")
+    EXPORT_JOB_NOT_COMPLETED = ("4002", "추출 작업이 아직 완료되지 않았습니다.", "EXPORT")
+
+    UPLOAD_JOB_NOT_FOUND = ("4001", "요청한 업로드 작업을 찾을 수 없습니다.", "UPLOAD")
@@ -1,3 +1,7 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
@@ -8,6 +12,44 @@ from core.response.handler.exception_handler import GeneralException
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 검증한 access token 을 보관하는 최대 개수와 최대 보관 시간(초, token 의 exp 를 넘지 않음)
+AUTH_TOKEN_CACHE_SIZE = 4096
+AUTH_TOKEN_CACHE_TTL = 300
+
+
+class VerifiedTokenCache:
+    """ 서명/만료를 검증한 access token 의 payload 를 보관하는 LRU
+
+    같은 token 으로 반복되는 요청은 서명 검증을 생략하며, 각 token 은 exp 시각이 지나면 사용하지 않는다.
+    """
+    def __init__(self, max_size: int = AUTH_TOKEN_CACHE_SIZE, ttl: int = AUTH_TOKEN_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.tokens: OrderedDict[str, Tuple[dict, float]] = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict]:
+        cached = self.tokens.get(token)
+        if cached is None:
+            return None
+        payload, expires_at = cached
+        if expires_at <= time.time():
+            del self.tokens[token]
+            return None
+        self.tokens.move_to_end(token)
+        return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        expires_at = time.time() + self.ttl
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, payload["exp"])
+        self.tokens[token] = (payload, expires_at)
+        self.tokens.move_to_end(token)
+        while len(self.tokens) > self.max_size:
+            self.tokens.popitem(last=False)
+
+
+verified_token_cache = VerifiedTokenCache()
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -17,6 +59,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def decode_access_token(token: str) -> dict:
+    """ access token 검증 후 payload 반환 (최근 검증한 token 은 다시 검증하지 않음). 유효하지 않으면 JWTError """
+    payload = verified_token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, jwt_settings.SECRET_KEY, algorithms=[jwt_settings.ALGORITHM])
+        verified_token_cache.set(token, payload)
+    return payload
+
+
+def get_token_payload(token: Optional[str]) -> Optional[dict]:
+    """ token 이 없거나 유효하지 않으면 None """
+    if not token:
+        return None
+    try:
+        return decode_access_token(token)
+    except JWTError:
+        return None
+
+
 def verify_refresh_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, jwt_settings.SECRET_KEY, algorithms=[jwt_settings.ALGORITHM])
@@ -27,7 +88,7 @@ def verify_refresh_token(token: str) -> dict:
 
 def refresh_access_token(refresh_token: str) -> str:
     payload = verify_refresh_token(refresh_token)
-    new_access_token = create_access_token(data={"sub": payload["sub"]})
+    new_access_token = create_access_token(data={"sub": payload["sub"], "user_id": payload.get("user_id")})
     return new_access_token
 
 
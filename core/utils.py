@@ -1,8 +1,10 @@
-import os
+import base64
+import json
+from datetime import datetime, date, time, timedelta
+from typing import Tuple, Optional
 
 import dotenv
-import jwt
-from jwt import InvalidTokenError
+from sqlalchemy import and_
 
 from core.response.code.error_status import ErrorStatus
 from core.response.handler.exception_handler import GeneralException
@@ -18,21 +20,57 @@ def string_to_list(string):
     return [int(item) for item in string.split(',') if item]
 
 
-def get_user_id_from_token(token):
-    if not token:
-        return None
+def load_blacklist(file_path: str = "blacklist.txt"):
+    with open(file_path, "r") as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """ (created_at, id) 정렬 키를 페이지네이션용 불투명 cursor 문자열로 변환 """
+    return _encode_cursor_values([created_at.isoformat(), row_id])
+
 
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    created_at, row_id = _decode_cursor_values(cursor)
     try:
-        secret_key = os.environ.get("SECRET_KEY")
-        algorithm = os.environ.get("ALGORITHM")
-        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
-        user_id = payload.get('user_id')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise GeneralException(ErrorStatus.INVALID_INPUT)
 
-        return user_id
-    except InvalidTokenError:
-        raise GeneralException(ErrorStatus.INVALID_TOKEN)
 
+def encode_id_cursor(row_id: int) -> str:
+    """ id 정렬 키를 cursor 문자열로 변환 """
+    return _encode_cursor_values([row_id])
 
-def load_blacklist(file_path: str = "blacklist.txt"):
-    with open(file_path, "r") as file:
-        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
\ No newline at end of file
+
+def decode_id_cursor(cursor: str) -> int:
+    row_id, = _decode_cursor_values(cursor, size=1)
+    if not isinstance(row_id, int):
+        raise GeneralException(ErrorStatus.INVALID_INPUT)
+    return row_id
+
+
+def _encode_cursor_values(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor_values(cursor: str, size: int = 2) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise GeneralException(ErrorStatus.INVALID_INPUT)
+    if not isinstance(values, list) or len(values) != size:
+        raise GeneralException(ErrorStatus.INVALID_INPUT)
+    return values
+
+
+def get_date_range(start_date: date, end_date: Optional[date] = None) -> Tuple[datetime, datetime]:
+    """ 날짜 범위를 [시작일 00:00, 종료일 다음날 00:00) 반열린 구간으로 변환 """
+    end_date = end_date or start_date
+    return datetime.combine(start_date, time.min), datetime.combine(end_date + timedelta(days=1), time.min)
+
+
+def date_range_condition(column, start_date: date, end_date: Optional[date] = None):
+    """ 컬럼을 함수로 감싸지 않아 인덱스 range scan이 가능한 날짜 조건 """
+    start, end = get_date_range(start_date, end_date)
+    return and_(column >= start, column < end)
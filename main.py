@@ -13,8 +13,16 @@ from api import router
 from core.logging.config import listener
 from core.response.handler.exception_handler import GeneralException, general_exception_handler, \
     validation_exception_handler
-from core.middleware import RequestMiddleware, URLPatternCheckMiddleware, BlacklistMiddleware
+from core.middleware import RequestMiddleware, URLPatternCheckMiddleware, BlacklistMiddleware, IpBanMiddleware
+from service.alert import alert_dispatcher
 from service.discord import send_discord_startup_message, send_discord_shutdown_message
+from service.export_job import export_job_worker
+from service.ip_ban import run_ip_ban_sync
+from service.catalog_events import run_catalog_change_listener
+from service.kamis import close_kamis_client
+from service.product_file import shutdown_parse_pool
+from service.upload_job import upload_job_worker
+from service.product_search import refresh_product_search_index, run_product_search_index_refresh
 
 logger = logging.getLogger()
 
@@ -29,12 +37,32 @@ async def lifespan(app: FastAPI):
         logging.error(f"Test error occurred: {str(e)}")
         print(f"Test error logged: {str(e)}")
 
-    # 실행과 종료시 디스코드 메세지 전송
+    # 실행과 종료시 디스코드 메세지 전송 (알림은 background task 에서 전송)
+    alert_dispatcher.start()
     await send_discord_startup_message()
+    export_job_worker.start()
+    upload_job_worker.start()
+
+    # 제품 검색 색인 생성 (실패 시 색인이 준비될 때까지 DB 검색으로 대체)
+    try:
+        await refresh_product_search_index(force=True)
+    except Exception as e:
+        logging.error(f"제품 검색 색인 생성 실패: {type(e).__name__} - {str(e)}")
+    product_search_refresh_task = asyncio.create_task(run_product_search_index_refresh())
+    catalog_listener_task = asyncio.create_task(run_catalog_change_listener())
+    ip_ban_sync_task = asyncio.create_task(run_ip_ban_sync())
 
     yield
 
+    product_search_refresh_task.cancel()
+    catalog_listener_task.cancel()
+    ip_ban_sync_task.cancel()
+    await export_job_worker.stop()
+    await upload_job_worker.stop()
+    shutdown_parse_pool()
+    await close_kamis_client()
     await send_discord_shutdown_message()
+    await alert_dispatcher.stop()
 
     listener.stop()
 
@@ -69,6 +97,8 @@ def get_application() -> FastAPI:
         url_pattern=r"^/api/v1/",
         excluded_paths=["/health", "/metrics", "/docs", "/openapi.json", "/favicon.ico"],
     )
+    # 마지막에 추가한 미들웨어가 가장 먼저 실행되므로 차단된 IP 는 다른 처리 없이 거절
+    application.add_middleware(IpBanMiddleware)
     application.add_exception_handler(GeneralException, general_exception_handler)
     application.add_exception_handler(ResponseValidationError, validation_exception_handler)
 
@@ -0,0 +1,164 @@
+"""
+미들웨어 스택 요청당 오버헤드 측정
+
+locustfile.py 의 시나리오(견적서/주문 내역/물품 검색)와 같은 요청 순서를 ASGI 앱에 직접 호출해
+미들웨어가 없는 앱, 기존 BaseHTTPMiddleware 스택, 순수 ASGI 스택의 요청당 처리 시간을 비교한다.
+DB/Redis 를 거치지 않도록 endpoint 는 고정 응답을 반환하므로 측정값은 미들웨어 오버헤드에 해당한다.
+
+    python middleware_benchmark.py [반복 횟수]
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+import uuid
+from urllib.parse import urlencode
+
+import jwt
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from core.middleware import RequestMiddleware, BlacklistMiddleware, URLPatternCheckMiddleware, \
+    request_id_context, user_id_context, method_context, url_context, ip_context
+from core.utils import load_blacklist
+
+EXCLUDED_PATHS = ["/health", "/metrics", "/docs", "/openapi.json", "/favicon.ico"]
+
+
+def get_user_id_from_token(token):
+    """ 기존 RequestMiddleware 의 PyJWT 검증 (요청마다 서명 검증) """
+    if not token:
+        return None
+    return jwt.decode(token, os.environ["SECRET_KEY"], algorithms=[os.environ["ALGORITHM"]]).get("user_id")
+
+
+class LegacyRequestMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id_context.set(str(uuid.uuid4()))
+        user_id = get_user_id_from_token(request.headers.get("access-token"))
+        if user_id:
+            user_id_context.set(user_id)
+        method_context.set(request.method)
+        url_context.set(str(request.url))
+        ip_context.set(request.client.host)
+        return await call_next(request)
+
+
+class LegacyURLPatternCheckMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, url_pattern: str = r"^/api/v1/", excluded_paths: list = None):
+        super().__init__(app)
+        self.url_pattern = url_pattern
+        self.excluded_paths = excluded_paths or []
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if path == "" or path == "/" or any(path.startswith(x) for x in self.excluded_paths):
+            return await call_next(request)
+        if not re.match(self.url_pattern, path):
+            return JSONResponse(status_code=404, content={"error": "Not Found"})
+        return await call_next(request)
+
+
+class LegacyBlacklistMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, blacklist_file: str = "blacklist.txt"):
+        super().__init__(app)
+        self.blacklist_patterns = load_blacklist(blacklist_file)
+
+    async def dispatch(self, request: Request, call_next):
+        for pattern in self.blacklist_patterns:
+            if re.match(pattern, request.url.path):
+                return JSONResponse(status_code=403, content={"detail": "Access to this resource is forbidden."})
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.api_route("/api/v1/{path:path}", methods=["GET", "POST"])
+    async def endpoint(path: str):
+        return {"isSuccess": True, "code": "2000", "message": "OK", "result": {"id": 1, "access_token": "token"}}
+
+    # main.get_application 과 같은 순서로 등록
+    if stack == "legacy":
+        app.add_middleware(LegacyRequestMiddleware)
+        app.add_middleware(LegacyBlacklistMiddleware)
+        app.add_middleware(LegacyURLPatternCheckMiddleware, excluded_paths=EXCLUDED_PATHS)
+    elif stack == "asgi":
+        app.add_middleware(RequestMiddleware)
+        app.add_middleware(BlacklistMiddleware)
+        app.add_middleware(URLPatternCheckMiddleware, excluded_paths=EXCLUDED_PATHS)
+    return app
+
+
+def scenario_requests(token: str) -> list:
+    """ locustfile.py 의 세 시나리오가 보내는 요청 (method, path, headers, body) """
+    auth = [(b"access-token", token.encode()), (b"content-type", b"application/json")]
+    login = ("POST", "/api/v1/token", [(b"content-type", b"application/x-www-form-urlencoded")],
+             urlencode({"username": "user", "password": "password"}).encode())
+    return [
+        login,
+        ("POST", "/api/v1/quotations", auth, json.dumps({"client_id": 1, "status": "CREATED"}).encode()),
+        ("POST", "/api/v1/quotations/products", auth,
+         json.dumps([{"quotation_id": 1, "product_id": x, "quantity": 1} for x in range(5)]).encode()),
+        ("GET", "/api/v1/quotations/1", auth, b""),
+        login,
+        ("POST", "/api/v1/past-order", auth, json.dumps({"client_id": 1, "product_ids": list(range(15))}).encode()),
+        ("POST", "/api/v1/past-order/1/10/update", auth, b""),
+        ("GET", "/api/v1/past-order/1", auth, b""),
+        login,
+        ("GET", "/api/v1/products/search/감자", auth, b""),
+        ("GET", "/api/v1/products/purchases/recent", auth, b""),
+        ("GET", "/api/v1/products/야채", auth, b""),
+    ]
+
+
+async def call(app, method: str, path: str, headers: list, body: bytes) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"testserver"), *headers], "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, requests: list, rounds: int) -> float:
+    """ 요청당 평균 처리 시간(μs) """
+    for request in requests:
+        assert await call(app, *request) == 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for request in requests:
+            await call(app, *request)
+    return (time.perf_counter() - start) / (rounds * len(requests)) * 1_000_000
+
+
+async def main(rounds: int) -> None:
+    token = jwt.encode({"user_id": 1}, os.environ["SECRET_KEY"], algorithm=os.environ["ALGORITHM"])
+    requests = scenario_requests(token)
+    results = {stack: await measure(build_app(stack), requests, rounds) for stack in ("none", "legacy", "asgi")}
+
+    print(f"{'stack':<8}{'μs/request':>12}{'overhead μs':>14}")
+    for stack, elapsed in results.items():
+        print(f"{stack:<8}{elapsed:>12.1f}{elapsed - results['none']:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,26 @@
+"""quotation client_id created_at index
+
+Revision ID: 7c2f5e9a1b34
+Revises: 4e72c9e0a4da
+Create Date: 2024-09-28 14:02:11.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f5e9a1b34'
+down_revision: Union[str, None] = '4e72c9e0a4da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_quotations_client_id_created_at', 'quotations', ['client_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quotations_client_id_created_at', table_name='quotations')
@@ -0,0 +1,38 @@
+"""kamis product mapping
+
+Revision ID: a7d3f9c21b64
+Revises: f4b6d21c8e57
+Create Date: 2024-10-07 14:08:31.902716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9c21b64'
+down_revision: Union[str, None] = 'f4b6d21c8e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'kamis_product_mappings',
+        sa.Column('id', sa.Integer(), autoincrement=True, primary_key=True, index=True),
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.id', ondelete='CASCADE'),
+                  nullable=False, unique=True),
+        sa.Column('item_category_code', sa.String(length=10), nullable=False),
+        sa.Column('item_code', sa.String(length=10), nullable=False),
+        sa.Column('kind_code', sa.String(length=10), nullable=False),
+        sa.Column('product_rank_code', sa.String(length=10), nullable=True),
+        sa.Column('price_multiplier', sa.Float(), nullable=False, server_default='1'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('kamis_product_mappings')
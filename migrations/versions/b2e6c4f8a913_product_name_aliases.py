@@ -0,0 +1,34 @@
+"""product name aliases
+
+Revision ID: b2e6c4f8a913
+Revises: d5e8b3a6f019
+Create Date: 2024-10-10 16:42:13.517204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6c4f8a913'
+down_revision: Union[str, None] = 'd5e8b3a6f019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_name_aliases',
+        sa.Column('id', sa.Integer(), autoincrement=True, primary_key=True, index=True),
+        sa.Column('alias', sa.String(length=255), nullable=False, unique=True),
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.id', ondelete='CASCADE'),
+                  nullable=False, index=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('product_name_aliases')
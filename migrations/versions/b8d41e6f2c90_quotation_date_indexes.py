@@ -0,0 +1,30 @@
+"""quotation date indexes
+
+Revision ID: b8d41e6f2c90
+Revises: 7c2f5e9a1b34
+Create Date: 2024-09-29 10:47:35.902514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d41e6f2c90'
+down_revision: Union[str, None] = '7c2f5e9a1b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_quotations_input_date', 'quotations', ['input_date'])
+    op.create_index('ix_quotations_client_id_input_date', 'quotations', ['client_id', 'input_date'])
+    op.create_index('ix_quotations_created_at', 'quotations', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quotations_created_at', table_name='quotations')
+    op.drop_index('ix_quotations_client_id_input_date', table_name='quotations')
+    op.drop_index('ix_quotations_input_date', table_name='quotations')
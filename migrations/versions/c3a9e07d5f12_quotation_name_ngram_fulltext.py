@@ -0,0 +1,26 @@
+"""quotation name ngram fulltext index
+
+Revision ID: c3a9e07d5f12
+Revises: b8d41e6f2c90
+Create Date: 2024-09-30 21:15:48.330172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e07d5f12'
+down_revision: Union[str, None] = 'b8d41e6f2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE FULLTEXT INDEX ft_quotations_name ON quotations (name) WITH PARSER ngram")
+
+
+def downgrade() -> None:
+    op.drop_index('ft_quotations_name', table_name='quotations')
@@ -0,0 +1,36 @@
+"""catalog delta sync (product deletions, product timestamp indexes)
+
+Revision ID: d5e8b3a6f019
+Revises: a7d3f9c21b64
+Create Date: 2024-10-09 11:27:45.281930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8b3a6f019'
+down_revision: Union[str, None] = 'a7d3f9c21b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_deletions',
+        sa.Column('id', sa.Integer(), autoincrement=True, primary_key=True, index=True),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=func.now(), index=True),
+    )
+    op.create_index(op.f('ix_products_created_at'), 'products', ['created_at'], unique=False)
+    op.create_index(op.f('ix_products_updated_at'), 'products', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_products_updated_at'), table_name='products')
+    op.drop_index(op.f('ix_products_created_at'), table_name='products')
+    op.drop_table('product_deletions')
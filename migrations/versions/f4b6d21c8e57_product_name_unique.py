@@ -0,0 +1,41 @@
+"""product name unique index
+
+Revision ID: f4b6d21c8e57
+Revises: c3a9e07d5f12
+Create Date: 2024-10-04 10:42:17.615904
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b6d21c8e57'
+down_revision: Union[str, None] = 'c3a9e07d5f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 같은 이름의 제품이 있으면 unique index 생성이 중간에 실패하므로 먼저 확인
+    # (견적서/주문 내역이 제품 id 를 참조하므로 자동으로 합치지 않고 정리 후 다시 실행하도록 안내)
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT name, COUNT(*) AS count FROM products GROUP BY name HAVING COUNT(*) > 1 ORDER BY name"
+        )).all()
+        if duplicates:
+            names = ", ".join(f"{x.name}({x.count}개)" for x in duplicates[:20])
+            raise RuntimeError(
+                f"이름이 중복된 제품 {len(duplicates)}건이 있어 products.name unique index 를 만들 수 없습니다: {names}. "
+                "중복 제품을 참조하는 견적서/주문 내역을 하나의 제품으로 옮기고 나머지를 삭제한 뒤 다시 실행하세요."
+            )
+
+    op.drop_index('ix_products_name', table_name='products')
+    op.create_index(op.f('ix_products_name'), 'products', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_products_name'), table_name='products')
+    op.create_index('ix_products_name', 'products', ['name'], unique=False)
@@ -1,9 +1,12 @@
 from .client import Client
 from .custom_product import CustomProduct
 from .FAQ import FAQ
+from .kamis_product_mapping import KamisProductMapping
 from .notice import Notice
 from .past_order import PastOrder
 from .product import Product
+from .product_deletion import ProductDeletion
+from .product_name_alias import ProductNameAlias
 from .quotation import Quotation
 from .quotation_product import QuotationProduct
 from .user import User
\ No newline at end of file
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from core.db.database import Base
+
+
+@dataclass
+class KamisProductMapping(Base):
+    """KAMIS 품목과 제품의 연결 정보를 관리하는 클래스
+
+    Attributes:
+        id (int): 고유한 연결 ID
+        product_id (int): 제품 ID (ForeignKey로 연결된 products 테이블의 ID)
+        item_category_code (str): KAMIS 부류 코드 (예: 200 - 채소류)
+        item_code (str): KAMIS 품목 코드
+        kind_code (str): KAMIS 품종 코드
+        product_rank_code (str, optional): KAMIS 등급 코드
+        price_multiplier (float): KAMIS 가격을 제품 단위 가격으로 바꾸는 배수 (예: 20kg 상자 가격 -> kg 가격은 0.05)
+        created_at (datetime): 생성일 (자동 기록)
+    """
+    __tablename__ = "kamis_product_mappings"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id", ondelete="CASCADE"), unique=True)
+    item_category_code: Mapped[str] = mapped_column(String(10))
+    item_code: Mapped[str] = mapped_column(String(10))
+    kind_code: Mapped[str] = mapped_column(String(10))
+    product_rank_code: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    price_multiplier: Mapped[float] = mapped_column(Float, default=1.0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -23,11 +23,11 @@ class Product(Base):
     __tablename__ = "products"
 
     id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True, index=True)
-    name: Mapped[str] = mapped_column(String(255), index=True)
+    name: Mapped[str] = mapped_column(String(255), index=True, unique=True)
     category: Mapped[str] = mapped_column(String(255), index=True)
     unit: Mapped[str] = mapped_column(String(255))
     price: Mapped[int] = mapped_column(Integer())
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.current_timestamp())
-    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.current_timestamp(), index=True)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None, index=True)
 
     quotations = relationship("Quotation", secondary="quotation_product", back_populates="products")
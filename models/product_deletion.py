@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from core.db.database import Base
+
+
+@dataclass
+class ProductDeletion(Base):
+    """삭제된 제품 기록을 관리하는 클래스 (카탈로그 변경분 동기화에 사용)
+
+    Attributes:
+        id (int): 고유한 기록 ID
+        product_id (int): 삭제된 제품 ID
+        deleted_at (datetime): 삭제일 (자동 기록)
+    """
+    __tablename__ = "product_deletions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    product_id: Mapped[int] = mapped_column(Integer)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
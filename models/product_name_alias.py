@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from core.db.database import Base
+
+
+@dataclass
+class ProductNameAlias(Base):
+    """가격표 등 외부 파일의 물품 이름과 제품의 연결 정보를 관리하는 클래스
+
+    Attributes:
+        id (int): 고유한 별칭 ID
+        alias (str): 외부 파일에서 사용하는 물품 이름 (고유)
+        product_id (int): 제품 ID (ForeignKey로 연결된 products 테이블의 ID)
+        created_at (datetime): 생성일 (자동 기록)
+    """
+    __tablename__ = "product_name_aliases"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    alias: Mapped[str] = mapped_column(String(255), unique=True)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
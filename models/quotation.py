@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime, date
 
-from sqlalchemy import ForeignKey, Integer, DateTime, func, String, Text, Date
+from sqlalchemy import ForeignKey, Integer, DateTime, func, String, Text, Date, Index
 from core.db.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship, class_mapper
 
@@ -24,6 +24,13 @@ class Quotation(Base):
         client (Client): 견적과 연관된 고객 객체 (다대일 관계를 표현)
     """
     __tablename__ = 'quotations'
+    __table_args__ = (
+        Index('ix_quotations_client_id_created_at', 'client_id', 'created_at'),
+        Index('ix_quotations_client_id_input_date', 'client_id', 'input_date'),
+        Index('ix_quotations_input_date', 'input_date'),
+        Index('ix_quotations_created_at', 'created_at'),
+        Index('ft_quotations_name', 'name', mysql_prefix='FULLTEXT', mysql_with_parser='ngram'),
+    )
 
     id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True, index=True)
     client_id = mapped_column(Integer, ForeignKey('clients.id'), nullable=False)
@@ -0,0 +1,28 @@
+from typing import Sequence, List, Dict, Any
+from fastapi import Depends
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db.database import async_get_db
+from core.decorator.decorator import handle_db_exceptions
+from models import KamisProductMapping
+
+
+class KamisProductMappingRepository:
+    def __init__(self, session: AsyncSession = Depends(async_get_db)):
+        self.session = session
+
+    @handle_db_exceptions()
+    async def get_all_mappings(self) -> Sequence[KamisProductMapping]:
+        async with self.session as session:
+            result = await session.execute(select(KamisProductMapping).order_by(KamisProductMapping.product_id))
+            return result.scalars().all()
+
+    @handle_db_exceptions()
+    async def replace_mappings(self, mappings: List[Dict[str, Any]]) -> None:
+        """ KAMIS 연결 정보 전체를 한 트랜잭션에서 교체 """
+        async with self.session as session:
+            async with session.begin():
+                await session.execute(delete(KamisProductMapping))
+                if mappings:
+                    await session.execute(insert(KamisProductMapping).values(mappings))
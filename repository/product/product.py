@@ -1,13 +1,28 @@
 from datetime import datetime
-from typing import Sequence, Dict, Any, Optional
+from typing import Sequence, Dict, Any, Optional, Iterable, List, Tuple, AsyncIterator
 from fastapi import Depends
-from sqlalchemy import func
+from sqlalchemy import func, update, case, or_, and_, Row
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from core.decorator.decorator import handle_db_exceptions
 from core.db.database import async_get_db
-from models import Product
+from models import Product, ProductDeletion, ProductNameAlias
+
+
+async def apply_price_changes(session: AsyncSession, changes: List[Dict[str, Any]]) -> None:
+    """ 가격 변경 내역을 CASE 를 사용한 단일 UPDATE 로 반영 """
+    await session.execute(
+        update(Product)
+        .where(Product.id.in_([x["product_id"] for x in changes]))
+        .values(
+            price=case({x["product_id"]: x["new_price"] for x in changes}, value=Product.id),
+            updated_at=func.now()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
 
 
 class ProductRepository:
@@ -36,6 +51,27 @@ class ProductRepository:
             products = result.scalars().all()
             return products
 
+    async def stream_products_by_category(self, yield_per: int = 1000) -> AsyncIterator[Row]:
+        """ 전체 제품의 (분류, 이름, 단위, 가격)을 분류 순서로 server-side cursor 를 사용해 yield_per 개씩 조회
+
+        async generator 이므로 handle_db_exceptions 대신 호출하는 쪽에서 예외를 처리한다.
+        """
+        async with self.session as session:
+            result = await session.stream(
+                select(Product.category, Product.name, Product.unit, Product.price)
+                .order_by(Product.category, Product.id)
+                .execution_options(yield_per=yield_per)
+            )
+            async for row in result:
+                yield row
+
+    @handle_db_exceptions()
+    async def get_product_prices(self) -> List[Tuple[int, int]]:
+        """ 가격표 생성을 위한 (제품 ID, 가격) 목록 (ID 오름차순) """
+        async with self.session as session:
+            result = await session.execute(select(Product.id, Product.price).order_by(Product.id))
+            return [(x.id, x.price) for x in result.all()]
+
     @handle_db_exceptions()
     async def update_product(self, product_id: int, new_data: Dict[str, Any]):
         async with self.session as session:
@@ -43,7 +79,7 @@ class ProductRepository:
             if product:
                 for key, value in new_data.items():
                     setattr(product, key, value)
-                product.updated_at = datetime.now()
+                product.updated_at = func.now()
                 await session.commit()
                 return True
             else:
@@ -55,6 +91,12 @@ class ProductRepository:
             product = await session.get(Product, product_id)
             return product if product else None
 
+    @handle_db_exceptions()
+    async def get_products_by_ids(self, product_ids: Iterable[int]) -> Sequence[Product]:
+        async with self.session as session:
+            result = await session.execute(select(Product).where(Product.id.in_(list(product_ids))))
+            return result.scalars().all()
+
     @handle_db_exceptions()
     async def get_product_by_name(self, product_name: str) -> Optional[Product]:
         async with self.session as session:
@@ -62,6 +104,58 @@ class ProductRepository:
             product = result.scalar_one_or_none()
             return product if product else None
 
+    @handle_db_exceptions()
+    async def get_products_by_names(self, names: Iterable[str]) -> Sequence[Product]:
+        async with self.session as session:
+            result = await session.execute(select(Product).where(Product.name.in_(list(names))))
+            return result.scalars().all()
+
+    @handle_db_exceptions()
+    async def get_product_names(self) -> List[Tuple[int, str]]:
+        """ 이름 매칭을 위한 (제품 ID, 이름) 목록 """
+        async with self.session as session:
+            result = await session.execute(select(Product.id, Product.name).order_by(Product.id))
+            return [(x.id, x.name) for x in result.all()]
+
+    @handle_db_exceptions()
+    async def get_product_aliases(self, aliases: Iterable[str]) -> Dict[str, int]:
+        """ 저장된 별칭 중 주어진 이름에 해당하는 별칭 -> 제품 ID """
+        async with self.session as session:
+            result = await session.execute(
+                select(ProductNameAlias.alias, ProductNameAlias.product_id)
+                .where(ProductNameAlias.alias.in_(list(aliases)))
+            )
+            return {x.alias: x.product_id for x in result.all()}
+
+    @handle_db_exceptions()
+    async def save_product_aliases(self, aliases: Dict[str, int]) -> None:
+        """ 별칭 -> 제품 ID 저장 (이미 있는 별칭은 제품 ID 갱신) """
+        if not aliases:
+            return
+        async with self.session as session:
+            async with session.begin():
+                stmt = insert(ProductNameAlias).values(
+                    [{"alias": alias, "product_id": product_id} for alias, product_id in aliases.items()]
+                )
+                await session.execute(stmt.on_duplicate_key_update(product_id=stmt.inserted.product_id))
+
+    @handle_db_exceptions()
+    async def upsert_products(self, rows: List[Dict[str, Any]], chunk_size: int = 1000) -> None:
+        """ 제품 이름(unique) 기준으로 INSERT ... ON DUPLICATE KEY UPDATE 를 chunk 단위로 실행 """
+        if not rows:
+            return
+        async with self.session as session:
+            async with session.begin():
+                for i in range(0, len(rows), chunk_size):
+                    stmt = insert(Product).values(rows[i:i + chunk_size])
+                    stmt = stmt.on_duplicate_key_update(
+                        category=stmt.inserted.category,
+                        unit=stmt.inserted.unit,
+                        price=stmt.inserted.price,
+                        updated_at=func.now()
+                    )
+                    await session.execute(stmt)
+
     @handle_db_exceptions()
     async def exists_product_by_name(self, name: str) -> bool:
         async with self.session as session:
@@ -80,40 +174,70 @@ class ProductRepository:
 
             if product:
                 await session.delete(product)
+                session.add(ProductDeletion(product_id=product_id))
                 await session.commit()
 
+    @handle_db_exceptions()
+    async def get_database_now(self) -> datetime:
+        async with self.session as session:
+            return (await session.execute(select(func.now()))).scalar_one()
+
+    @handle_db_exceptions()
+    async def get_products_changed_since(self, since: datetime) -> Sequence[Product]:
+        """ since 이후 추가/수정된 제품 (DB 시각 정밀도를 고려해 since 와 같은 시각 포함) """
+        async with self.session as session:
+            stmt = select(Product).where(or_(
+                Product.updated_at >= since,
+                and_(Product.updated_at.is_(None), Product.created_at >= since)
+            ))
+            result = await session.execute(stmt)
+            return result.scalars().all()
+
+    @handle_db_exceptions()
+    async def get_deleted_product_ids_since(self, since: datetime) -> List[int]:
+        async with self.session as session:
+            result = await session.execute(
+                select(ProductDeletion.product_id).where(ProductDeletion.deleted_at >= since).distinct()
+            )
+            return list(result.scalars().all())
+
     @handle_db_exceptions()
     async def update_vegetable_product_price(self, product_id: int, price: int):
         async with self.session as session:
             product = await session.get(Product, product_id)
             if product:
                 product.price = price
-                product.updated_at = datetime.now()
+                product.updated_at = func.now()
                 await session.commit()
                 return True
             else:
                 raise ValueError(f"Product {product_id} does not exist")
 
     @handle_db_exceptions()
-    async def update_vegetable_products_price(self, price_data: dict):
+    async def update_products_price(self, prices: Dict[int, int], dry_run: bool = False) -> Dict[str, Any]:
+        """ 제품 ID 별 가격을 조회 1회, CASE UPDATE 1회로 반영 (dry_run 이면 변경 내역만 반환) """
         async with self.session as session:
-            updated_count = 0
-            for product_name, new_price in price_data.items():
-                try:
-                    product = await session.execute(select(Product).where(Product.name == product_name))
-                    product = product.scalar_one_or_none()
-
-                    if product:
-                        product.price = new_price
-                        product.updated_at = datetime.now()
-                        updated_count += 1
-                    else:
-                        raise ValueError((f"Product not found: {product_name}"))
-                except Exception as e:
-                    raise ValueError(f"Error updating {product_name}: {str(e)}")
-
-            await session.commit()
-            return updated_count
+            result = await session.execute(
+                select(Product.id, Product.name, Product.price).where(Product.id.in_(list(prices)))
+            )
+            products = {x.id: x for x in result.all()}
+
+            changes = [
+                {"product_id": product_id, "name": products[product_id].name,
+                 "old_price": products[product_id].price, "new_price": new_price}
+                for product_id, new_price in prices.items()
+                if product_id in products and products[product_id].price != new_price
+            ]
+            unmatched = [product_id for product_id in prices if product_id not in products]
+
+            if changes and not dry_run:
+                await apply_price_changes(session, changes)
+
+            return {
+                "changes": changes,
+                "unchanged": len(products) - len(changes),
+                "unmatched": unmatched
+            }
 
     @handle_db_exceptions()
     async def get_products_by_prefix(self, name_prefix: str, limit: int) -> Sequence[Product]:
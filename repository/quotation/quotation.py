@@ -1,15 +1,56 @@
 from datetime import date, datetime
-from typing import Sequence
+from typing import Sequence, Dict, List, Optional, Tuple, Any, Iterable, Set
 from fastapi import Depends
-from sqlalchemy import select, func, and_, update, delete
+from sqlalchemy import select, func, and_, or_, update, delete, insert, case
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db.database import async_get_db
+from core.utils import date_range_condition, get_date_range
 from core.decorator.decorator import handle_db_exceptions
-from models import Quotation, QuotationProduct
+from models import Quotation, QuotationProduct, Product
 from schemas.quotation import QuotationStatus, QuotationUpdate
 
 
+# MySQL ngram 전문 검색 파서의 토큰 길이 (ngram_token_size 기본값)
+NGRAM_TOKEN_SIZE = 2
+
+
+def name_search_phrase(query: str) -> str:
+    """ 구문 검색에 사용할 수 없는 따옴표와 앞뒤 공백을 제거한 검색어 """
+    return query.replace('"', '').strip()
+
+
+def name_search_condition(query: str):
+    """ 견적서 이름 검색 조건 (ngram 토큰보다 짧은 검색어는 전문 검색 인덱스로 찾을 수 없어 부분 일치로 검색) """
+    phrase = name_search_phrase(query)
+    if not phrase:
+        # 빈 검색어의 부분 일치는 모든 견적서와 일치하므로 허용하지 않음
+        raise ValueError("empty search phrase")
+    if len(phrase) < NGRAM_TOKEN_SIZE:
+        return Quotation.name.contains(phrase)
+    return match(Quotation.name, against=f'"{phrase}"').in_boolean_mode()
+
+
+def update_total_price_by_delta(quotation_id: int, delta: int):
+    """ 견적서 물품 변경분(delta)만큼 견적서 합계 금액을 갱신하는 UPDATE 문 """
+    return (
+        update(Quotation)
+        .where(Quotation.id == quotation_id)
+        .values(total_price=Quotation.total_price + delta, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def created_before_cursor(cursor: Tuple[datetime, int]):
+    """ (created_at, id) 내림차순 정렬 기준으로 cursor 이후의 견적서 조건 """
+    created_at, quotation_id = cursor
+    return or_(
+        Quotation.created_at < created_at,
+        and_(Quotation.created_at == created_at, Quotation.id < quotation_id)
+    )
+
+
 class QuotationRepository:
     def __init__(self, session: AsyncSession = Depends(async_get_db)):
         self.session = session
@@ -23,40 +64,77 @@ class QuotationRepository:
             return quotation
 
     @handle_db_exceptions()
-    async def update_quotation(self, quotation_id: int, quotation_data: QuotationUpdate):
+    async def update_quotation(self, quotation_id: int, quotation_data: QuotationUpdate) -> Dict[str, int]:
+        """ 저장된 견적서 물품과 비교하여 변경된 물품만 INSERT/UPDATE/DELETE """
         async with self.session as session:
             async with session.begin():
-
                 stmt = (
                     update(Quotation)
                     .where(Quotation.id == quotation_id)
                     .values(
                         client_id=quotation_data.client_id,
                         name=quotation_data.name,
-                        total_price=quotation_data.total_price,
+                        total_price=sum(x.price for x in quotation_data.products),
                         status=quotation_data.status,
                         particulars=quotation_data.particulars,
                         updated_at=func.now()
                     )
+                    .execution_options(synchronize_session=False)
                 )
                 await session.execute(stmt)
 
-                delete_stmt = delete(QuotationProduct).where(QuotationProduct.quotation_id == quotation_id)
-                await session.execute(delete_stmt)
-
-                for product in quotation_data.products:
-                    quotation_product = QuotationProduct(
-                        quotation_id=quotation_id,
-                        product_id=product.id,
-                        price=product.price,
-                        quantity=product.quantity
+                result = await session.execute(
+                    select(QuotationProduct.product_id, QuotationProduct.price, QuotationProduct.quantity)
+                    .where(QuotationProduct.quotation_id == quotation_id)
+                )
+                existing = {x.product_id: (x.price, x.quantity) for x in result.all()}
+                incoming = {x.id: x for x in quotation_data.products}
+
+                inserted = [x for product_id, x in incoming.items() if product_id not in existing]
+                updated = [
+                    x for product_id, x in incoming.items()
+                    if product_id in existing and existing[product_id] != (x.price, x.quantity)
+                ]
+                deleted = [product_id for product_id in existing if product_id not in incoming]
+
+                if inserted:
+                    await session.execute(insert(QuotationProduct).values([
+                        {
+                            "quotation_id": quotation_id,
+                            "product_id": x.id,
+                            "price": x.price,
+                            "quantity": x.quantity
+                        } for x in inserted
+                    ]))
+
+                if updated:
+                    update_stmt = (
+                        update(QuotationProduct)
+                        .where(and_(
+                            QuotationProduct.quotation_id == quotation_id,
+                            QuotationProduct.product_id.in_([x.id for x in updated])
+                        ))
+                        .values(
+                            price=case({x.id: x.price for x in updated}, value=QuotationProduct.product_id),
+                            quantity=case({x.id: x.quantity for x in updated}, value=QuotationProduct.product_id),
+                            updated_at=func.now()
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.execute(update_stmt)
+
+                if deleted:
+                    delete_stmt = (
+                        delete(QuotationProduct)
+                        .where(and_(
+                            QuotationProduct.quotation_id == quotation_id,
+                            QuotationProduct.product_id.in_(deleted)
+                        ))
+                        .execution_options(synchronize_session=False)
                     )
-                    session.add(quotation_product)
+                    await session.execute(delete_stmt)
 
-        async with self.session as session:
-            result = await session.execute(select(Quotation).filter(Quotation.id == quotation_id))
-            updated_quotation = result.scalar_one_or_none()
-            return updated_quotation
+            return {"inserted": len(inserted), "updated": len(updated), "deleted": len(deleted)}
 
     @handle_db_exceptions()
     async def get_quotation_by_id(self, quotation_id: int):
@@ -65,22 +143,113 @@ class QuotationRepository:
             return product if product else None
 
     @handle_db_exceptions()
-    async def update_total_price(self, quotation_id: int) -> None:
+    async def get_existing_quotation_ids(self, quotation_ids: Iterable[int]) -> Set[int]:
+        async with self.session as session:
+            result = await session.execute(select(Quotation.id).where(Quotation.id.in_(list(quotation_ids))))
+            return set(result.scalars().all())
+
+    @handle_db_exceptions()
+    async def get_quotation_versions(self, quotation_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """ 견적서 추출 결과 캐시 키 생성을 위한 견적서 변경 정보 조회 """
+        if not quotation_ids:
+            return []
         async with self.session as session:
-            query = select(func.sum(QuotationProduct.price)). \
-                where(QuotationProduct.quotation_id == quotation_id)
+            query = (
+                select(Quotation.id, Quotation.name, Quotation.total_price, Quotation.created_at, Quotation.updated_at)
+                .where(Quotation.id.in_(quotation_ids))
+                .order_by(Quotation.id)
+            )
             result = await session.execute(query)
-            total_price = result.scalar()
+            return [dict(x) for x in result.mappings().all()]
+
+    @handle_db_exceptions()
+    async def get_quotations_with_products(
+            self, quotation_ids: Sequence[int]) -> Dict[int, Tuple[Quotation, List[Dict[str, Any]]]]:
+        """ 견적서와 견적서 물품(제품 정보 포함)을 단일 쿼리로 조회 """
+        if not quotation_ids:
+            return {}
 
-            query = select(Quotation).filter(Quotation.id == quotation_id)
+        async with self.session as session:
+            query = (
+                select(
+                    Quotation,
+                    Product.id.label("product_id"),
+                    Product.category.label("category"),
+                    Product.name.label("product"),
+                    Product.unit.label("unit"),
+                    QuotationProduct.quantity.label("quantity"),
+                    QuotationProduct.price.label("price"),
+                    QuotationProduct.created_at.label("created_at"),
+                    QuotationProduct.updated_at.label("updated_at"),
+                )
+                .outerjoin(QuotationProduct, QuotationProduct.quotation_id == Quotation.id)
+                .outerjoin(Product, Product.id == QuotationProduct.product_id)
+                .where(Quotation.id.in_(quotation_ids))
+                .order_by(Quotation.id, QuotationProduct.product_id)
+            )
             result = await session.execute(query)
-            quotation = result.scalar_one_or_none()
 
-            if quotation and total_price is not None:
-                quotation.total_price = total_price
-                quotation.updated_at = datetime.now()
-                await session.commit()
-            return total_price
+            quotations = {}
+            for row in result.all():
+                quotation = row.Quotation
+                _, products = quotations.setdefault(quotation.id, (quotation, []))
+                if row.product_id is None:
+                    continue
+                products.append({
+                    "id": row.product_id,
+                    "category": row.category,
+                    "product": row.product,
+                    "unit": row.unit,
+                    "quantity": row.quantity,
+                    "price": row.price,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at
+                })
+            return quotations
+
+    async def get_quotation_with_products(
+            self, quotation_id: int) -> Tuple[Optional[Quotation], List[Dict[str, Any]]]:
+        quotations = await self.get_quotations_with_products([quotation_id])
+        return quotations.get(quotation_id, (None, []))
+
+    @handle_db_exceptions()
+    async def get_total_price(self, quotation_id: int) -> Optional[int]:
+        async with self.session as session:
+            return await session.scalar(select(Quotation.total_price).where(Quotation.id == quotation_id))
+
+    @handle_db_exceptions()
+    async def reconcile_total_prices(self, dry_run: bool = False) -> List[Dict[str, int]]:
+        """ 견적서 물품 합계와 다른 견적서 합계 금액을 찾아 일괄 수정 """
+        async with self.session as session:
+            async with session.begin():
+                line_total = func.coalesce(func.sum(QuotationProduct.price), 0)
+                drift_query = (
+                    select(
+                        Quotation.id.label("quotation_id"),
+                        Quotation.total_price.label("stored_total"),
+                        line_total.label("actual_total")
+                    )
+                    .outerjoin(QuotationProduct, QuotationProduct.quotation_id == Quotation.id)
+                    .group_by(Quotation.id, Quotation.total_price)
+                    .having(Quotation.total_price != line_total)
+                )
+                result = await session.execute(drift_query)
+                drifts = [dict(x) for x in result.mappings().all()]
+
+                if drifts and not dry_run:
+                    actual_total = (
+                        select(func.coalesce(func.sum(QuotationProduct.price), 0))
+                        .where(QuotationProduct.quotation_id == Quotation.id)
+                        .scalar_subquery()
+                    )
+                    stmt = (
+                        update(Quotation)
+                        .where(Quotation.id.in_([x["quotation_id"] for x in drifts]))
+                        .values(total_price=actual_total, updated_at=func.now())
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.execute(stmt)
+            return drifts
 
     @handle_db_exceptions()
     async def search_quotation(self, start: date, end: date, query: str) -> Sequence[Quotation]:
@@ -100,58 +269,79 @@ class QuotationRepository:
             return result
 
     @handle_db_exceptions()
-    async def get_quotations_by_client_id(self, client_id: int, page: int = 1, page_size: int = 10):
+    async def search_quotation_by_name(self, query: str, start: Optional[date] = None, end: Optional[date] = None,
+                                       cursor: Optional[int] = None, limit: int = 20) -> Sequence[Quotation]:
+        """ ngram FULLTEXT 인덱스로 견적서 이름을 검색하여 최신순(id 내림차순)으로 반환
+
+        MATCH 관련도는 견적서가 추가될 때마다(IDF) 달라지므로 검색 조건으로만 사용하고, 마지막 견적서 id 를 cursor 로 사용한다.
+        새 견적서는 cursor 보다 큰 id 를 가지므로 페이지를 넘기는 중에 추가되어도 이후 페이지가 중복/누락되지 않는다.
+        """
         async with self.session as session:
-            offset = (page - 1) * page_size
+            stmt = select(Quotation).where(name_search_condition(query))
+            if start:
+                stmt = stmt.where(Quotation.created_at >= get_date_range(start)[0])
+            if end:
+                stmt = stmt.where(Quotation.created_at < get_date_range(end)[1])
+            if cursor:
+                stmt = stmt.where(Quotation.id < cursor)
+            stmt = stmt.order_by(Quotation.id.desc()).limit(limit)
 
-            count_query = select(func.count()).select_from(Quotation).where(Quotation.client_id == client_id)
-            total = await session.scalar(count_query)
+            result = await session.execute(stmt)
+            return result.scalars().all()
 
+    @handle_db_exceptions()
+    async def get_quotations_by_client_id(self, client_id: int, cursor: Optional[Tuple[datetime, int]] = None,
+                                          page_size: int = 10) -> Sequence[Quotation]:
+        async with self.session as session:
+            query = select(Quotation).where(Quotation.client_id == client_id)
+            if cursor:
+                query = query.where(created_before_cursor(cursor))
             query = (
-                select(Quotation)
-                .where(Quotation.client_id == client_id)
-                .order_by(Quotation.created_at.desc())
-                .offset(offset)
+                query
+                .order_by(Quotation.created_at.desc(), Quotation.id.desc())
                 .limit(page_size)
             )
             result = await session.execute(query)
-            quotations = result.scalars().all()
-            return quotations, total
+            return result.scalars().all()
 
     @handle_db_exceptions()
-    async def get_quotations_by_data_range(self, client_id, start_date: date, end_date: date, page: int = 1,
-                                           page_size: int = 10):
+    async def get_quotations_by_data_range(self, client_id, start_date: date, end_date: date,
+                                           cursor: Optional[Tuple[datetime, int]] = None,
+                                           page_size: int = 10) -> Sequence[Quotation]:
         async with self.session as session:
-            count_query = (
-                select(func.count())
-                .select_from(Quotation)
-                .where(and_(
-                    Quotation.created_at.between(start_date, end_date),
-                    Quotation.client_id == client_id
-                ))
-            )
-            total = await session.scalar(count_query)
-
-            offset = (page - 1) * page_size
+            query = select(Quotation).where(and_(
+                Quotation.client_id == client_id,
+                date_range_condition(Quotation.created_at, start_date, end_date)
+            ))
+            if cursor:
+                query = query.where(created_before_cursor(cursor))
             query = (
-                select(Quotation)
-                .where(and_(
-                    Quotation.created_at.between(start_date, end_date),
-                    Quotation.client_id == client_id
-                ))
-                .order_by(Quotation.created_at.desc())
-                .offset(offset)
+                query
+                .order_by(Quotation.created_at.desc(), Quotation.id.desc())
                 .limit(page_size)
             )
             result = await session.execute(query)
-            quotations = result.scalars().all()
+            return result.scalars().all()
 
-            return quotations, total
+    @handle_db_exceptions()
+    async def get_quotation_ids_by_client_id(self, client_id: int) -> Sequence[int]:
+        async with self.session as session:
+            result = await session.execute(select(Quotation.id).where(Quotation.client_id == client_id))
+            return result.scalars().all()
+
+    @handle_db_exceptions()
+    async def count_quotations_by_client_id(self, client_id: int, start_date: Optional[date] = None,
+                                            end_date: Optional[date] = None) -> int:
+        async with self.session as session:
+            query = select(func.count()).select_from(Quotation).where(Quotation.client_id == client_id)
+            if start_date and end_date:
+                query = query.where(date_range_condition(Quotation.created_at, start_date, end_date))
+            return await session.scalar(query)
 
     @handle_db_exceptions()
     async def get_today_quotation_ids(self, today: date):
         async with self.session as session:
-            query = (select(Quotation.id).filter(func.date(Quotation.created_at) == today))
+            query = select(Quotation.id).filter(date_range_condition(Quotation.created_at, today))
             result = await session.execute(query)
             quotation_ids = result.scalars().all()
             return quotation_ids
@@ -162,7 +352,7 @@ class QuotationRepository:
             query = select(Quotation).where(
                 and_(
                     Quotation.client_id == client_id,
-                    func.date(Quotation.created_at) == input_date
+                    date_range_condition(Quotation.created_at, input_date)
                 )
             )
             result = await session.execute(query)
@@ -182,6 +372,7 @@ class QuotationRepository:
 
             if quotation_product:
                 await session.delete(quotation_product)
+                await session.execute(update_total_price_by_delta(quotation_id, -(quotation_product.price or 0)))
                 await session.commit()
 
     @handle_db_exceptions()
@@ -190,7 +381,7 @@ class QuotationRepository:
             query = select(Quotation).where(
                 and_(
                     Quotation.client_id == client_id,
-                    func.date(Quotation.input_date) == input_date
+                    Quotation.input_date == input_date
                 )
             ).exists()
 
@@ -199,11 +390,14 @@ class QuotationRepository:
             return quotation
 
     @handle_db_exceptions()
-    async def delete_quotation(self, quotation_id: int):
+    async def delete_quotation(self, quotation_id: int) -> Optional[int]:
+        """ 견적서 삭제 후 견적서의 거래처 ID 반환 """
         async with self.session as session:
             quotation = await session.get(Quotation, quotation_id)
+            client_id = quotation.client_id
             await session.delete(quotation)
             await session.commit()
+            return client_id
 
     @handle_db_exceptions()
     async def update_particulars(self, quotation_id, particulars):
@@ -213,6 +407,8 @@ class QuotationRepository:
             quotation = result.scalar_one_or_none()
 
             quotation.particulars = particulars
+            # 추출 결과 캐시 키가 updated_at 을 사용하므로 함께 갱신
+            quotation.updated_at = func.now()
             await session.commit()
 
     @handle_db_exceptions()
@@ -223,6 +419,8 @@ class QuotationRepository:
             quotation = result.scalar_one_or_none()
 
             quotation.status = QuotationStatus.COMPLETED.value
+            # 추출 결과 캐시 키가 updated_at 을 사용하므로 함께 갱신
+            quotation.updated_at = func.now()
             await session.commit()
 
     @handle_db_exceptions()
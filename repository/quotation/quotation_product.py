@@ -1,14 +1,16 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Sequence
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import select, insert, tuple_
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.db.database import async_get_db
 from core.decorator.decorator import handle_db_exceptions
 
 from models.quotation_product import QuotationProduct
+from repository.quotation.quotation import update_total_price_by_delta
 
 
 class QuotationProductRepository:
@@ -21,8 +23,39 @@ class QuotationProductRepository:
 
     @handle_db_exceptions()
     async def bulk_create_quotation_product(self, quotation_products: List[QuotationProduct]):
-        for quotation_product in quotation_products:
-            await self.create_quotation_product(quotation_product)
+        """ 견적서 물품을 하나의 multi-row INSERT로 저장하고 같은 트랜잭션에서 견적서 합계 금액 갱신 """
+        if not quotation_products:
+            return
+        values = []
+        deltas = defaultdict(int)
+        for x in quotation_products:
+            values.append({
+                "quotation_id": x.quotation_id,
+                "product_id": x.product_id,
+                "price": x.price,
+                "quantity": x.quantity
+            })
+            deltas[x.quotation_id] += x.price or 0
+
+        async with self.session as session:
+            async with session.begin():
+                await session.execute(insert(QuotationProduct).values(values))
+                for quotation_id, delta in deltas.items():
+                    await session.execute(update_total_price_by_delta(quotation_id, delta))
+
+    @handle_db_exceptions()
+    async def get_existing_quotation_product_keys(
+            self, keys: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """ (quotation_id, product_id) 목록 중 이미 저장된 조합을 단일 쿼리로 조회 """
+        if not keys:
+            return []
+        async with self.session as session:
+            query = (
+                select(QuotationProduct.quotation_id, QuotationProduct.product_id)
+                .where(tuple_(QuotationProduct.quotation_id, QuotationProduct.product_id).in_(list(keys)))
+            )
+            result = await session.execute(query)
+            return [tuple(x) for x in result.all()]
 
     @handle_db_exceptions()
     async def get_quotation_product_by_quotation_id(self, quotation_id: int):
@@ -58,9 +91,13 @@ class QuotationProductRepository:
             result = await session.execute(query)
             quotation_product = result.scalars().first()
             if quotation_product:
+                old_price = quotation_product.price or 0
                 for key, value in new_data.items():
                     setattr(quotation_product, key, value)
                 quotation_product.updated_at = datetime.utcnow()
+                delta = (quotation_product.price or 0) - old_price
+                if delta:
+                    await session.execute(update_total_price_by_delta(quotation_id, delta))
                 await session.commit()
                 await session.refresh(quotation_product)
                 return True
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db.database import async_get_db
 from core.decorator.decorator import handle_db_exceptions
+from core.utils import date_range_condition
 from models import Quotation, Client, Product, QuotationProduct
 
 
@@ -74,7 +75,7 @@ class StatisticsRepository:
                         func.date(Quotation.created_at).label('date'),
                         func.sum(Quotation.total_price).label('total')
                     )
-                    .filter(Quotation.created_at.between(start_date, end_date))
+                    .filter(date_range_condition(Quotation.created_at, start_date, end_date))
                     .group_by(func.date(Quotation.created_at))
                     .order_by(func.date(Quotation.created_at))
                 )
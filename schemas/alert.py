@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class AlertMetrics(BaseModel):
+    queued: int
+    sent: int
+    deduplicated: int
+    dropped: int
+    failed: int
@@ -1,18 +1,19 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from pydantic import BaseModel
 
-from models import Client
-from schemas.quotation import QuotationRead
+from core.utils import encode_cursor
+from models import Client, Quotation
+from schemas.quotation import QuotationRead, to_quotation_read
 
 
 class ClientPaginatedResponse(BaseModel):
     items: List[QuotationRead]
-    total: int
-    page: int
+    next_cursor: Optional[str]
+    has_next: bool
     page_size: int
-    total_pages: int
+    total: Optional[int] = None
 
 
 class ClientRead(BaseModel):
@@ -70,3 +71,19 @@ def to_client_check_preview(client: Client, status: bool) -> ClientCheckPreview:
         client_id=client.id,
         status=status
     )
+
+
+def to_client_paginated_response(quotations: Sequence[Quotation], page_size: int,
+                                 total: Optional[int] = None) -> ClientPaginatedResponse:
+    """ page_size + 1 개 조회 결과로 다음 페이지 존재 여부와 cursor 생성 """
+    has_next = len(quotations) > page_size
+    items = quotations[:page_size]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+
+    return ClientPaginatedResponse(
+        items=[to_quotation_read(x) for x in items],
+        next_cursor=next_cursor,
+        has_next=has_next,
+        page_size=page_size,
+        total=total
+    )
@@ -0,0 +1,42 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel
+
+
+class ExportJobKind(str, Enum):
+    QUOTATION = "quotation"
+    DAILY = "daily"
+
+
+class ExportJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class ExportJobCreate(BaseModel):
+    kind: ExportJobKind
+    quotation_id: Optional[int] = None
+    input_date: Optional[date] = None
+
+
+class ExportJobRead(BaseModel):
+    job_id: str
+    kind: ExportJobKind
+    status: ExportJobStatus
+    filename: str
+    cached: bool
+    error: Optional[str] = None
+
+
+def to_export_job_read(job: dict) -> ExportJobRead:
+    return ExportJobRead(
+        job_id=job["job_id"],
+        kind=job["kind"],
+        status=job["status"],
+        filename=job["filename"],
+        cached=job["cached"] == "1",
+        error=job.get("error") or None
+    )
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class IpBanRead(BaseModel):
+    ip: str
+    expires_at: float
+
+
+class IpBanMetrics(BaseModel):
+    banned: int
+    bans: int
+    unbans: int
+    rejected: int
+    hits: int
@@ -1,8 +1,12 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from enum import Enum
 
+from pydantic import BaseModel
+
+from schemas.product import ProductPriceChange
+
 
 class ProductClass(Enum):
     RETAIL = "01"    # 소매
@@ -27,4 +31,30 @@ class KamisPeriodProductListParams:
     kind_code: Optional[str] = None
     product_rank_code: Optional[str] = None
     country_code: Optional[str] = None
-    convert_kg_yn: str = "N"
\ No newline at end of file
+    convert_kg_yn: str = "N"
+
+
+class KamisProductMappingForm(BaseModel):
+    product_id: int
+    item_category_code: str
+    item_code: str
+    kind_code: str
+    product_rank_code: Optional[str] = None
+    price_multiplier: float = 1.0
+
+
+class KamisProductMappingRead(KamisProductMappingForm):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class KamisSyncResult(BaseModel):
+    dry_run: bool
+    start_date: date
+    end_date: date
+    changes: List[ProductPriceChange]
+    unchanged: int
+    missing_items: List[str]
+    failed_items: List[str]
@@ -1,3 +1,7 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 from models import Product
@@ -21,6 +25,67 @@ class ProductCreate(BaseModel):
     price: float
 
 
+class ProductUploadResult(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+class ProductPriceChange(BaseModel):
+    product_id: int
+    name: str
+    old_price: int
+    new_price: int
+
+
+class ProductNameMatchMethod(str, Enum):
+    EXACT = "exact"
+    ALIAS = "alias"
+    NORMALIZED = "normalized"
+    FUZZY = "fuzzy"
+
+
+class ProductNameMatch(BaseModel):
+    name: str
+    product_id: int
+    product_name: str
+    score: int
+    method: ProductNameMatchMethod
+
+
+class ProductNameCandidate(BaseModel):
+    product_id: int
+    name: str
+    score: int
+
+
+class AmbiguousProductName(BaseModel):
+    name: str
+    candidates: List[ProductNameCandidate]
+
+
+class ProductAliasForm(BaseModel):
+    alias: str
+    product_id: int
+
+
+class VegetablePriceUpdateResult(BaseModel):
+    dry_run: bool
+    changes: List[ProductPriceChange]
+    unchanged: int
+    unmatched: List[str]
+    matches: List[ProductNameMatch] = []
+    ambiguous: List[AmbiguousProductName] = []
+
+
+class CatalogSnapshot(BaseModel):
+    version: Optional[str] = None
+    synced_at: datetime
+    full: bool
+    products: List[ProductRead]
+    deleted_ids: List[int]
+
+
 class ProductCount(BaseModel):
     id: int
     category: str
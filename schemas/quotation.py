@@ -59,6 +59,22 @@ class QuotationRead(BaseModel):
     updated_at: Optional[datetime]
 
 
+class QuotationCacheMetrics(BaseModel):
+    hits: int
+    misses: int
+    stale: int
+    invalidations: int
+    hit_rate: float
+    average_age_seconds: float
+    max_age_seconds: float
+
+
+class QuotationSearchResponse(BaseModel):
+    items: List[QuotationRead]
+    next_cursor: Optional[str]
+    has_next: bool
+
+
 class ProductInput(BaseModel):
     id: int
     price: int
@@ -74,6 +90,20 @@ class QuotationUpdate(BaseModel):
     products: List[ProductInput]
 
 
+class QuotationTotalDrift(BaseModel):
+    quotation_id: int
+    stored_total: int
+    actual_total: int
+
+
+class QuotationUpdateResult(BaseModel):
+    inserted: int
+    updated: int
+    deleted: int
+    changed: int
+    unchanged: int
+
+
 class QuotationRecentInfo(BaseModel):
     products: List[str]
     date: date
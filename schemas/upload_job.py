@@ -0,0 +1,43 @@
+import json
+from enum import Enum
+from typing import Optional, Dict, Any
+from pydantic import BaseModel
+
+
+class UploadJobKind(str, Enum):
+    PRODUCT = "product"
+    VEGETABLE_PRICE = "vegetable_price"
+
+
+class UploadJobStatus(str, Enum):
+    PENDING = "PENDING"
+    PARSING = "PARSING"
+    WRITING = "WRITING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class UploadJobRead(BaseModel):
+    job_id: str
+    kind: UploadJobKind
+    status: UploadJobStatus
+    filename: str
+    dry_run: bool
+    total_rows: int
+    processed_rows: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def to_upload_job_read(job: dict) -> UploadJobRead:
+    return UploadJobRead(
+        job_id=job["job_id"],
+        kind=job["kind"],
+        status=job["status"],
+        filename=job["filename"],
+        dry_run=job["dry_run"] == "1",
+        total_rows=int(job["total_rows"]),
+        processed_rows=int(job["processed_rows"]),
+        result=json.loads(job["result"]) if job.get("result") else None,
+        error=job.get("error") or None
+    )
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import aiohttp
+import dotenv
+import sentry_sdk
+
+from schemas.alert import AlertMetrics
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 전송 대기 알림 최대 개수 (초과 시 버림)
+ALERT_QUEUE_SIZE = 1000
+# 같은 메세지를 다시 보내지 않는 시간(초)과 기억하는 메세지 수
+ALERT_DEDUP_WINDOW = int(os.getenv("ALERT_DEDUP_WINDOW", "60"))
+ALERT_DEDUP_SIZE = 10000
+# 첫 알림 이후 함께 보낼 알림을 모으는 시간(초)
+ALERT_BATCH_INTERVAL = 2.0
+# Discord webhook 제한: 메세지 2000자, webhook 당 분당 30회 -> 전송 간격 2초
+DISCORD_MESSAGE_LIMIT = 2000
+DISCORD_SEND_INTERVAL = 2.0
+DISCORD_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# 종료 시 남은 알림을 보내기 위해 기다리는 최대 시간(초)
+ALERT_FLUSH_TIMEOUT = 5.0
+
+
+class AlertDispatcher:
+    """ Discord/Sentry 알림을 요청 처리와 분리해 보내는 알림 큐
+
+    alert() 는 기다리지 않고 큐에 넣기만 하며, background task 가 하나의 aiohttp session 으로
+    모아서 전송한다. 같은 메세지는 dedup_window 동안 한 번만 보내고, 큐가 가득 차면 버린 뒤 개수를 기록한다.
+    """
+    def __init__(self, webhook_url: Optional[str] = None, dedup_window: float = ALERT_DEDUP_WINDOW,
+                 queue_size: int = ALERT_QUEUE_SIZE, send_interval: float = DISCORD_SEND_INTERVAL):
+        self.webhook_url = webhook_url if webhook_url is not None else os.getenv("DISCORD_WEB_HOOK")
+        self.dedup_window = dedup_window
+        self.send_interval = send_interval
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.recent: OrderedDict[str, float] = OrderedDict()
+        self.carry: Optional[str] = None
+        self.next_send_at = 0.0
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def alert(self, message: str, level: str = "error", sentry: bool = True) -> bool:
+        """ 알림 등록 (중복이거나 큐가 가득 차 버린 경우 False) """
+        now = time.monotonic()
+        last = self.recent.get(message)
+        if last is not None and now - last < self.dedup_window:
+            self.deduplicated += 1
+            return False
+        self.recent[message] = now
+        self.recent.move_to_end(message)
+        while len(self.recent) > ALERT_DEDUP_SIZE:
+            self.recent.popitem(last=False)
+
+        if sentry:
+            sentry_sdk.capture_message(message, level=level)
+        if not self.webhook_url:
+            return True
+        try:
+            self.queue.put_nowait(message[:DISCORD_MESSAGE_LIMIT])
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def start(self) -> None:
+        if self.task is None and self.webhook_url:
+            self.session = aiohttp.ClientSession(timeout=DISCORD_TIMEOUT)
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = ALERT_FLUSH_TIMEOUT) -> None:
+        """ 남은 알림을 timeout 동안 보낸 뒤 종료 """
+        if self.task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"종료 전 보내지 못한 알림 {self.queue.qsize()}건")
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        await self.session.close()
+        self.task, self.session = None, None
+
+    async def run(self) -> None:
+        while True:
+            batch = await self.next_batch()
+            try:
+                await self.send(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"discord 알림 전송 실패: {type(e).__name__} - {str(e)}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def next_batch(self) -> List[str]:
+        """ 첫 알림 이후 batch_interval 동안 들어온 알림을 2000자 이내로 묶음 """
+        batch = [self.carry if self.carry is not None else await self.queue.get()]
+        self.carry = None
+        length = len(batch[0])
+        deadline = time.monotonic() + ALERT_BATCH_INTERVAL
+        while (timeout := deadline - time.monotonic()) > 0:
+            try:
+                message = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if length + 1 + len(message) > DISCORD_MESSAGE_LIMIT:
+                self.carry = message
+                break
+            batch.append(message)
+            length += 1 + len(message)
+        return batch
+
+    async def send(self, batch: List[str]) -> None:
+        webhook_data = {"content": "\n".join(batch), "username": "MINIFOOD SERVER BOT"}
+        for _ in range(2):
+            await asyncio.sleep(max(self.next_send_at - time.monotonic(), 0))
+            async with self.session.post(self.webhook_url, json=webhook_data) as response:
+                self.next_send_at = time.monotonic() + self.send_interval
+                if response.status != 429:
+                    break
+                # rate limit 에 걸리면 Discord 가 알려준 시간만큼 기다린 뒤 한 번 더 전송
+                retry_after = (await response.json(content_type=None) or {}).get("retry_after", self.send_interval)
+                self.next_send_at = time.monotonic() + float(retry_after)
+
+        if response.status >= 300:
+            self.failed += len(batch)
+            logger.error(f"discord 알림 전송 실패: HTTP {response.status}")
+        else:
+            self.sent += len(batch)
+
+    def metrics(self) -> AlertMetrics:
+        return AlertMetrics(
+            queued=self.queue.qsize() + (self.carry is not None),
+            sent=self.sent,
+            deduplicated=self.deduplicated,
+            dropped=self.dropped,
+            failed=self.failed
+        )
+
+
+alert_dispatcher = AlertDispatcher()
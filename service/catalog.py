@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Depends
+from redis.exceptions import RedisError
+
+from core.db.redis import redis_client
+from core.response.api_response import ApiResponse
+from core.response.code.success_status import SuccessStatus
+from repository.product.product import ProductRepository
+from schemas.product import CatalogSnapshot, to_product_read
+from service.quotation_cache import CATALOG_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+
+def catalog_etag(catalog_version: str) -> str:
+    return f'W/"catalog-{catalog_version}"'
+
+
+class CatalogSnapshotCache:
+    """ 현재 카탈로그 버전의 전체 스냅샷 응답(직렬화된 JSON)을 프로세스 내부에 보관 """
+    def __init__(self):
+        self.catalog_version: Optional[str] = None
+        self.body: Optional[bytes] = None
+
+    def get(self, catalog_version: Optional[str]) -> Optional[bytes]:
+        if catalog_version is not None and catalog_version == self.catalog_version:
+            return self.body
+        return None
+
+    def set(self, catalog_version: Optional[str], body: bytes) -> None:
+        if catalog_version is not None:
+            self.catalog_version, self.body = catalog_version, body
+
+
+catalog_snapshot_cache = CatalogSnapshotCache()
+
+
+class CatalogService:
+    def __init__(self, product_repository: ProductRepository = Depends(ProductRepository)):
+        self.product_repository = product_repository
+
+    @staticmethod
+    async def get_catalog_version() -> Optional[str]:
+        try:
+            return await redis_client.get(CATALOG_VERSION_KEY) or "0"
+        except RedisError as e:
+            logger.error(f"catalog version 조회 실패: {str(e)}")
+            return None
+
+    async def get_snapshot(self, catalog_version: Optional[str],
+                           since: Optional[datetime] = None) -> bytes:
+        """ 전체 스냅샷(현재 버전은 캐시 사용) 또는 since 이후 변경분을 직렬화된 응답으로 반환 """
+        if since is None:
+            cached = catalog_snapshot_cache.get(catalog_version)
+            if cached is not None:
+                return cached
+
+        # 다음 동기화 기준 시각은 조회 전에 DB 시각으로 기록 (조회 도중 변경된 제품은 다음 동기화에 포함)
+        synced_at = await self.product_repository.get_database_now()
+        if since is None:
+            products = await self.product_repository.get_all_products()
+            deleted_ids = []
+        else:
+            products = await self.product_repository.get_products_changed_since(since)
+            deleted_ids = await self.product_repository.get_deleted_product_ids_since(since)
+
+        snapshot = CatalogSnapshot(
+            version=catalog_version,
+            synced_at=synced_at,
+            full=since is None,
+            products=[to_product_read(x) for x in products],
+            deleted_ids=deleted_ids
+        )
+        body = ApiResponse[CatalogSnapshot].of(SuccessStatus.OK, result=snapshot) \
+            .model_dump_json(by_alias=True).encode()
+        if since is None:
+            catalog_snapshot_cache.set(catalog_version, body)
+        return body
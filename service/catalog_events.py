@@ -0,0 +1,37 @@
+import asyncio
+import logging
+
+from core.db.redis import redis_client
+from service.price_table import price_table
+from service.product_search import refresh_product_search_index
+from service.quotation_cache import CATALOG_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+# pub/sub 연결이 끊긴 경우 다시 구독하기까지 대기 시간(초)
+CATALOG_LISTENER_RETRY_INTERVAL = 5
+
+
+async def run_catalog_change_listener() -> None:
+    """ 다른 worker 의 제품 변경(카탈로그 버전 변경) 알림을 받아 가격표와 검색 색인을 갱신 """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(CATALOG_CHANNEL)
+            # 구독 전에 놓친 변경이 있을 수 있으므로 구독 직후 한 번 만료
+            price_table.invalidate()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                price_table.invalidate()
+                try:
+                    await refresh_product_search_index()
+                except Exception as e:
+                    logger.error(f"제품 검색 색인 갱신 실패: {type(e).__name__} - {str(e)}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"catalog 변경 구독 실패: {type(e).__name__} - {str(e)}")
+            await asyncio.sleep(CATALOG_LISTENER_RETRY_INTERVAL)
+        finally:
+            await pubsub.aclose()
@@ -11,6 +11,7 @@ from repository.quotation.quotation import QuotationRepository
 from repository.quotation.quotation_product import QuotationProductRepository
 from schemas.client import to_client_check_preview, RegionType, ClientUpdate, ClientCreate, to_client_read, ClientRead
 from schemas.quotation import QuotationRecentInfo
+from service.quotation_cache import quotation_info_cache
 from service.user import UserService
 
 
@@ -42,7 +43,10 @@ class ClientService:
         await self.user_service.link_user_to_client(response_client.id, user_id)
 
     async def delete_client(self, client_id: int):
-        return await self.client_repository.delete_client_by_id(client_id)
+        quotation_ids = await self.quotation_repository.get_quotation_ids_by_client_id(client_id)
+        result = await self.client_repository.delete_client_by_id(client_id)
+        await quotation_info_cache.invalidate(*quotation_ids)
+        return result
 
     async def update_client(self, client_id: int, client_update: ClientUpdate):
         client_data = client_update.dict()
@@ -68,16 +72,15 @@ class ClientService:
 
     async def get_client_quotation_info_recent(self, client_id: int):
         """ 거래처에서 최근에 구매한 제품 5개의 정보를 반환"""
-        quotations, _ = await self.quotation_repository.get_quotations_by_client_id(client_id)
+        quotations = await self.quotation_repository.get_quotations_by_client_id(client_id, page_size=3)
         if len(quotations) == 0:
             raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
-        recent_quotations = sorted(quotations, key=lambda x: x.created_at, reverse=True)[:3]
+        quotation_products = await self.quotation_repository.get_quotations_with_products(
+            [x.id for x in quotations])
         result = []
-        for quotation in recent_quotations:
-            quotation_products = await self.quotation_product_repository.get_quotation_products_by_quotation_id(quotation.id)
-            product_list = [await self.product_repository.get_product_by_id(x.product_id) for x in quotation_products]
-            products = product_list[:5]
-            product_name = [x.name for x in products]
+        for quotation in quotations:
+            _, products = quotation_products[quotation.id]
+            product_name = [x["product"] for x in products[:5]]
             recent_info = QuotationRecentInfo(
                 products=product_name,
                 date=quotation.created_at.date()
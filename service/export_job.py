@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+import uuid
+import zipfile
+from typing import List, Dict, Any, Optional, Tuple
+
+from fastapi import Depends
+
+from core.db.database import local_session
+from core.db.redis import redis_client
+from core.response.code.error_status import ErrorStatus
+from core.response.handler.exception_handler import ServiceException
+from repository.quotation.quotation import QuotationRepository
+from schemas.export_job import ExportJobCreate, ExportJobRead, ExportJobKind, ExportJobStatus, to_export_job_read
+from service.job_worker import JobWorker
+from service.quotation import EXPORT_BATCH_SIZE, write_quotation_workbook
+from service.quotation_cache import CATALOG_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+# 추출 결과 파일 저장 경로 (파일명은 견적서 변경 정보로 만든 캐시 키)
+EXPORT_CACHE_PATH = os.getenv("EXPORT_CACHE_PATH", os.path.join(os.getcwd(), "exports"))
+# 추출 작업 상태 보관 시간(초)
+EXPORT_JOB_TTL = 60 * 60 * 24
+# 결과 파일 보관 기간(초)과 전체 크기 제한 (초과 시 오래 사용하지 않은 파일부터 삭제)
+EXPORT_CACHE_MAX_AGE = int(os.getenv("EXPORT_CACHE_MAX_AGE", str(60 * 60 * 24 * 7)))
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+EXPORT_MEDIA_TYPES = {
+    ExportJobKind.QUOTATION: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportJobKind.DAILY: "application/zip",
+}
+
+
+def build_artifact_key(kind: ExportJobKind, catalog_version: str, versions: List[Dict[str, Any]]) -> str:
+    """ 견적서 ID와 updated_at(및 카탈로그 버전)으로 추출 결과의 내용 주소 키 생성 """
+    digest = hashlib.sha256()
+    digest.update(f"{kind.value}:{catalog_version}".encode())
+    for version in versions:
+        updated_at = version["updated_at"] or version["created_at"]
+        digest.update(f"|{version['id']}:{updated_at.isoformat()}:{version['total_price']}".encode())
+    return digest.hexdigest()
+
+
+def get_artifact_path(kind: ExportJobKind, artifact_key: str) -> str:
+    extension = "xlsx" if kind == ExportJobKind.QUOTATION else "zip"
+    return os.path.join(EXPORT_CACHE_PATH, f"{artifact_key}.{extension}")
+
+
+def job_key(job_id: str) -> str:
+    return f"export_job:{job_id}"
+
+
+def cleanup_export_cache(now: Optional[float] = None) -> List[str]:
+    """ 보관 기간이 지난 결과 파일을 삭제하고, 전체 크기가 제한을 넘으면 오래 사용하지 않은 파일부터 삭제
+
+    결과 파일은 재사용할 때마다 수정 시각을 갱신하므로 수정 시각 순서가 사용 순서가 된다.
+    """
+    now = now or time.time()
+    try:
+        entries = [x for x in os.scandir(EXPORT_CACHE_PATH) if x.is_file()]
+    except FileNotFoundError:
+        return []
+
+    files = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        # 작성 중인 임시 파일은 보관 기간이 지난 경우에만 삭제
+        if entry.name.endswith(".tmp") and now - stat.st_mtime <= EXPORT_CACHE_MAX_AGE:
+            continue
+        files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort()
+
+    total = sum(size for _, size, _ in files)
+    removed = []
+    for mtime, size, path in files:
+        if now - mtime <= EXPORT_CACHE_MAX_AGE and total <= EXPORT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def write_zip_entries(zip_file: zipfile.ZipFile, entries: List[Tuple[str, List[Dict[str, Any]]]]) -> None:
+    """ 견적서 excel 파일을 작성해 zip entry 로 추가 """
+    for filename, products in entries:
+        buffer = io.BytesIO()
+        write_quotation_workbook(products, buffer)
+        zip_file.writestr(filename, buffer.getvalue())
+
+
+class ExportJobService:
+    def __init__(self, quotation_repository: QuotationRepository = Depends(QuotationRepository)):
+        self.quotation_repository = quotation_repository
+
+    async def submit_job(self, job_create: ExportJobCreate) -> ExportJobRead:
+        """ 추출 작업 등록. 변경되지 않은 견적서의 결과 파일이 있으면 바로 완료 처리 """
+        if job_create.kind == ExportJobKind.QUOTATION:
+            if job_create.quotation_id is None:
+                raise ServiceException(ErrorStatus.REQUIRED_FIELD_MISSING)
+            quotation_ids = [job_create.quotation_id]
+        else:
+            if job_create.input_date is None:
+                raise ServiceException(ErrorStatus.REQUIRED_FIELD_MISSING)
+            quotation_ids = list(await self.quotation_repository.get_today_quotation_ids(job_create.input_date))
+
+        versions = await self.quotation_repository.get_quotation_versions(quotation_ids)
+        if job_create.kind == ExportJobKind.QUOTATION:
+            if not versions:
+                raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
+            filename = f"{versions[0]['name']} 견적서.xlsx"
+        else:
+            filename = f"minifood_{job_create.input_date.strftime('%Y-%m-%d')}.zip"
+
+        catalog_version = await redis_client.get(CATALOG_VERSION_KEY) or "0"
+        artifact_key = build_artifact_key(job_create.kind, catalog_version, versions)
+        try:
+            # 재사용한 파일은 정리 대상에서 뒤로 밀리도록 수정 시각 갱신
+            os.utime(get_artifact_path(job_create.kind, artifact_key))
+            cached = True
+        except FileNotFoundError:
+            cached = False
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": job_create.kind.value,
+            "status": (ExportJobStatus.COMPLETED if cached else ExportJobStatus.PENDING).value,
+            "filename": filename,
+            "artifact_key": artifact_key,
+            "quotation_ids": json.dumps([x["id"] for x in versions]),
+            "cached": "1" if cached else "0",
+            "error": "",
+        }
+        await redis_client.hset(job_key(job["job_id"]), mapping=job)
+        await redis_client.expire(job_key(job["job_id"]), EXPORT_JOB_TTL)
+
+        if not cached:
+            await export_job_worker.enqueue(job["job_id"])
+
+        return to_export_job_read(job)
+
+    async def get_job(self, job_id: str) -> ExportJobRead:
+        job = await redis_client.hgetall(job_key(job_id))
+        if not job:
+            raise ServiceException(ErrorStatus.EXPORT_JOB_NOT_FOUND)
+        return to_export_job_read(job)
+
+    async def get_job_artifact(self, job_id: str) -> Tuple[str, str, str]:
+        """ 완료된 작업의 결과 파일 경로, 파일명, media type 반환 """
+        job = await redis_client.hgetall(job_key(job_id))
+        if not job:
+            raise ServiceException(ErrorStatus.EXPORT_JOB_NOT_FOUND)
+
+        kind = ExportJobKind(job["kind"])
+        path = get_artifact_path(kind, job["artifact_key"])
+        if job["status"] != ExportJobStatus.COMPLETED.value or not os.path.exists(path):
+            raise ServiceException(ErrorStatus.EXPORT_JOB_NOT_COMPLETED)
+
+        return path, job["filename"], EXPORT_MEDIA_TYPES[kind]
+
+
+async def run_export_job(job_id: str) -> None:
+    """ 추출 결과 파일을 임시 파일에 작성한 뒤 캐시 경로로 이동
+
+    DB 조회만 event loop 에서 실행하고, excel/zip 작성과 파일 쓰기는 thread 에서 실행해 API 요청 처리를 막지 않는다.
+    """
+    job = await redis_client.hgetall(job_key(job_id))
+    if not job:
+        return
+
+    kind = ExportJobKind(job["kind"])
+    path = get_artifact_path(kind, job["artifact_key"])
+    if os.path.exists(path):
+        await redis_client.hset(job_key(job_id), mapping={"status": ExportJobStatus.COMPLETED.value, "cached": "1"})
+        return
+
+    await redis_client.hset(job_key(job_id), "status", ExportJobStatus.RUNNING.value)
+    os.makedirs(EXPORT_CACHE_PATH, exist_ok=True)
+    tmp_path = f"{path}.{job_id}.tmp"
+    quotation_ids = json.loads(job["quotation_ids"])
+
+    try:
+        async with local_session() as session:
+            quotation_repository = QuotationRepository(session)
+            if kind == ExportJobKind.QUOTATION:
+                quotation, products = await quotation_repository.get_quotation_with_products(quotation_ids[0])
+                if not quotation:
+                    raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
+                await asyncio.to_thread(write_quotation_workbook, products, tmp_path)
+            else:
+                with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                    for start in range(0, len(quotation_ids), EXPORT_BATCH_SIZE):
+                        batch_ids = quotation_ids[start:start + EXPORT_BATCH_SIZE]
+                        quotations = await quotation_repository.get_quotations_with_products(batch_ids)
+                        entries = [(f"{quotation.name} 견적서.xlsx", products)
+                                   for quotation, products in quotations.values()]
+                        await asyncio.to_thread(write_zip_entries, zip_file, entries)
+        os.replace(tmp_path, path)
+        await redis_client.hset(job_key(job_id), "status", ExportJobStatus.COMPLETED.value)
+    except Exception as e:
+        logger.error(f"export job {job_id} 실패: {type(e).__name__} - {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        await redis_client.hset(job_key(job_id), mapping={
+            "status": ExportJobStatus.FAILED.value,
+            "error": str(e) or type(e).__name__
+        })
+        return
+
+    removed = await asyncio.to_thread(cleanup_export_cache)
+    if removed:
+        logger.info(f"export cache 정리: {len(removed)}개 파일 삭제")
+
+
+export_job_worker = JobWorker(run_export_job, "export_job", job_key)
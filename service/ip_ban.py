@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from redis.exceptions import RedisError
+
+from core.db.redis import redis_client
+from schemas.ip_ban import IpBanMetrics, IpBanRead
+
+logger = logging.getLogger(__name__)
+
+# 차단된 IP -> 차단 만료 시각(epoch) sorted set
+IP_BAN_KEY = "ip_ban"
+IP_BAN_STATS_KEY = "ip_ban:stats"
+# 이 시간(초) 안에 차단 목록/없는 경로 요청이 threshold 회 이상이면 차단
+IP_BAN_HIT_THRESHOLD = int(os.getenv("IP_BAN_HIT_THRESHOLD", "20"))
+IP_BAN_HIT_WINDOW = int(os.getenv("IP_BAN_HIT_WINDOW", "60"))
+# 차단 유지 시간(초)
+IP_BAN_TTL = int(os.getenv("IP_BAN_TTL", str(60 * 60)))
+# worker 의 차단 목록을 Redis 와 맞추는 간격(초)
+IP_BAN_SYNC_INTERVAL = 5
+# 차단하지 않는 IP (reverse proxy 뒤라면 proxy IP 포함)
+IP_BAN_EXEMPT_IPS = {x.strip() for x in os.getenv("IP_BAN_EXEMPT_IPS", "127.0.0.1,::1").split(",") if x.strip()}
+
+
+def hit_key(ip: str) -> str:
+    return f"ip_ban:hits:{ip}"
+
+
+class IpBanList:
+    """ 스캐너 IP 차단 목록
+
+    차단 목록은 만료 시각을 점수로 하는 Redis sorted set 에 저장하고, 각 worker 는 이를 메모리에 복사해 두고
+    주기적으로 맞춘다. 요청마다 확인하는 is_banned() 는 Redis 를 거치지 않는다.
+    """
+    def __init__(self, threshold: int = IP_BAN_HIT_THRESHOLD, window: int = IP_BAN_HIT_WINDOW,
+                 ttl: int = IP_BAN_TTL, exempt_ips: Optional[set] = None):
+        self.threshold = threshold
+        self.window = window
+        self.ttl = ttl
+        self.exempt_ips = IP_BAN_EXEMPT_IPS if exempt_ips is None else exempt_ips
+        self.banned: Dict[str, float] = {}
+        self.rejected = 0
+        self.hits = 0
+
+    def is_banned(self, ip: Optional[str]) -> bool:
+        expires_at = self.banned.get(ip)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self.banned.pop(ip, None)
+            return False
+        self.rejected += 1
+        return True
+
+    async def record_hit(self, ip: Optional[str]) -> bool:
+        """ 차단 목록/없는 경로 요청 기록. 기준을 넘으면 차단하고 True 반환 """
+        if not ip or ip in self.exempt_ips:
+            return False
+        self.hits += 1
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(hit_key(ip), 0, ex=self.window, nx=True)
+                pipe.incr(hit_key(ip))
+                _, count = await pipe.execute()
+            if count >= self.threshold:
+                await self.ban(ip)
+                return True
+        except RedisError as e:
+            logger.error(f"ip ban 요청 기록 실패: {str(e)}")
+        return False
+
+    async def ban(self, ip: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.time() + (ttl or self.ttl)
+        self.banned[ip] = expires_at
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zadd(IP_BAN_KEY, {ip: expires_at})
+            pipe.delete(hit_key(ip))
+            added, _ = await pipe.execute()
+        if added:
+            await redis_client.hincrby(IP_BAN_STATS_KEY, "bans", 1)
+            logger.warning(f"ip 차단: {ip} ({ttl or self.ttl}초)")
+
+    async def unban(self, ip: str) -> bool:
+        self.banned.pop(ip, None)
+        if not await redis_client.zrem(IP_BAN_KEY, ip):
+            return False
+        await redis_client.hincrby(IP_BAN_STATS_KEY, "unbans", 1)
+        return True
+
+    async def sync(self) -> None:
+        """ 만료된 차단을 정리하고 Redis 의 차단 목록으로 메모리 목록 교체 """
+        now = time.time()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(IP_BAN_KEY, "-inf", now)
+            pipe.zrangebyscore(IP_BAN_KEY, now, "+inf", withscores=True)
+            expired, banned = await pipe.execute()
+        if expired:
+            await redis_client.hincrby(IP_BAN_STATS_KEY, "unbans", expired)
+        self.banned = dict(banned)
+
+    async def get_bans(self) -> list[IpBanRead]:
+        banned = await redis_client.zrangebyscore(IP_BAN_KEY, time.time(), "+inf", withscores=True)
+        return [IpBanRead(ip=ip, expires_at=expires_at) for ip, expires_at in banned]
+
+    async def metrics(self) -> IpBanMetrics:
+        stats = await redis_client.hgetall(IP_BAN_STATS_KEY)
+        return IpBanMetrics(
+            banned=len(self.banned),
+            bans=int(stats.get("bans", 0)),
+            unbans=int(stats.get("unbans", 0)),
+            rejected=self.rejected,
+            hits=self.hits
+        )
+
+
+ip_ban_list = IpBanList()
+
+
+async def run_ip_ban_sync(interval: int = IP_BAN_SYNC_INTERVAL) -> None:
+    while True:
+        try:
+            await ip_ban_list.sync()
+        except Exception as e:
+            logger.error(f"ip 차단 목록 동기화 실패: {type(e).__name__} - {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import uuid
+from typing import Awaitable, Callable, List, Optional
+
+from redis.exceptions import RedisError
+
+from core.db.redis import redis_client
+from core.response.code.error_status import ErrorStatus
+from core.response.handler.exception_handler import ServiceException
+
+logger = logging.getLogger(__name__)
+
+# worker 가 살아 있음을 알리는 heartbeat 갱신 간격과 유지 시간(초)
+JOB_WORKER_HEARTBEAT_INTERVAL = 10
+JOB_WORKER_HEARTBEAT_TTL = 30
+# 더 이상 실행하지 않는 작업 상태 (추출/업로드 작업 공통)
+JOB_FINISHED_STATUSES = {"COMPLETED", "FAILED"}
+JOB_PENDING_STATUS = "PENDING"
+
+
+class JobWorker:
+    """ 프로세스 내부 큐에서 작업 id를 꺼내 runner 로 실행하는 백그라운드 worker
+
+    작업 상태는 Redis hash(job_key) 에 있으므로, 실행 중인 작업 id 를 Redis set 에 함께 기록하고
+    작업을 맡은 worker 의 heartbeat 가 끊기면(재시작, 종료, 장애) 살아 있는 worker 가 가져와 다시 실행한다.
+    """
+    def __init__(self, runner: Callable[[str], Awaitable[None]], name: str, job_key: Callable[[str], str],
+                 concurrency: int = 1):
+        self.runner = runner
+        self.name = name
+        self.job_key = job_key
+        self.concurrency = concurrency
+        self.worker_id: Optional[str] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+
+    @property
+    def active_key(self) -> str:
+        return f"{self.name}:active"
+
+    def heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.name}:worker:{worker_id}"
+
+    def start(self) -> None:
+        self.worker_id = uuid.uuid4().hex
+        self.queue = asyncio.Queue()
+        self.tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+        self.tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.worker_id is None:
+            return
+        # 남은 작업을 다른 worker 가 바로 가져갈 수 있도록 heartbeat 삭제
+        try:
+            await redis_client.delete(self.heartbeat_key(self.worker_id))
+        except RedisError as e:
+            logger.error(f"{self.name} worker heartbeat 삭제 실패: {str(e)}")
+
+    async def enqueue(self, job_id: str) -> None:
+        if self.queue is None:
+            raise ServiceException(ErrorStatus.SERVICE_UNAVAILABLE)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(self.job_key(job_id), "worker_id", self.worker_id)
+            pipe.sadd(self.active_key, job_id)
+            await pipe.execute()
+        self.queue.put_nowait(job_id)
+
+    async def recover(self) -> List[str]:
+        """ heartbeat 가 끊긴 worker 의 대기/실행 중 작업을 가져와 다시 등록 (가져온 작업 id 반환) """
+        recovered = []
+        for job_id in await redis_client.smembers(self.active_key):
+            status, worker_id = await redis_client.hmget(self.job_key(job_id), ["status", "worker_id"])
+            if status is None or status in JOB_FINISHED_STATUSES:
+                # 끝났거나 보관 시간이 지나 삭제된 작업
+                await redis_client.srem(self.active_key, job_id)
+                continue
+            if worker_id == self.worker_id or \
+                    (worker_id and await redis_client.exists(self.heartbeat_key(worker_id))):
+                continue
+            # 여러 worker 가 동시에 같은 작업을 가져가지 않도록 한 worker 만 선점
+            claimed = await redis_client.set(f"{self.name}:claim:{job_id}", self.worker_id,
+                                             ex=JOB_WORKER_HEARTBEAT_TTL, nx=True)
+            if not claimed:
+                continue
+            await redis_client.hset(self.job_key(job_id), mapping={
+                "status": JOB_PENDING_STATUS,
+                "worker_id": self.worker_id
+            })
+            self.queue.put_nowait(job_id)
+            recovered.append(job_id)
+        if recovered:
+            logger.warning(f"{self.name} 작업 {len(recovered)}건을 이전 worker 에서 가져와 다시 실행")
+        return recovered
+
+    async def _heartbeat(self) -> None:
+        """ heartbeat 를 갱신하고 중단된 작업을 확인 (시작 직후 한 번, 이후 주기적으로) """
+        while True:
+            try:
+                await redis_client.set(self.heartbeat_key(self.worker_id), 1, ex=JOB_WORKER_HEARTBEAT_TTL)
+                await self.recover()
+            except Exception as e:
+                logger.error(f"{self.name} 작업 복구 중 오류: {type(e).__name__} - {str(e)}")
+            await asyncio.sleep(JOB_WORKER_HEARTBEAT_INTERVAL)
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            try:
+                try:
+                    await self.runner(job_id)
+                except Exception as e:
+                    logger.error(f"job {job_id} 처리 중 오류: {str(e)}")
+                # 종료(cancel)로 중단된 작업은 목록에 남겨 다른 worker 가 다시 실행
+                await self._finish(job_id)
+            finally:
+                self.queue.task_done()
+
+    async def _finish(self, job_id: str) -> None:
+        try:
+            await redis_client.srem(self.active_key, job_id)
+        except RedisError as e:
+            logger.error(f"{self.name} 작업 목록 갱신 실패: {str(e)}")
@@ -1,4 +1,5 @@
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional
 
 import httpx
 
@@ -6,13 +7,41 @@ from core.response.code.error_status import ErrorStatus
 from core.response.handler.exception_handler import ServiceException
 from schemas.kamis import KamisPeriodProductListParams, ReturnType
 
+# KAMIS 요청에 사용하는 공유 client 의 최대 연결 수 / 요청 제한 시간(초)
+KAMIS_MAX_CONNECTIONS = int(os.getenv("KAMIS_MAX_CONNECTIONS", "10"))
+KAMIS_TIMEOUT = float(os.getenv("KAMIS_TIMEOUT", "10"))
+
+_kamis_client: Optional[httpx.AsyncClient] = None
+
+
+def get_kamis_client() -> httpx.AsyncClient:
+    """ 연결을 재사용하도록 프로세스에서 하나의 httpx client 를 공유 """
+    global _kamis_client
+    if _kamis_client is None or _kamis_client.is_closed:
+        _kamis_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=KAMIS_MAX_CONNECTIONS,
+                                max_keepalive_connections=KAMIS_MAX_CONNECTIONS),
+            timeout=KAMIS_TIMEOUT
+        )
+    return _kamis_client
+
+
+async def close_kamis_client() -> None:
+    global _kamis_client
+    if _kamis_client is not None:
+        await _kamis_client.aclose()
+        _kamis_client = None
+
 
 class KamisService:
     BASE_URL = "http://www.kamis.or.kr/service/price/xml.do"
 
-    def __init__(self, cert_key:str, cert_id: str):
+    def __init__(self, cert_key: str, cert_id: str, client: Optional[httpx.AsyncClient] = None,
+                 base_url: Optional[str] = None):
         self.cert_key = cert_key
         self.cert_id = cert_id
+        self.client = client
+        self.base_url = base_url or self.BASE_URL
 
     async def build_period_product_list_params(self, params: KamisPeriodProductListParams) -> Dict[str, Any]:
         request_params = {
@@ -43,16 +72,20 @@ class KamisService:
 
     async def get_period_product_list(self, params: KamisPeriodProductListParams) -> str | Any:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.BASE_URL,
-                    params=await self.build_period_product_list_params(params)
-                )
-                response.raise_for_status()
+            client = self.client or get_kamis_client()
+            response = await client.get(
+                self.base_url,
+                params=await self.build_period_product_list_params(params)
+            )
+            response.raise_for_status()
 
-                if params.return_type == ReturnType.JSON:
-                    return response.json()
-                return response.text
+            if params.return_type == ReturnType.JSON:
+                return response.json()
+            return response.text
 
         except httpx.HTTPError as e:
             raise ServiceException(ErrorStatus.EXTERNAL_SERVICE_UNAVAILABLE)
+
+
+def get_kamis_service() -> KamisService:
+    return KamisService(cert_key=os.getenv('KAMIS_API_KEY'), cert_id=os.getenv('KAMIS_ID'))
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Depends
+from redis.exceptions import RedisError
+
+from core.db.redis import redis_client
+from models import KamisProductMapping
+from repository.kamis.kamis import KamisProductMappingRepository
+from schemas.kamis import KamisPeriodProductListParams, KamisProductMappingForm, KamisSyncResult
+from service.kamis import KamisService, get_kamis_service
+from service.product import ProductService
+
+logger = logging.getLogger(__name__)
+
+# KAMIS 동시 요청 수
+KAMIS_SYNC_CONCURRENCY = int(os.getenv("KAMIS_SYNC_CONCURRENCY", "5"))
+# KAMIS 응답 캐시 유지 시간(초)
+KAMIS_RESPONSE_CACHE_TTL = 60 * 60 * 6
+# 기간을 지정하지 않은 경우 조회하는 일 수
+KAMIS_SYNC_DEFAULT_DAYS = 7
+
+# (부류 코드, 품목 코드, 품종 코드, 등급 코드)
+KamisItemKey = Tuple[str, str, str, Optional[str]]
+
+
+def item_key(mapping: KamisProductMapping) -> KamisItemKey:
+    return mapping.item_category_code, mapping.item_code, mapping.kind_code, mapping.product_rank_code
+
+
+def format_item_key(key: KamisItemKey) -> str:
+    return "-".join(x for x in key if x)
+
+
+def parse_kamis_latest_price(response: Any) -> Optional[int]:
+    """ periodProductList 응답에서 가장 최근 평균 가격 추출 (데이터가 없으면 None) """
+    data = response.get("data") if isinstance(response, dict) else None
+    items = data.get("item") if isinstance(data, dict) else None
+    if not items:
+        return None
+    if isinstance(items, dict):
+        items = [items]
+
+    rows = [x for x in items if x.get("countyname") == "평균"] or items
+    for item in reversed(rows):
+        price = str(item.get("price", "")).replace(",", "").strip()
+        if price.isdigit():
+            return int(price)
+    return None
+
+
+class KamisResponseCache:
+    """ KAMIS 응답을 (품목, 기간) 단위로 Redis에 저장. Redis 장애 시 캐시 미스로 처리 """
+    def __init__(self, ttl: int = KAMIS_RESPONSE_CACHE_TTL):
+        self.ttl = ttl
+
+    @staticmethod
+    def key(key: KamisItemKey, start_date: date, end_date: date) -> str:
+        return f"kamis:period:{format_item_key(key)}:{start_date.isoformat()}:{end_date.isoformat()}"
+
+    async def get(self, key: KamisItemKey, start_date: date, end_date: date) -> Optional[Any]:
+        try:
+            cached = await redis_client.get(self.key(key, start_date, end_date))
+        except RedisError as e:
+            logger.error(f"kamis cache 조회 실패: {str(e)}")
+            return None
+        return json.loads(cached) if cached is not None else None
+
+    async def set(self, key: KamisItemKey, start_date: date, end_date: date, response: Any) -> None:
+        try:
+            await redis_client.set(self.key(key, start_date, end_date), json.dumps(response), ex=self.ttl)
+        except RedisError as e:
+            logger.error(f"kamis cache 저장 실패: {str(e)}")
+
+
+kamis_response_cache = KamisResponseCache()
+
+
+class KamisSyncService:
+    def __init__(self,
+                 kamis_mapping_repository: KamisProductMappingRepository = Depends(KamisProductMappingRepository),
+                 product_service: ProductService = Depends(ProductService),
+                 kamis_service: KamisService = Depends(get_kamis_service)):
+        self.kamis_mapping_repository = kamis_mapping_repository
+        self.product_service = product_service
+        self.kamis_service = kamis_service
+
+    async def get_mappings(self) -> List[KamisProductMapping]:
+        return list(await self.kamis_mapping_repository.get_all_mappings())
+
+    async def replace_mappings(self, mappings: List[KamisProductMappingForm]) -> List[KamisProductMapping]:
+        await self.kamis_mapping_repository.replace_mappings([x.model_dump() for x in mappings])
+        return await self.get_mappings()
+
+    async def sync_prices(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                          dry_run: bool = False) -> KamisSyncResult:
+        """ 연결된 KAMIS 품목 시세를 동시에 조회해 제품 가격을 한 번에 갱신 """
+        end_date = end_date or date.today()
+        start_date = start_date or end_date - timedelta(days=KAMIS_SYNC_DEFAULT_DAYS)
+
+        mappings = await self.get_mappings()
+        keys = list(dict.fromkeys(item_key(x) for x in mappings))
+        semaphore = asyncio.Semaphore(KAMIS_SYNC_CONCURRENCY)
+        responses = await asyncio.gather(
+            *[self._fetch(key, start_date, end_date, semaphore) for key in keys], return_exceptions=True
+        )
+
+        prices, failed_items, missing_items = dict(), [], []
+        for key, response in zip(keys, responses):
+            if isinstance(response, Exception):
+                logger.error(f"kamis 조회 실패 {format_item_key(key)}: {type(response).__name__}")
+                failed_items.append(format_item_key(key))
+                continue
+            price = parse_kamis_latest_price(response)
+            if price is None:
+                missing_items.append(format_item_key(key))
+            else:
+                prices[key] = price
+
+        product_prices = {
+            x.product_id: round(prices[item_key(x)] * x.price_multiplier)
+            for x in mappings if item_key(x) in prices
+        }
+        result = await self.product_service.apply_product_prices(product_prices, dry_run)
+
+        return KamisSyncResult(
+            dry_run=dry_run,
+            start_date=start_date,
+            end_date=end_date,
+            changes=result["changes"],
+            unchanged=result["unchanged"],
+            missing_items=missing_items,
+            failed_items=failed_items
+        )
+
+    async def _fetch(self, key: KamisItemKey, start_date: date, end_date: date,
+                     semaphore: asyncio.Semaphore) -> Any:
+        cached = await kamis_response_cache.get(key, start_date, end_date)
+        if cached is not None:
+            return cached
+
+        item_category_code, item_code, kind_code, product_rank_code = key
+        params = KamisPeriodProductListParams(
+            cert_key=self.kamis_service.cert_key,
+            cert_id=self.kamis_service.cert_id,
+            start_date=start_date,
+            end_date=end_date,
+            item_category_code=item_category_code,
+            item_code=item_code,
+            kind_code=kind_code,
+            product_rank_code=product_rank_code
+        )
+        async with semaphore:
+            response = await self.kamis_service.get_period_product_list(params)
+        await kamis_response_cache.set(key, start_date, end_date, response)
+        return response
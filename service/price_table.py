@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from redis.exceptions import RedisError
+
+from core.db.database import local_session
+from core.db.redis import redis_client
+from repository.product.product import ProductRepository
+from service.quotation_cache import CATALOG_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+# 가격표에 없는 제품 조회 시 다시 읽는 최소 간격(초)
+PRICE_TABLE_MISS_RELOAD_INTERVAL = 1.0
+# Redis 의 catalog version 과 비교하는 최소 간격(초), pub/sub 알림을 놓친 경우에도 이 간격 안에 반영
+PRICE_TABLE_VERSION_CHECK_INTERVAL = 1.0
+# catalog version 을 확인할 수 없을 때(Redis 장애) 가격표를 다시 읽는 최대 보관 시간(초)
+PRICE_TABLE_MAX_AGE = 60.0
+
+PriceLoader = Callable[[], Awaitable[Sequence[Tuple[int, int]]]]
+
+
+async def load_product_prices() -> Sequence[Tuple[int, int]]:
+    async with local_session() as session:
+        return await ProductRepository(session).get_product_prices()
+
+
+class PriceTable:
+    """ 제품 ID 별 가격을 정렬된 배열 두 개(ID, 가격)로 보관하는 프로세스 내부 가격표
+
+    제품당 16 byte 로 10만 개 제품도 약 1.6MB 이며, 이진 탐색으로 조회한다.
+    제품 가격이 바뀌면 invalidate() 로 만료시키고 다음 조회 시 DB에서 한 번에 다시 읽는다.
+    pub/sub 알림이 유실될 수 있으므로 조회 시 PRICE_TABLE_VERSION_CHECK_INTERVAL 마다 Redis 의 catalog version 과 비교한다.
+    """
+    def __init__(self, loader: PriceLoader = load_product_prices):
+        self.loader = loader
+        self.ids = array("q")
+        self.prices = array("q")
+        self.catalog_version: Optional[str] = None
+        self.stale = True
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+    async def reload(self) -> None:
+        async with self.lock:
+            if not self.stale:
+                return
+            # 조회 도중 들어온 무효화는 다음 조회에서 다시 반영되도록 먼저 stale 해제
+            self.stale = False
+            try:
+                catalog_version = await redis_client.get(CATALOG_VERSION_KEY) or "0"
+            except RedisError as e:
+                logger.error(f"catalog version 조회 실패: {str(e)}")
+                catalog_version = None
+            try:
+                rows = await self.loader()
+            except Exception:
+                self.stale = True
+                raise
+
+            self.ids = array("q", (x[0] for x in rows))
+            self.prices = array("q", (x[1] for x in rows))
+            self.catalog_version = catalog_version
+            self.loaded_at = self.checked_at = time.monotonic()
+
+    async def check_version(self) -> None:
+        """ 읽어 둔 catalog version 이 Redis 와 다르면 만료 (Redis 를 조회할 수 없으면 PRICE_TABLE_MAX_AGE 기준) """
+        now = time.monotonic()
+        if self.stale or now - self.checked_at < PRICE_TABLE_VERSION_CHECK_INTERVAL:
+            return
+        # 동시에 들어온 조회가 모두 Redis 를 확인하지 않도록 먼저 기록
+        self.checked_at = now
+        try:
+            catalog_version = await redis_client.get(CATALOG_VERSION_KEY) or "0"
+        except RedisError as e:
+            logger.error(f"catalog version 조회 실패: {str(e)}")
+            catalog_version = None
+        if catalog_version is None or self.catalog_version is None:
+            if now - self.loaded_at > PRICE_TABLE_MAX_AGE:
+                self.invalidate()
+        elif catalog_version != self.catalog_version:
+            self.invalidate()
+
+    def _lookup(self, product_id: int) -> Optional[int]:
+        index = bisect_left(self.ids, product_id)
+        if index < len(self.ids) and self.ids[index] == product_id:
+            return self.prices[index]
+        return None
+
+    async def get_prices(self, product_ids: Iterable[int]) -> Dict[int, int]:
+        """ 제품 ID 별 가격 반환 (없는 제품은 제외). 가격표에 없는 제품이 있으면 한 번 다시 읽은 뒤 확인 """
+        product_ids = set(product_ids)
+        await self.check_version()
+        if self.stale:
+            await self.reload()
+
+        prices = {x: price for x in product_ids if (price := self._lookup(x)) is not None}
+        if len(prices) != len(product_ids) and \
+                time.monotonic() - self.loaded_at > PRICE_TABLE_MISS_RELOAD_INTERVAL:
+            # 다른 worker 에서 방금 추가된 제품일 수 있으므로 한 번 더 확인
+            self.invalidate()
+            await self.reload()
+            prices = {x: price for x in product_ids if (price := self._lookup(x)) is not None}
+        return prices
+
+    async def get_price(self, product_id: int) -> Optional[int]:
+        return (await self.get_prices([product_id])).get(product_id)
+
+
+price_table = PriceTable()
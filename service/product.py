@@ -1,86 +1,105 @@
-import os
-import pandas as pd
-
-from typing import Any, Sequence, Dict, Optional
+import asyncio
+import tempfile
+from datetime import date
+from typing import Any, Sequence, Dict, Optional, Callable, Awaitable, Iterable, List, Tuple, AsyncIterator, BinaryIO
 from fastapi import Depends, UploadFile
-from pydantic import ValidationError
 
 from core.response.code.error_status import ErrorStatus
-from core.response.handler.exception_handler import ServiceException
+from core.response.handler.exception_handler import ServiceException, DatabaseException
 from models import User, Product
 from repository.product.product import ProductRepository
-from schemas.product import ProductRead, to_product_count
-from core.db.redis import redis_client
-
-
-def read_excel_file_about_product_list(file_path: str) -> list[Dict]:
-    """
-        excel 파일 형식
-        sheet name - 제품 카테고리
-        0열 - 제품 이름 / 1열 - 제품 개수 / 2열 - 제품 가격
-    """
-    data = list()
-    xls = pd.ExcelFile(file_path)
-    for sheet_name in xls.sheet_names:
-        df = xls.parse(sheet_name)
-        category = sheet_name
-        for _, row in df.iterrows():
-            try:
-                price = row.iloc[2]
-                if type(price) is str:
-                    price = int(price.replace(",", ""))
-                product_data = {
-                    'name': row.iloc[0],
-                    'unit': row.iloc[1],
-                    'price': price,
-                    'category': category
-                }
-                data.append(product_data)
-            except ValidationError as e:
-                raise ServiceException(ErrorStatus.INVALID_VALUE)
-    return data
-
-
-def read_excel_file_about_vegetable_price_list(file_path: str) -> dict:
-    """
-       excel 파일 형식
-       0열 - 제품(vegetable) 이름 / 1열 - 제품(vegetable) 가격
-    """
-    data = dict()
-    df = pd.read_excel(file_path, header=None)
-    try:
-        for _, row in df.iterrows():
-            product_name = row.iloc[0]
-            price = row.iloc[1]
-            data[product_name] = price
-    except ValidationError as e:
-        raise ServiceException(ErrorStatus.INVALID_VALUE)
-    return data
+from schemas.product import ProductRead, ProductUploadResult, VegetablePriceUpdateResult, to_product_count, \
+    ProductNameMatch, ProductNameMatchMethod, AmbiguousProductName, to_product_read
+from service.product_file import spool_upload, remove_spooled_upload, parse_in_process_pool, \
+    write_product_list_workbook
+from service.product_parser import read_excel_file_about_product_list, read_excel_file_about_vegetable_price_list
+from service.price_table import price_table
+from service.product_match import match_product_names
+from service.product_search import product_search_index, bump_product_names_version
+from service.quotation_cache import bump_catalog_version
+from service.recent_purchase import recent_purchase_counter
+
+# 제품 일괄 등록 시 한 번에 조회/저장하는 행 수
+PRODUCT_UPSERT_CHUNK_SIZE = 1000
+# 제품 목록 추출 시 DB 에서 한 번에 가져오는 행 수와 파일 전송 단위
+PRODUCT_EXPORT_YIELD_PER = 1000
+PRODUCT_EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def classify_product_rows(rows: list[Dict], existing: Dict[str, Product]) -> tuple[list[Dict], Dict[str, int]]:
+    """ 기존 제품과 비교해 추가/수정/변경 없음으로 분류하고, 저장이 필요한 행만 반환 """
+    changed_rows = []
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for row in rows:
+        product = existing.get(row["name"])
+        if product is None:
+            counts["inserted"] += 1
+            changed_rows.append(row)
+        elif (product.unit, product.price, product.category) != (row["unit"], row["price"], row["category"]):
+            counts["updated"] += 1
+            changed_rows.append(row)
+        else:
+            counts["unchanged"] += 1
+    return changed_rows, counts
 
 
 class ProductService:
     def __init__(self, product_repository: ProductRepository = Depends(ProductRepository)):
         self.product_repository = product_repository
 
-    async def upload_products(self, file: UploadFile):
+    async def upload_products(self, file: UploadFile) -> ProductUploadResult:
+        file_path = None
         try:
-            EXCEL_FILE_PATH = os.getenv('EXCEL_FILE_PATH')
-            file_path = os.path.join(EXCEL_FILE_PATH, file.filename)
-            with open(file_path, "wb") as buffer:
-                buffer.write(await file.read())
-            product_datas = read_excel_file_about_product_list(file_path)
-
-            # 중복된 제품 일 경우 제품 수정
-            for product_data in product_datas:
-                product = await self.product_repository.get_product_by_name(product_data["name"])
-                if product:
-                    await self.product_repository.update_product(product.id, product_data)
-                else:
-                    product = Product(**product_data)
-                    await self.product_repository.create_product(product)
-
+            file_path = await spool_upload(file)
+            product_datas = await parse_in_process_pool(read_excel_file_about_product_list, file_path)
+            return await self.import_products(product_datas)
+        except ServiceException:
+            raise
         except Exception as e:
             raise ServiceException(ErrorStatus.FILE_UPLOAD_ERROR)
+        finally:
+            remove_spooled_upload(file_path)
+
+    async def import_products(self, product_datas: list[Dict],
+                              progress: Optional[Callable[[int], Awaitable[None]]] = None) -> ProductUploadResult:
+        """ 중복된 제품 일 경우 제품 수정 (chunk 단위로 기존 제품 조회 후 변경된 제품만 upsert) """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for i in range(0, len(product_datas), PRODUCT_UPSERT_CHUNK_SIZE):
+            chunk = product_datas[i:i + PRODUCT_UPSERT_CHUNK_SIZE]
+            existing = {x.name: x for x in await self.product_repository.get_products_by_names([x["name"] for x in chunk])}
+            changed_rows, chunk_counts = classify_product_rows(chunk, existing)
+            await self.product_repository.upsert_products(changed_rows, PRODUCT_UPSERT_CHUNK_SIZE)
+            for key, value in chunk_counts.items():
+                counts[key] += value
+            if progress:
+                await progress(i + len(chunk))
+
+        if counts["inserted"]:
+            # 새 이름이 추가된 경우에만 검색 색인 재생성 (기존 제품 수정은 이름이 같음)
+            await self._rebuild_search_index(await self._catalog_changed(names_changed=True))
+        elif counts["updated"]:
+            await self._catalog_changed()
+        return ProductUploadResult(**counts)
+
+    async def export_products(self) -> Tuple[AsyncIterator[bytes], str]:
+        """ 전체 제품을 분류 별 sheet 로 임시 파일에 작성한 뒤 chunk 단위로 전송 (업로드 파일 형식과 동일) """
+        file = tempfile.TemporaryFile()
+        try:
+            rows = self.product_repository.stream_products_by_category(PRODUCT_EXPORT_YIELD_PER)
+            await write_product_list_workbook(rows, file)
+        except Exception as e:
+            file.close()
+            raise DatabaseException(str(e))
+
+        filename = f"minifood_products_{date.today().strftime('%Y-%m-%d')}.xlsx"
+        return self._read_export_file(file), filename
+
+    @staticmethod
+    async def _read_export_file(file: BinaryIO) -> AsyncIterator[bytes]:
+        with file:
+            file.seek(0)
+            while chunk := await asyncio.to_thread(file.read, PRODUCT_EXPORT_CHUNK_SIZE):
+                yield chunk
 
     async def get_products_by_category(self, category: str) -> Sequence[Product]:
         return await self.product_repository.get_products_by_category(category)
@@ -92,7 +111,12 @@ class ProductService:
             return None
 
         if await self.product_repository.update_product(product_id, product):
+            names_changed = "name" in new_data
+            names_version = await self._catalog_changed(names_changed)
             updated_product = await self.product_repository.get_product_by_id(product_id)
+            if updated_product and names_changed:
+                product_search_index.upsert(updated_product.id, updated_product.name)
+                product_search_index.advance_names_version(names_version)
             return updated_product
 
         return None
@@ -101,39 +125,114 @@ class ProductService:
         product_name = product_data["name"]
         if not await self.product_repository.exists_product_by_name(product_name):
             product = Product(**product_data)
-            return await self.product_repository.create_product(product)
+            await self.product_repository.create_product(product)
+            names_version = await self._catalog_changed(names_changed=True)
+            product_search_index.upsert(product.id, product.name)
+            product_search_index.advance_names_version(names_version)
+            return product
         else:
             raise ServiceException(ErrorStatus.PRODUCT_NOT_CREATED)
 
     async def delete_product(self, product_id: int) -> None:
         await self.product_repository.delete_product_by_id(product_id)
+        names_version = await self._catalog_changed(names_changed=True)
+        product_search_index.remove(product_id)
+        product_search_index.advance_names_version(names_version)
 
     async def update_vegetable_product_price(self, product_id, price):
         if await self.product_repository.update_vegetable_product_price(product_id, price):
+            await self._catalog_changed()
             return True
         else:
             raise ServiceException(ErrorStatus.PRODUCT_NOT_UPDATED)
 
-    async def update_vegetable_product_price_from_file(self, file: UploadFile):
+    async def update_vegetable_product_price_from_file(self, file: UploadFile,
+                                                       dry_run: bool = False) -> VegetablePriceUpdateResult:
+        file_path = None
         try:
-            EXCEL_FILE_PATH = os.getenv('EXCEL_FILE_PATH')
-            file_path = os.path.join(EXCEL_FILE_PATH, file.filename)
-            with open(file_path, "wb") as buffer:
-                buffer.write(await file.read())
-            vegetable_price_data = read_excel_file_about_vegetable_price_list(file_path)
-            result = await self.product_repository.update_vegetable_products_price(vegetable_price_data)
+            file_path = await spool_upload(file)
+            vegetable_price_data = await parse_in_process_pool(read_excel_file_about_vegetable_price_list, file_path)
+            return await self.apply_vegetable_prices(vegetable_price_data, dry_run)
+        except ServiceException:
+            raise
         except Exception as e:
             raise ServiceException(ErrorStatus.FILE_UPLOAD_ERROR)
+        finally:
+            remove_spooled_upload(file_path)
+
+    async def apply_vegetable_prices(self, vegetable_price_data: Dict[str, int],
+                                     dry_run: bool = False) -> VegetablePriceUpdateResult:
+        """ 파일의 물품 이름을 제품과 매칭한 뒤 가격 일괄 변경 (검토가 필요한 이름은 변경하지 않고 후보와 함께 반환) """
+        matches, ambiguous, unmatched = await self.match_product_names(vegetable_price_data)
+        prices = {x.product_id: vegetable_price_data[x.name] for x in matches}
+        result = await self.apply_product_prices(prices, dry_run)
+
+        if not dry_run:
+            # 자동 매칭된 이름은 별칭으로 저장해 다음 파일부터는 바로 매칭
+            await self.product_repository.save_product_aliases({
+                x.name: x.product_id for x in matches
+                if x.method in (ProductNameMatchMethod.NORMALIZED, ProductNameMatchMethod.FUZZY)
+            })
+
+        return VegetablePriceUpdateResult(
+            dry_run=dry_run,
+            changes=result["changes"],
+            unchanged=result["unchanged"],
+            unmatched=unmatched,
+            matches=[x for x in matches if x.method != ProductNameMatchMethod.EXACT],
+            ambiguous=ambiguous
+        )
+
+    async def match_product_names(self, names: Iterable[str]) \
+            -> Tuple[List[ProductNameMatch], List[AmbiguousProductName], List[str]]:
+        names = list(names)
+        catalog = await self.product_repository.get_product_names()
+        aliases = await self.product_repository.get_product_aliases(names)
+        # 점수 계산은 CPU 작업이므로 event loop 를 막지 않도록 thread 에서 실행
+        return await asyncio.to_thread(match_product_names, names, catalog, aliases)
+
+    async def save_product_aliases(self, aliases: Dict[str, int]) -> None:
+        """ 검토 후 확인된 별칭 저장 """
+        await self.product_repository.save_product_aliases(aliases)
+
+    async def apply_product_prices(self, prices: Dict[int, int], dry_run: bool = False) -> Dict[str, Any]:
+        """ 제품 ID 별 가격 일괄 변경 (변경 내역, 변경 없음 건수, 찾지 못한 제품 ID 반환) """
+        result = await self.product_repository.update_products_price(prices, dry_run)
+        if not dry_run and result["changes"]:
+            # 검색 색인은 이름만 보관하므로 가격 변경은 가격표/카탈로그 버전만 갱신
+            await self._catalog_changed()
+        return result
+
+    async def _catalog_changed(self, names_changed: bool = False) -> Optional[str]:
+        """ 카탈로그 버전을 올리고 (다른 worker 는 pub/sub 으로 알림) 이 worker 의 가격표를 만료
+
+        제품 이름이 바뀐 경우 알림 전에 이름 버전을 먼저 올려 다른 worker 가 검색 색인을 다시 만들도록 하고, 이름 버전을 반환
+        """
+        price_table.invalidate()
+        names_version = await bump_product_names_version() if names_changed else None
+        await bump_catalog_version()
+        return names_version
+
+    async def _rebuild_search_index(self, names_version: Optional[str]) -> None:
+        """ 대량 변경 후 제품 검색 색인 재생성 """
+        names = await self.product_repository.get_product_names()
+        await product_search_index.rebuild(names, names_version)
 
     async def search_products_by_prefix(self, name_prefix: str, limit: int):
+        # 색인이 준비된 경우 이름 검색은 메모리에서 처리하고 (초성/오타 허용), 찾은 제품만 기본 키로 조회
+        if product_search_index.ready:
+            product_ids = product_search_index.search(name_prefix, limit)
+            products = {x.id: x for x in await self.product_repository.get_products_by_ids(product_ids)}
+            return [to_product_read(products[x]) for x in product_ids if x in products]
+
         products = await self.product_repository.get_products_by_prefix(name_prefix, limit)
         products = sorted(products, key=lambda x: x.name.lower())
 
         return [ProductRead.from_orm(p) for p in products]
 
     async def search_products_recent(self, limit: int, current_user: User):
-        product_counts = await redis_client.hgetall(f"user:{current_user.client_id}:products")
-        sorted_products = sorted(product_counts.items(), key=lambda x: int(x[1]), reverse=True)[:limit]
-        products_list = [to_product_count(await self.product_repository.get_product_by_id(x[0]), x[1]) for x in
-                         sorted_products]
+        product_counts = await recent_purchase_counter.top(current_user.client_id, limit)
+        products = {x.id: x for x in await self.product_repository.get_products_by_ids([x[0] for x in product_counts])}
+        products_list = [to_product_count(products[product_id], count) for product_id, count in product_counts
+                         if product_id in products]
         return products_list
@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, BinaryIO, Callable, Optional
+
+from fastapi import UploadFile
+from openpyxl import Workbook
+from sqlalchemy import Row
+
+from core.response.code.error_status import ErrorStatus
+from core.response.handler.exception_handler import ServiceException
+from service.product_parser import PRODUCT_LIST_HEADER, InvalidPriceError
+
+# 업로드 파일을 디스크에 나눠 쓰는 단위
+UPLOAD_SPOOL_CHUNK_SIZE = 1024 * 1024
+# excel 파싱에 사용하는 프로세스 수 (API worker 의 event loop 를 막지 않도록 별도 프로세스에서 파싱)
+UPLOAD_PARSE_WORKERS = int(os.getenv("UPLOAD_PARSE_WORKERS", "2"))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_INVALID_SHEET_TITLE = re.compile(r"[\\*?:/\[\]]")
+
+
+def to_sheet_title(category: str) -> str:
+    """ excel sheet 이름으로 사용할 수 없는 문자 제거, 31자 제한 (원래 분류는 분류 열에 기록) """
+    return _INVALID_SHEET_TITLE.sub("_", category)[:31] or "_"
+
+
+async def write_product_list_workbook(rows: AsyncIterator[Row], file: BinaryIO) -> int:
+    """
+        read_excel_file_about_product_list 형식으로 제품 목록 작성 (작성한 제품 수 반환)
+        rows 는 (분류, 이름, 단위, 가격) 을 분류 순서로 전달해야 하며,
+        write-only 모드로 행을 바로 임시 파일에 기록하므로 제품 수와 관계없이 메모리 사용량이 일정하다.
+    """
+    workbook = Workbook(write_only=True)
+    sheet, category, count = None, None, 0
+    async for row in rows:
+        if sheet is None or row.category != category:
+            category = row.category
+            sheet = workbook.create_sheet(to_sheet_title(category))
+            sheet.append(PRODUCT_LIST_HEADER)
+        sheet.append([row.name, row.unit, row.price, row.category])
+        count += 1
+
+    if sheet is None:
+        workbook.create_sheet().append(PRODUCT_LIST_HEADER)
+    await asyncio.to_thread(workbook.save, file)
+    return count
+
+
+async def spool_upload(file: UploadFile) -> str:
+    """ 업로드 파일을 chunk 단위로 임시 파일에 저장 (쓰기는 thread 에서 실행, 사용 후 remove_spooled_upload 로 삭제) """
+    suffix = os.path.splitext(os.path.basename(file.filename or ""))[1]
+    fd, file_path = tempfile.mkstemp(prefix="upload_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_SPOOL_CHUNK_SIZE):
+                await asyncio.to_thread(buffer.write, chunk)
+    except BaseException:
+        remove_spooled_upload(file_path)
+        raise
+    return file_path
+
+
+def remove_spooled_upload(file_path: Optional[str]) -> None:
+    """ spool_upload 로 저장한 임시 파일 삭제 """
+    if file_path is None:
+        return
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=UPLOAD_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+        _parse_pool = None
+
+
+async def parse_in_process_pool(parser: Callable[[str], Any], file_path: str) -> Any:
+    """ excel 파싱을 프로세스 풀에서 실행 (동시 파싱 수는 UPLOAD_PARSE_WORKERS 로 제한) """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_parse_pool(), parser, file_path)
+    except InvalidPriceError:
+        raise ServiceException(ErrorStatus.INVALID_VALUE)
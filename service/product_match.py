@@ -0,0 +1,95 @@
+import os
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from schemas.product import AmbiguousProductName, ProductNameCandidate, ProductNameMatch, ProductNameMatchMethod
+
+# 이 점수 이상이고 2순위와 충분히 차이나면 자동으로 매칭
+PRODUCT_MATCH_AUTO_ACCEPT_SCORE = int(os.getenv("PRODUCT_MATCH_AUTO_ACCEPT_SCORE", "90"))
+# 자동 매칭을 위한 1순위와 2순위의 최소 점수 차이
+PRODUCT_MATCH_MIN_MARGIN = 5
+# 이 점수 이상인 후보가 있으면 검토 대상으로 반환, 없으면 매칭 실패
+PRODUCT_MATCH_REVIEW_SCORE = 60
+# 검토 대상에 포함하는 후보 수
+PRODUCT_MATCH_CANDIDATES = 3
+# 점수 행렬을 한 번에 계산하는 이름 수 (512 x 5만 제품 = uint8 약 25MB)
+PRODUCT_MATCH_CHUNK_SIZE = 512
+
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_product_name(name: str) -> str:
+    """ 공백, 대소문자 차이 제거 """
+    return _SPACES.sub("", name).lower()
+
+
+def base_product_name(name: str) -> str:
+    """ 괄호 안의 단위/규격까지 제거한 이름 (예: '양파 (1kg)' -> '양파') """
+    return normalize_product_name(_PARENTHESES.sub("", name)) or normalize_product_name(name)
+
+
+def match_product_names(names: Iterable[str], catalog: Sequence[Tuple[int, str]],
+                        aliases: Dict[str, int]) -> Tuple[List[ProductNameMatch], List[AmbiguousProductName], List[str]]:
+    """ 파일의 물품 이름을 제품과 매칭해 (매칭, 검토 필요, 매칭 실패) 반환
+
+    정확히 같은 이름 -> 저장된 별칭 -> 공백/대소문자만 다른 이름 순으로 찾고,
+    남은 이름은 괄호를 제거한 이름으로 rapidfuzz.process.cdist 를 사용해 전체 제품과 한 번에 비교한다.
+    """
+    product_names = {product_id: name for product_id, name in catalog}
+    by_name = {name: product_id for product_id, name in catalog}
+    by_normalized: Dict[str, List[int]] = {}
+    for product_id, name in catalog:
+        by_normalized.setdefault(normalize_product_name(name), []).append(product_id)
+
+    def to_match(name: str, product_id: int, score: int, method: ProductNameMatchMethod) -> ProductNameMatch:
+        return ProductNameMatch(name=name, product_id=product_id, product_name=product_names[product_id],
+                                score=score, method=method)
+
+    matches, remaining = [], []
+    for name in dict.fromkeys(names):
+        if name in by_name:
+            matches.append(to_match(name, by_name[name], 100, ProductNameMatchMethod.EXACT))
+        elif aliases.get(name) in product_names:
+            matches.append(to_match(name, aliases[name], 100, ProductNameMatchMethod.ALIAS))
+        elif len(by_normalized.get(normalize_product_name(name), [])) == 1:
+            matches.append(to_match(name, by_normalized[normalize_product_name(name)][0], 100,
+                                    ProductNameMatchMethod.NORMALIZED))
+        else:
+            remaining.append(name)
+
+    ambiguous, unmatched = [], []
+    if not remaining or not catalog:
+        return matches, ambiguous, unmatched + remaining
+
+    product_ids = [product_id for product_id, _ in catalog]
+    choices = [base_product_name(name) for _, name in catalog]
+    top = min(PRODUCT_MATCH_CANDIDATES, len(choices))
+    for i in range(0, len(remaining), PRODUCT_MATCH_CHUNK_SIZE):
+        chunk = remaining[i:i + PRODUCT_MATCH_CHUNK_SIZE]
+        scores = process.cdist([base_product_name(x) for x in chunk], choices, scorer=fuzz.ratio,
+                               dtype=np.uint8, workers=-1, score_cutoff=PRODUCT_MATCH_REVIEW_SCORE)
+        # 행마다 상위 후보만 부분 정렬로 추린 뒤 점수 내림차순 정렬
+        indexes = np.argpartition(scores, -top, axis=1)[:, -top:]
+        top_scores = np.take_along_axis(scores, indexes, axis=1)
+        order = np.argsort(top_scores, axis=1)[:, ::-1]
+        indexes = np.take_along_axis(indexes, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for name, row_indexes, row_scores in zip(chunk, indexes.tolist(), top_scores.tolist()):
+            best = row_scores[0]
+            runner_up = row_scores[1] if top > 1 else 0
+            if best >= PRODUCT_MATCH_AUTO_ACCEPT_SCORE and best - runner_up >= PRODUCT_MATCH_MIN_MARGIN:
+                matches.append(to_match(name, product_ids[row_indexes[0]], best, ProductNameMatchMethod.FUZZY))
+            elif best >= PRODUCT_MATCH_REVIEW_SCORE:
+                ambiguous.append(AmbiguousProductName(name=name, candidates=[
+                    ProductNameCandidate(product_id=product_ids[index], name=catalog[index][1], score=score)
+                    for index, score in zip(row_indexes, row_scores) if score >= PRODUCT_MATCH_REVIEW_SCORE
+                ]))
+            else:
+                unmatched.append(name)
+
+    return matches, ambiguous, unmatched
@@ -0,0 +1,61 @@
+from typing import Dict
+
+import pandas as pd
+
+# 프로세스 풀의 자식 프로세스가 import 하는 모듈이므로 pandas 외의 의존성(fastapi, DB 등)을 두지 않는다.
+
+# 제품 목록 excel 파일의 머리글 (read_excel_file_about_product_list 와 같은 열 순서)
+PRODUCT_LIST_HEADER = ["이름", "단위", "가격", "분류"]
+# 분류 열 머리글, 이 열이 없거나 비어 있으면 sheet 이름을 분류로 사용
+PRODUCT_CATEGORY_HEADER = PRODUCT_LIST_HEADER[3]
+
+
+class InvalidPriceError(ValueError):
+    """ 숫자로 변환할 수 없는 가격 (호출한 프로세스에서 ErrorStatus.INVALID_VALUE 로 변환) """
+
+
+def clean_price_column(price: pd.Series) -> pd.Series:
+    """ "1,200" 형식의 문자열 가격을 열 단위로 숫자 변환 """
+    price = pd.to_numeric(price.astype(str).str.replace(",", "", regex=False).str.strip(), errors="coerce")
+    if price.isna().any():
+        raise InvalidPriceError("invalid price")
+    return price.round().astype("int64")
+
+
+def read_excel_file_about_product_list(file_path: str) -> list[Dict]:
+    """
+        excel 파일 형식
+        sheet name - 제품 카테고리
+        0열 - 제품 이름 / 1열 - 제품 개수 / 2열 - 제품 가격 / 3열(선택, 머리글 "분류") - 제품 카테고리
+        sheet 이름은 31자 제한과 사용할 수 없는 문자("/" 등)가 있으므로, 분류 열이 있으면 sheet 이름 대신 사용
+    """
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    frames = []
+    for sheet_name, df in sheets.items():
+        category = df.iloc[:, 3] if len(df.columns) > 3 and df.columns[3] == PRODUCT_CATEGORY_HEADER else None
+        df = df.iloc[:, :3].set_axis(["name", "unit", "price"], axis=1)
+        df["category"] = sheet_name if category is None else \
+            category.where(category.notna(), sheet_name).astype(str).str.strip()
+        frames.append(df)
+    if not frames:
+        return []
+
+    df = pd.concat(frames, ignore_index=True).dropna(subset=["name"])
+    df["name"] = df["name"].astype(str).str.strip()
+    df["unit"] = df["unit"].fillna("").astype(str).str.strip()
+    df["price"] = clean_price_column(df["price"])
+
+    # 같은 이름의 제품이 여러 번 나오면 마지막 행 기준
+    df = df.drop_duplicates(subset=["name"], keep="last")
+    return df[["name", "unit", "price", "category"]].to_dict("records")
+
+
+def read_excel_file_about_vegetable_price_list(file_path: str) -> dict:
+    """
+       excel 파일 형식
+       0열 - 제품(vegetable) 이름 / 1열 - 제품(vegetable) 가격
+    """
+    df = pd.read_excel(file_path, header=None, usecols=[0, 1]).set_axis(["name", "price"], axis=1)
+    df = df.dropna(subset=["name"])
+    names = df["name"].astype(str).str.strip()
+    return dict(zip(names, clean_price_column(df["price"]).tolist()))
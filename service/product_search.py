@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+from redis.exceptions import RedisError
+
+from core.db.database import local_session
+from core.db.redis import redis_client
+from repository.product.product import ProductRepository
+
+logger = logging.getLogger(__name__)
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+HANGUL_START, HANGUL_END = ord("가"), ord("힣")
+# 색인하는 n-gram 최대 길이 (검색어 길이가 더 길면 trigram 교집합 후 부분 문자열 확인)
+NGRAM_MAX = 3
+# 오타 허용 검색의 최소 유사도 점수
+FUZZY_SCORE_CUTOFF = 70
+# 다른 worker의 제품 이름 변경(이름 버전) 확인 주기(초)
+PRODUCT_SEARCH_REFRESH_INTERVAL = 30
+# 제품 이름이 바뀔 때(추가, 삭제, 이름 수정)만 올리는 버전, 가격만 바뀐 경우에는 색인을 다시 만들지 않음
+PRODUCT_NAMES_VERSION_KEY = "catalog:names:version"
+
+
+def to_choseong(text: str) -> str:
+    """ 한글 음절을 초성으로 변환 (예: '양파' -> 'ㅇㅍ'), 한글 이외 문자는 그대로 유지 """
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_START <= code <= HANGUL_END:
+            result.append(CHOSEONG[(code - HANGUL_START) // 588])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def is_choseong_query(query: str) -> bool:
+    return all(ch in CHOSEONG for ch in query)
+
+
+def ngrams(text: str) -> Set[str]:
+    return {text[i:i + n] for n in range(1, NGRAM_MAX + 1) for i in range(len(text) - n + 1)}
+
+
+class ProductSearchIndex:
+    """ 제품 이름 검색(자동완성)을 위한 프로세스 내부 색인 (제품 ID와 이름만 보관하고 검색 결과로 제품 ID 반환)
+
+    - 부분 문자열 검색: 1~3-gram posting 교집합 후 부분 문자열 확인
+    - 초성 검색: 초성으로만 이루어진 검색어는 초성 문자열에서 검색 (예: 'ㅇㅍ' -> '양파')
+    - 오타 허용: 부분 문자열 결과가 부족하면 rapidfuzz 유사도 순으로 보충
+    """
+    def __init__(self):
+        self.names: Dict[int, str] = {}
+        self.choseongs: Dict[int, str] = {}
+        self.name_postings: Dict[str, Set[int]] = defaultdict(set)
+        self.choseong_postings: Dict[str, Set[int]] = defaultdict(set)
+        self.names_version: Optional[str] = None
+        self.ready = False
+
+    def build(self, names: Iterable[Tuple[int, str]], names_version: Optional[str] = None) -> None:
+        self._replace(self._built(names), names_version)
+
+    async def rebuild(self, names: Iterable[Tuple[int, str]], names_version: Optional[str] = None) -> None:
+        """ 색인 생성은 CPU 작업이므로 thread 에서 새 색인을 만든 뒤 event loop 에서 교체 """
+        self._replace(await asyncio.to_thread(self._built, names), names_version)
+
+    @staticmethod
+    def _built(names: Iterable[Tuple[int, str]]) -> "ProductSearchIndex":
+        index = ProductSearchIndex()
+        for product_id, name in names:
+            index.upsert(product_id, name)
+        return index
+
+    def _replace(self, index: "ProductSearchIndex", names_version: Optional[str]) -> None:
+        self.names, self.choseongs = index.names, index.choseongs
+        self.name_postings, self.choseong_postings = index.name_postings, index.choseong_postings
+        self.names_version = names_version
+        self.ready = True
+
+    def upsert(self, product_id: int, name: str) -> None:
+        self.remove(product_id)
+
+        name = name.lower()
+        choseong = to_choseong(name.replace(" ", ""))
+        self.names[product_id] = name
+        self.choseongs[product_id] = choseong
+        for gram in ngrams(name):
+            self.name_postings[gram].add(product_id)
+        for gram in ngrams(choseong):
+            self.choseong_postings[gram].add(product_id)
+
+    def remove(self, product_id: int) -> None:
+        if product_id not in self.names:
+            return
+        for gram in ngrams(self.names[product_id]):
+            self.name_postings[gram].discard(product_id)
+        for gram in ngrams(self.choseongs[product_id]):
+            self.choseong_postings[gram].discard(product_id)
+        del self.names[product_id], self.choseongs[product_id]
+
+    def advance_names_version(self, names_version: Optional[str]) -> None:
+        """ 이 worker의 변경으로 버전이 1 증가한 경우에만 색인 버전을 갱신 (그 외에는 주기적 갱신에서 재생성) """
+        if names_version is None or self.names_version is None:
+            return
+        if int(names_version) == int(self.names_version) + 1:
+            self.names_version = names_version
+
+    def search(self, query: str, limit: int) -> List[int]:
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        if is_choseong_query(query.replace(" ", "")):
+            query = query.replace(" ", "")
+            texts, postings = self.choseongs, self.choseong_postings
+        else:
+            texts, postings = self.names, self.name_postings
+
+        candidates = self._candidates(query, postings)
+        matches = [x for x in candidates if query in texts[x]]
+        matches.sort(key=lambda x: (not texts[x].startswith(query), len(texts[x]), texts[x]))
+        result = matches[:limit]
+
+        if len(result) < limit and texts is self.names:
+            result += self._fuzzy_search(query, limit - len(result), set(result))
+
+        return result
+
+    def _fuzzy_search(self, query: str, limit: int, excluded: Set[int]) -> List[int]:
+        """ 검색어와 글자를 하나 이상 공유하는 제품만 대상으로 유사도 순 검색 """
+        pool = set().union(*(self.name_postings.get(ch, ()) for ch in set(query) if not ch.isspace()))
+        pool = [x for x in pool if x not in excluded]
+        if not pool:
+            return []
+        matches = process.extract(
+            query, [self.names[x] for x in pool], scorer=fuzz.WRatio, limit=limit, score_cutoff=FUZZY_SCORE_CUTOFF
+        )
+        return [pool[i] for _, _, i in matches]
+
+    @staticmethod
+    def _candidates(query: str, postings: Dict[str, Set[int]]) -> Set[int]:
+        size = min(len(query), NGRAM_MAX)
+        grams = sorted({query[i:i + size] for i in range(len(query) - size + 1)},
+                       key=lambda x: len(postings.get(x, ())))
+        candidates = set(postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= postings.get(gram, set())
+        return candidates
+
+
+product_search_index = ProductSearchIndex()
+
+
+async def bump_product_names_version() -> Optional[str]:
+    """ 제품 이름이 바뀐 경우 이름 버전을 올려 다른 worker 의 검색 색인을 만료 """
+    try:
+        return str(await redis_client.incr(PRODUCT_NAMES_VERSION_KEY))
+    except RedisError as e:
+        logger.error(f"product names version 갱신 실패: {str(e)}")
+        return None
+
+
+async def refresh_product_search_index(force: bool = False) -> None:
+    """ 이름 버전이 바뀐 경우(다른 worker의 제품 추가/삭제/이름 변경 포함) 제품 검색 색인을 다시 생성 """
+    try:
+        names_version = await redis_client.get(PRODUCT_NAMES_VERSION_KEY) or "0"
+    except RedisError as e:
+        logger.error(f"product names version 조회 실패: {str(e)}")
+        names_version = None
+
+    if not force and product_search_index.ready and names_version == product_search_index.names_version:
+        return
+
+    async with local_session() as session:
+        names = await ProductRepository(session).get_product_names()
+    await product_search_index.rebuild(names, names_version)
+
+
+async def run_product_search_index_refresh(interval: int = PRODUCT_SEARCH_REFRESH_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_product_search_index()
+        except Exception as e:
+            logger.error(f"제품 검색 색인 갱신 실패: {type(e).__name__} - {str(e)}")
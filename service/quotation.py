@@ -3,8 +3,7 @@ import zipfile
 import io
 
 from datetime import datetime, date
-from math import ceil
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, AsyncIterator, Tuple
 from fastapi import Depends
 from sqlalchemy import func
 from openpyxl import Workbook
@@ -14,12 +13,72 @@ from core.response.handler.exception_handler import ServiceException
 from models import Quotation, User, QuotationProduct
 from repository.client.client import ClientRepository
 from repository.product.product import ProductRepository
-from repository.quotation.quotation import QuotationRepository
+from repository.quotation.quotation import QuotationRepository, name_search_phrase
 from repository.quotation.quotation_product import QuotationProductRepository
-from schemas.client import ClientPaginatedResponse
-from schemas.quotation import QuotationAdd, QuotationRead, to_quotation_read, QuotationUpdate, QuotationInfo
+from core.utils import decode_cursor, decode_id_cursor, encode_id_cursor
+from schemas.client import to_client_paginated_response
+from schemas.quotation import QuotationAdd, QuotationRead, to_quotation_read, QuotationUpdate, QuotationInfo, \
+    QuotationTotalDrift, QuotationSearchResponse, QuotationCacheMetrics, QuotationUpdateResult
 from core.db.redis import redis_client
 from service.kakao import KakaoService
+from service.price_table import price_table
+from service.recent_purchase import recent_purchase_counter
+from service.quotation_cache import quotation_info_cache
+
+# 스트리밍 압축 시 한 번에 조회할 견적서 수와 zip entry 전송 단위
+EXPORT_BATCH_SIZE = 50
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# 거래처 견적서 전체 개수 캐시 유지 시간(초)
+QUOTATION_COUNT_CACHE_TTL = 60
+
+
+def quotation_count_key(client_id: int) -> str:
+    return f"client:{client_id}:quotations:count"
+
+
+async def invalidate_quotation_counts(*client_ids: int) -> None:
+    """ 견적서가 추가/삭제된 거래처의 견적서 개수 캐시(전체/날짜 범위) 삭제 """
+    if client_ids:
+        await redis_client.delete(*[quotation_count_key(x) for x in set(client_ids)])
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """ zipfile 출력을 받아두었다가 전송 가능한 bytes 단위로 비워주는 non-seekable 버퍼 """
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def write_quotation_workbook(products: List[Dict[str, Any]], output) -> None:
+    """ 견적서 물품 목록을 write-only 모드의 excel 파일로 작성 """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+
+    header = ["물품", "수량", "단가"]
+    worksheet.append(header)
+
+    for result_dict in products:
+        row = [
+            str(result_dict["product"]),
+            str(result_dict["quantity"]),
+            str(result_dict["price"]),
+        ]
+        worksheet.append(row)
+
+    workbook.save(output)
 
 
 class QuotationService:
@@ -60,108 +119,105 @@ class QuotationService:
 
         quotation = Quotation(**quotation_data)
         quotation_read = await self.quotation_repository.create_quotation(quotation)
+        await invalidate_quotation_counts(client_id)
         result = to_quotation_read(quotation_read)
         return result
 
     async def add_products_to_quotation(self, quotation_data: List[QuotationAdd], current_user: User):
-        tmp_list = []
-        for qt in quotation_data:
-            quotation_id = qt.quotation_id
-            product_id = qt.product_id
-            quantity = qt.quantity
-
-            product = await self.product_repository.get_product_by_id(product_id)
-            if product is None:
-                raise ServiceException(ErrorStatus.PRODUCT_NOT_FOUND)
-
-            quotation = await self.quotation_repository.get_quotation_by_id(quotation_id)
-            if quotation is None:
-                raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
-
-            # 견적서에 물품 중복 추가 금지
-            quotation_product = await self.quotation_product_repository.get_quotation_product_by_quotation_id_and_product_id(
-                quotation_id=quotation_id,
-                product_id=product_id
-            )
-            if quotation_product is not None:
-                raise ServiceException(ErrorStatus.QUOTATION_PRODUCT_ALREADY_EXISTS)
-
-            quotation_product = QuotationProduct(
-                quotation_id=quotation_id,
-                product_id=product_id,
-                price=product.price * quantity,
-                quantity=quantity,
-            )
-            # 견적서에 물품 추가 시 Redis 서버에 수량 증가
-            await redis_client.hincrby(f"user:{current_user.client_id}:products", product_id, 1)
-            tmp_list.append(quotation_product)
-        return await self.quotation_product_repository.bulk_create_quotation_product(tmp_list)
+        if not quotation_data:
+            return []
+
+        product_ids = {qt.product_id for qt in quotation_data}
+        prices = await price_table.get_prices(product_ids)
+        if len(prices) != len(product_ids):
+            raise ServiceException(ErrorStatus.PRODUCT_NOT_FOUND)
+
+        quotation_ids = {qt.quotation_id for qt in quotation_data}
+        if await self.quotation_repository.get_existing_quotation_ids(quotation_ids) != quotation_ids:
+            raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
+
+        # 견적서에 물품 중복 추가 금지
+        keys = [(qt.quotation_id, qt.product_id) for qt in quotation_data]
+        if len(set(keys)) != len(keys) or \
+                await self.quotation_product_repository.get_existing_quotation_product_keys(keys):
+            raise ServiceException(ErrorStatus.QUOTATION_PRODUCT_ALREADY_EXISTS)
+
+        quotation_products = [
+            QuotationProduct(
+                quotation_id=qt.quotation_id,
+                product_id=qt.product_id,
+                price=prices[qt.product_id] * qt.quantity,
+                quantity=qt.quantity,
+            ) for qt in quotation_data
+        ]
+        await self.quotation_product_repository.bulk_create_quotation_product(quotation_products)
+        await quotation_info_cache.invalidate(*quotation_ids)
+
+        # 견적서에 물품 추가 시 Redis 서버에 수량 증가
+        await recent_purchase_counter.record(current_user.client_id, [qt.product_id for qt in quotation_data])
+
+        return quotation_products
 
     async def update_quotation_product(self, quotation_id: int, product_id: int, new_data: Dict[str, Any]) -> Optional[
         QuotationProduct]:
-        product = await self.product_repository.get_product_by_id(product_id)
-        if not product:
+        price = await price_table.get_price(product_id)
+        if price is None:
             raise ServiceException(ErrorStatus.PRODUCT_NOT_FOUND)
 
         update_data = new_data
 
         update_data["updated_at"] = func.now()
-        update_data["price"] = product.price * update_data["quantity"]
+        update_data["price"] = price * update_data["quantity"]
         if await self.quotation_product_repository.update_quotation_product(quotation_id, product_id, update_data):
+            await quotation_info_cache.invalidate(quotation_id)
             updated_quotation_product = await self.quotation_product_repository.get_quotation_product_by_quotation_id_and_product_id(
                 quotation_id, product_id)
             return updated_quotation_product
 
     async def get_quotation_products(self, quotation_id: int):
-        quotation_products = await self.quotation_product_repository.get_quotation_products_by_quotation_id(
-            quotation_id)
-        result_list = []
-
-        for quotation_product in quotation_products:
-            tmp_dict = quotation_product.to_dict()
-
-            product_id = tmp_dict.get("product_id")
-            product = await self.product_repository.get_product_by_id(product_id)
-
-            if not product:
-                raise ServiceException(ErrorStatus.PRODUCT_NOT_FOUND)
+        _, products = await self.quotation_repository.get_quotation_with_products(quotation_id)
+        return products
 
-            result_dict = {
-                "id": product.id,
-                "category": product.category,
-                "product": product.name,
-                "unit": product.unit,
-                "quantity": tmp_dict.get("quantity"),
-                "price": tmp_dict.get("price"),
-                "created_at": tmp_dict.get("created_at"),
-                "updated_at": tmp_dict.get("updated_at")
-            }
+    async def get_quotation_info(self, quotation_id: int) -> QuotationInfo:
+        """ 견적서 조회 문서를 캐시에서 반환하고, 없으면 DB에서 만들어 캐시에 저장 """
+        cached_info, cache_version = await quotation_info_cache.get(quotation_id)
+        if cached_info:
+            return cached_info
 
-            result_list.append(result_dict)
-
-        return result_list
-
-    async def get_quotation_info(self, quotation_id: int):
-        products = await self.get_quotation_products(quotation_id)
-        quotation = await self.quotation_repository.get_quotation_by_id(quotation_id)
+        quotation, products = await self.quotation_repository.get_quotation_with_products(quotation_id)
 
         if not quotation:
             raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
 
-        quotation_info = {
-            "products": products,
-            "name": quotation.name,
-            "total": quotation.total_price,
-            "status": quotation.status,
-            "input_date": quotation.input_date,
-            "created_at": quotation.created_at,
-            "updated_at": quotation.updated_at
-        }
+        quotation_info = QuotationInfo(
+            products=products,
+            name=quotation.name,
+            total=quotation.total_price,
+            status=quotation.status,
+            input_date=quotation.input_date,
+            created_at=quotation.created_at,
+            updated_at=quotation.updated_at
+        )
+        await quotation_info_cache.set(quotation_id, quotation_info, cache_version)
 
         return quotation_info
 
-    async def update_total_price(self, quotation_id: int):
-        return await self.quotation_repository.update_total_price(quotation_id)
+    @staticmethod
+    def get_quotation_info_cache_metrics() -> QuotationCacheMetrics:
+        return quotation_info_cache.metrics()
+
+    async def get_total_price(self, quotation_id: int):
+        total_price = await self.quotation_repository.get_total_price(quotation_id)
+        if total_price is None:
+            raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
+        return total_price
+
+    async def reconcile_total_prices(self, dry_run: bool = False) -> List[QuotationTotalDrift]:
+        """ 견적서 합계 금액과 견적서 물품 합계 사이의 불일치를 찾아 수정 """
+        drifts = await self.quotation_repository.reconcile_total_prices(dry_run)
+        if not dry_run:
+            await quotation_info_cache.invalidate(*[x["quotation_id"] for x in drifts])
+        return [QuotationTotalDrift(**x) for x in drifts]
 
     async def get_quotation_search(self, start: str, end: str, query: str):
         start_date = datetime.strptime(start, "%Y-%m-%d")
@@ -170,26 +226,32 @@ class QuotationService:
         result = [to_quotation_read(x) for x in quotations]
         return result
 
+    async def search_quotations_by_name(self, query: str, start: Optional[str] = None, end: Optional[str] = None,
+                                        cursor: Optional[str] = None, limit: int = 20) -> QuotationSearchResponse:
+        """ 견적서 이름 전문 검색 결과를 최신순으로 limit 개씩 반환 """
+        if not name_search_phrase(query):
+            raise ServiceException(ErrorStatus.INVALID_INPUT)
+        start_date = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+        end_date = datetime.strptime(end, "%Y-%m-%d").date() if end else None
+        results = await self.quotation_repository.search_quotation_by_name(
+            query, start_date, end_date, decode_id_cursor(cursor) if cursor else None, limit + 1)
+
+        has_next = len(results) > limit
+        results = results[:limit]
+
+        return QuotationSearchResponse(
+            items=[to_quotation_read(x) for x in results],
+            next_cursor=encode_id_cursor(results[-1].id) if has_next else None,
+            has_next=has_next
+        )
+
     async def extract_quotations(self, quotation_id: int, for_zip: bool = False):
-        products = await self.get_quotation_products(quotation_id)
-        quotation = await self.quotation_repository.get_quotation_by_id(quotation_id)
+        quotation, products = await self.quotation_repository.get_quotation_with_products(quotation_id)
+        if not quotation:
+            raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
 
         output = io.BytesIO()
-        workbook = Workbook()
-        worksheet = workbook.active
-
-        header = ["물품", "수량", "단가"]
-        worksheet.append(header)
-
-        for result_dict in products:
-            row = [
-                str(result_dict["product"]),
-                str(result_dict["quantity"]),
-                str(result_dict["price"]),
-            ]
-            worksheet.append(row)
-
-        workbook.save(output)
+        write_quotation_workbook(products, output)
         output.seek(0)
         filename = f'{quotation.name} 견적서'
         if not for_zip:
@@ -200,66 +262,106 @@ class QuotationService:
 
         return output, filename
 
-    async def get_paginated_quotations_for_client(self, client_id: int, page: int = 1, page_size: int = 10):
+    async def get_paginated_quotations_for_client(self, client_id: int, cursor: Optional[str] = None,
+                                                  page_size: int = 10, include_total: bool = False):
         """ 거래처 별 견적서 반환 """
-        quotations, total = await self.quotation_repository.get_quotations_by_client_id(client_id, page, page_size)
-        quotation_reads = [to_quotation_read(x) for x in quotations]
+        quotations = await self.quotation_repository.get_quotations_by_client_id(
+            client_id, decode_cursor(cursor) if cursor else None, page_size + 1)
 
-        total_pages = ceil(total / page_size)
+        total = None
+        if include_total:
+            total = await self._get_cached_quotation_count(client_id)
 
-        return ClientPaginatedResponse(
-            items=quotation_reads,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        return to_client_paginated_response(quotations, page_size, total)
 
     async def get_paginated_quotations_by_date_range(
             self,
             client_id,
             start_date: date,
             end_date: date,
-            page: int,
-            page_size: int):
+            cursor: Optional[str] = None,
+            page_size: int = 10,
+            include_total: bool = False):
         """ 지정 날짜 범위에 해당하는 견적서 반환 """
-        quotations, total = await self.quotation_repository.get_quotations_by_data_range(client_id, start_date, end_date, page, page_size)
-        quotation_reads = [to_quotation_read(x) for x in quotations]
+        quotations = await self.quotation_repository.get_quotations_by_data_range(
+            client_id, start_date, end_date, decode_cursor(cursor) if cursor else None, page_size + 1)
 
-        total_pages = ceil(total / page_size)
+        total = None
+        if include_total:
+            total = await self._get_cached_quotation_count(client_id, start_date, end_date)
 
-        return ClientPaginatedResponse(
-            items=quotation_reads,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        return to_client_paginated_response(quotations, page_size, total)
+
+    async def _get_cached_quotation_count(self, client_id: int, start_date: Optional[date] = None,
+                                          end_date: Optional[date] = None) -> int:
+        """ 거래처 견적서 개수를 Redis에 짧게 캐싱하여 페이지 요청마다 COUNT 쿼리 방지
+
+        전체/날짜 범위별 개수를 거래처 하나의 hash 에 저장하므로, 견적서 생성/삭제 시 hash 삭제로 모두 무효화된다.
+        """
+        cache_key = quotation_count_key(client_id)
+        field = f"{start_date.isoformat()}:{end_date.isoformat()}" if start_date and end_date else "all"
+
+        cached_total = await redis_client.hget(cache_key, field)
+        if cached_total is not None:
+            return int(cached_total)
+
+        total = await self.quotation_repository.count_quotations_by_client_id(client_id, start_date, end_date)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(cache_key, field, total)
+            pipe.expire(cache_key, QUOTATION_COUNT_CACHE_TTL)
+            await pipe.execute()
+        return total
 
     async def extract_today_quotations_to_zip(self, input_date: date):
+        chunks, filename = await self.stream_today_quotations_to_zip(input_date)
+        zip_buffer = io.BytesIO(b"".join([chunk async for chunk in chunks]))
+
+        return zip_buffer, filename
+
+    async def stream_today_quotations_to_zip(self, input_date: date) -> Tuple[AsyncIterator[bytes], str]:
+        """ 해당 날짜의 견적서를 excel 파일로 작성하며 zip entry 단위로 즉시 전송 """
         today = input_date
         quotation_ids = await self.quotation_repository.get_today_quotation_ids(today)
 
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for quotation_id in quotation_ids:
-                excel_buffer, filename = await self.extract_quotations(quotation_id, True)
-                zip_file.writestr(filename, excel_buffer.getvalue())
-
-        zip_buffer.seek(0)
         today_str = today.strftime("%Y-%m-%d")
         filename = f'minifood_{today_str}.zip'
 
-        return zip_buffer, filename
+        return self.generate_quotations_zip(quotation_ids), filename
+
+    async def generate_quotations_zip(self, quotation_ids: List[int]) -> AsyncIterator[bytes]:
+        zip_buffer = ZipStreamBuffer()
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for start in range(0, len(quotation_ids), EXPORT_BATCH_SIZE):
+                batch_ids = quotation_ids[start:start + EXPORT_BATCH_SIZE]
+                quotations = await self.quotation_repository.get_quotations_with_products(batch_ids)
+
+                for quotation, products in quotations.values():
+                    excel_buffer = io.BytesIO()
+                    write_quotation_workbook(products, excel_buffer)
+                    excel_buffer.seek(0)
+
+                    with zip_file.open(f'{quotation.name} 견적서.xlsx', 'w') as entry:
+                        while chunk := excel_buffer.read(EXPORT_CHUNK_SIZE):
+                            entry.write(chunk)
+                            data = zip_buffer.drain()
+                            if data:
+                                yield data
+
+        yield zip_buffer.drain()
 
     async def delete_quotation_product(self, quotation_id: int, product_id: int):
         await self.quotation_repository.delete_quotation_product(quotation_id, product_id)
+        await quotation_info_cache.invalidate(quotation_id)
 
     async def delete_quotation(self, quotation_id: int):
-        await self.quotation_repository.delete_quotation(quotation_id)
+        client_id = await self.quotation_repository.delete_quotation(quotation_id)
+        await quotation_info_cache.invalidate(quotation_id)
+        if client_id is not None:
+            await invalidate_quotation_counts(client_id)
 
     async def update_particulars(self, quotation_id: int, particulars: str):
         await self.quotation_repository.update_particulars(quotation_id, particulars)
+        await quotation_info_cache.invalidate(quotation_id)
 
     async def update_status_completed(self, quotation_id: int):
         # await self.kakao_service.send_quotation_completed_message(
@@ -267,13 +369,28 @@ class QuotationService:
         #     web_url=f"http://127.0.0.1:8000/api/v1/quotations/extract/{quotation_id}"
         # )
         await self.quotation_repository.update_status_completed(quotation_id)
+        await quotation_info_cache.invalidate(quotation_id)
 
-    async def update_quotation(self, quotation_id: int, quotation_data: QuotationUpdate):
+    async def update_quotation(self, quotation_id: int, quotation_data: QuotationUpdate) -> QuotationUpdateResult:
         existing_quotation = await self.quotation_repository.get_quotation_by_id(quotation_id)
         if not existing_quotation:
             raise ServiceException(ErrorStatus.QUOTATION_NOT_FOUND)
 
-        await self.quotation_repository.update_quotation(quotation_id, quotation_data)
+        product_ids = [x.id for x in quotation_data.products]
+        if len(set(product_ids)) != len(product_ids):
+            raise ServiceException(ErrorStatus.QUOTATION_PRODUCT_ALREADY_EXISTS)
+
+        result = await self.quotation_repository.update_quotation(quotation_id, quotation_data)
+        await quotation_info_cache.invalidate(quotation_id)
+        if quotation_data.client_id != existing_quotation.client_id:
+            await invalidate_quotation_counts(existing_quotation.client_id, quotation_data.client_id)
+
+        changed = result["inserted"] + result["updated"] + result["deleted"]
+        return QuotationUpdateResult(
+            **result,
+            changed=changed,
+            unchanged=len(product_ids) - result["inserted"] - result["updated"]
+        )
 
     async def get_quotations_by_input_date(self, input_date: str):
         input_date = datetime.strptime(input_date, "%Y-%m-%d")
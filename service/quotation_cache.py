@@ -0,0 +1,135 @@
+import json
+import logging
+import time
+import uuid
+from typing import Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from core.db.redis import redis_client
+from schemas.quotation import QuotationInfo, QuotationCacheMetrics
+
+logger = logging.getLogger(__name__)
+
+# 견적서 조회 문서 캐시 유지 시간(초)
+QUOTATION_INFO_CACHE_TTL = 60 * 60 * 6
+# 제품 정보가 변경될 때마다 증가하는 카탈로그 버전
+CATALOG_VERSION_KEY = "catalog:version"
+# 카탈로그 버전 변경을 다른 worker 에 알리는 pub/sub 채널
+CATALOG_CHANNEL = "catalog:changed"
+
+
+async def bump_catalog_version() -> Optional[str]:
+    """ 제품 정보 변경 시 카탈로그 버전을 올려 이전 버전으로 만든 견적서 문서를 무효화하고 다른 worker 에 알림 """
+    try:
+        catalog_version = str(await redis_client.incr(CATALOG_VERSION_KEY))
+        await redis_client.publish(CATALOG_CHANNEL, catalog_version)
+        return catalog_version
+    except RedisError as e:
+        logger.error(f"catalog version 갱신 실패: {str(e)}")
+        return None
+
+
+class QuotationInfoCache:
+    """ 견적서 조회(QuotationInfo) 응답을 비정규화된 문서로 Redis에 저장하는 read model
+
+    문서에는 생성 시점의 카탈로그 버전과 견적서 세대(generation)가 함께 저장되며, 버전이 다르면 만료된 문서로 취급한다.
+    견적서가 변경되면 세대를 새 값으로 바꾸므로, DB 조회 도중 무효화된 경우 이전 세대로 저장된 문서는 사용되지 않는다.
+    Redis 장애 시에는 캐시 미스로 처리하여 DB 조회로 대체한다.
+    """
+    def __init__(self, ttl: int = QUOTATION_INFO_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        self.age_total = 0.0
+        self.age_max = 0.0
+
+    @staticmethod
+    def key(quotation_id: int) -> str:
+        return f"quotation:{quotation_id}:info"
+
+    @staticmethod
+    def generation_key(quotation_id: int) -> str:
+        return f"quotation:{quotation_id}:info:generation"
+
+    async def get(self, quotation_id: int) -> Tuple[Optional[QuotationInfo], Optional[str]]:
+        """ 캐시된 견적서 문서와 현재 문서 버전(카탈로그 버전:견적서 세대)을 한 번의 왕복으로 조회
+
+        캐시 미스인 경우 반환된 버전으로 set() 을 호출해야 하며, Redis 장애 시에는 버전 없이(None) 반환한다.
+        """
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(self.key(quotation_id))
+                pipe.get(CATALOG_VERSION_KEY)
+                pipe.get(self.generation_key(quotation_id))
+                document, catalog_version, generation = await pipe.execute()
+        except RedisError as e:
+            logger.error(f"quotation info cache 조회 실패: {str(e)}")
+            self.misses += 1
+            return None, None
+
+        version = f"{catalog_version or '0'}:{generation or ''}"
+        if document is None:
+            self.misses += 1
+            return None, version
+
+        document = json.loads(document)
+        if document.get("version") != version:
+            self.stale += 1
+            self.misses += 1
+            return None, version
+
+        age = max(time.time() - document["cached_at"], 0.0)
+        self.hits += 1
+        self.age_total += age
+        self.age_max = max(self.age_max, age)
+        return QuotationInfo.model_validate(document["info"]), version
+
+    async def set(self, quotation_id: int, quotation_info: QuotationInfo, version: Optional[str]) -> None:
+        """ DB 조회 전에 get() 으로 받은 버전으로 문서 저장 (그 사이 무효화되었다면 다음 조회 시 만료 처리) """
+        if version is None:
+            return
+        document = {
+            "info": quotation_info.model_dump(mode="json"),
+            "version": version,
+            "cached_at": time.time()
+        }
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(self.key(quotation_id), json.dumps(document), ex=self.ttl)
+                # 세대 값이 문서보다 먼저 만료되어 이전 값으로 돌아가지 않도록 유지 시간 연장
+                pipe.expire(self.generation_key(quotation_id), self.ttl * 2)
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"quotation info cache 저장 실패: {str(e)}")
+
+    async def invalidate(self, *quotation_ids: int) -> None:
+        """ 견적서 세대를 새 값으로 바꾸고 저장된 문서 삭제 """
+        if not quotation_ids:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for quotation_id in quotation_ids:
+                    pipe.set(self.generation_key(quotation_id), uuid.uuid4().hex, ex=self.ttl * 2)
+                pipe.delete(*[self.key(x) for x in quotation_ids])
+                await pipe.execute()
+            self.invalidations += len(quotation_ids)
+        except RedisError as e:
+            logger.error(f"quotation info cache 무효화 실패: {str(e)}")
+
+    def metrics(self) -> QuotationCacheMetrics:
+        requests = self.hits + self.misses
+        return QuotationCacheMetrics(
+            hits=self.hits,
+            misses=self.misses,
+            stale=self.stale,
+            invalidations=self.invalidations,
+            hit_rate=self.hits / requests if requests else 0.0,
+            average_age_seconds=self.age_total / self.hits if self.hits else 0.0,
+            max_age_seconds=self.age_max
+        )
+
+
+quotation_info_cache = QuotationInfoCache()
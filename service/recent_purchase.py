@@ -0,0 +1,109 @@
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from core.db.redis import redis_client
+
+# 최근 구매 점수 반감기(일), 0 이면 감쇠 없이 구매 횟수로 정렬
+RECENT_PURCHASE_HALF_LIFE_DAYS = float(os.getenv("RECENT_PURCHASE_HALF_LIFE_DAYS", "0"))
+# 감쇠 점수 기준 시각 (2024-01-01 UTC)
+RECENT_PURCHASE_DECAY_EPOCH = 1704067200
+# 감쇠 점수의 기준 시각을 옮기는 주기(반감기 배수). 가중치는 주기 시작 시각 기준이므로 최대 2^32
+RECENT_PURCHASE_RESCALE_HALF_LIVES = 32
+
+
+class RecentPurchaseCounter:
+    """ 거래처별 물품 구매 횟수(hash)와 최근 구매 순위(sorted set)를 Redis에 저장
+
+    감쇠를 사용하면 구매 시각이 늦을수록 큰 가중치(2^(경과일/반감기))를 더하는 방식으로,
+    기존 점수를 갱신하지 않고도 오래된 구매의 비중이 반감기마다 절반으로 줄어든다.
+    가중치가 끝없이 커지지 않도록 경과일은 RECENT_PURCHASE_RESCALE_HALF_LIVES 반감기 단위 주기의 시작부터 세며,
+    주기마다 새 sorted set 을 사용하고 이전 주기의 점수는 2^-RECENT_PURCHASE_RESCALE_HALF_LIVES 배로 옮겨 담는다.
+    """
+    def __init__(self, half_life_days: float = RECENT_PURCHASE_HALF_LIFE_DAYS):
+        self.half_life_days = half_life_days
+
+    @staticmethod
+    def count_key(client_id: int) -> str:
+        return f"user:{client_id}:products"
+
+    @staticmethod
+    def rank_key(client_id: int, period: Optional[int] = None) -> str:
+        if period is None:
+            return f"user:{client_id}:products:rank"
+        return f"user:{client_id}:products:rank:{period}"
+
+    @property
+    def period_seconds(self) -> float:
+        return self.half_life_days * RECENT_PURCHASE_RESCALE_HALF_LIVES * 86400
+
+    def decay(self, now: Optional[float] = None) -> Tuple[Optional[int], float]:
+        """ 현재 감쇠 주기와 주기 시작 기준 구매 가중치 (감쇠를 사용하지 않으면 (None, 1)) """
+        if not self.half_life_days:
+            return None, 1.0
+        elapsed = (now or time.time()) - RECENT_PURCHASE_DECAY_EPOCH
+        period = int(elapsed // self.period_seconds)
+        elapsed_days = (elapsed - period * self.period_seconds) / 86400
+        return period, 2 ** (elapsed_days / self.half_life_days)
+
+    def weight(self, now: Optional[float] = None) -> float:
+        return self.decay(now)[1]
+
+    async def _carry_over(self, client_id: int, period: int) -> None:
+        """ 이전 주기의 점수를 현재 주기 기준으로 줄여 합친 뒤 삭제 """
+        previous_key = self.rank_key(client_id, period - 1)
+        if not await redis_client.exists(previous_key):
+            return
+        rank_key = self.rank_key(client_id, period)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zunionstore(rank_key, {rank_key: 1, previous_key: 2.0 ** -RECENT_PURCHASE_RESCALE_HALF_LIVES})
+            pipe.delete(previous_key)
+            pipe.expire(rank_key, int(self.period_seconds * 2))
+            await pipe.execute()
+
+    async def record(self, client_id: int, product_ids: Iterable[int], now: Optional[float] = None) -> None:
+        period, weight = self.decay(now)
+        if period is not None:
+            await self._carry_over(client_id, period)
+
+        rank_key = self.rank_key(client_id, period)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for product_id in product_ids:
+                pipe.hincrby(self.count_key(client_id), product_id, 1)
+                pipe.zincrby(rank_key, weight, product_id)
+            if period is not None:
+                # 두 주기 동안 구매가 없으면 점수는 2^-32 배 이하이므로 만료시키고 구매 횟수로 다시 생성
+                pipe.expire(rank_key, int(self.period_seconds * 2))
+            await pipe.execute()
+
+    async def top(self, client_id: int, limit: int, now: Optional[float] = None) -> List[Tuple[int, int]]:
+        """ 점수 상위 limit 개의 (물품 ID, 구매 횟수) 반환 """
+        period, weight = self.decay(now)
+        if period is not None:
+            await self._carry_over(client_id, period)
+
+        rank_key = self.rank_key(client_id, period)
+        product_ids = await redis_client.zrevrange(rank_key, 0, limit - 1)
+        if not product_ids:
+            product_ids = await self._backfill(client_id, limit, rank_key, weight)
+        if not product_ids:
+            return []
+
+        counts = await redis_client.hmget(self.count_key(client_id), product_ids)
+        return [(int(x), int(count or 0)) for x, count in zip(product_ids, counts)]
+
+    async def _backfill(self, client_id: int, limit: int, rank_key: str, weight: float) -> List[str]:
+        """ sorted set 이 없으면(도입 이전 데이터, 만료) hash 에 저장된 구매 횟수로 순위를 한 번 생성 """
+        counts = await redis_client.hgetall(self.count_key(client_id))
+        if not counts:
+            return []
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zadd(rank_key, {x: int(count) * weight for x, count in counts.items()})
+            if self.half_life_days:
+                pipe.expire(rank_key, int(self.period_seconds * 2))
+            pipe.zrevrange(rank_key, 0, limit - 1)
+            *_, product_ids = await pipe.execute()
+        return product_ids
+
+
+recent_purchase_counter = RecentPurchaseCounter()
@@ -0,0 +1,103 @@
+import logging
+import uuid
+
+from fastapi import UploadFile
+
+from core.db.database import local_session
+from core.db.redis import redis_client
+from core.response.code.error_status import ErrorStatus
+from core.response.handler.exception_handler import ServiceException
+from repository.product.product import ProductRepository
+from schemas.upload_job import UploadJobKind, UploadJobRead, UploadJobStatus, to_upload_job_read
+from service.job_worker import JobWorker
+from service.product import ProductService
+from service.product_file import spool_upload, remove_spooled_upload, parse_in_process_pool
+from service.product_parser import read_excel_file_about_product_list, read_excel_file_about_vegetable_price_list
+
+logger = logging.getLogger(__name__)
+
+# 업로드 작업 상태 보관 시간(초)
+UPLOAD_JOB_TTL = 60 * 60 * 24
+
+UPLOAD_PARSERS = {
+    UploadJobKind.PRODUCT: read_excel_file_about_product_list,
+    UploadJobKind.VEGETABLE_PRICE: read_excel_file_about_vegetable_price_list,
+}
+
+
+def upload_job_key(job_id: str) -> str:
+    return f"upload_job:{job_id}"
+
+
+class UploadJobService:
+    async def submit_job(self, file: UploadFile, kind: UploadJobKind, dry_run: bool = False) -> UploadJobRead:
+        """ 업로드 파일을 저장한 뒤 파싱/저장 작업을 등록하고 바로 반환 """
+        file_path = await spool_upload(file)
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind.value,
+            "status": UploadJobStatus.PENDING.value,
+            "filename": file.filename,
+            "file_path": file_path,
+            "dry_run": "1" if dry_run else "0",
+            "total_rows": 0,
+            "processed_rows": 0,
+            "result": "",
+            "error": "",
+        }
+        try:
+            await redis_client.hset(upload_job_key(job["job_id"]), mapping=job)
+            await redis_client.expire(upload_job_key(job["job_id"]), UPLOAD_JOB_TTL)
+            await upload_job_worker.enqueue(job["job_id"])
+        except Exception:
+            remove_spooled_upload(file_path)
+            raise
+        return to_upload_job_read(job)
+
+    async def get_job(self, job_id: str) -> UploadJobRead:
+        job = await redis_client.hgetall(upload_job_key(job_id))
+        if not job:
+            raise ServiceException(ErrorStatus.UPLOAD_JOB_NOT_FOUND)
+        return to_upload_job_read(job)
+
+
+async def run_upload_job(job_id: str) -> None:
+    """ 프로세스 풀에서 파일을 파싱한 뒤 chunk 단위로 저장하며 진행 상황을 기록 """
+    key = upload_job_key(job_id)
+    job = await redis_client.hgetall(key)
+    if not job:
+        return
+
+    kind = UploadJobKind(job["kind"])
+    dry_run = job["dry_run"] == "1"
+
+    async def progress(processed_rows: int) -> None:
+        await redis_client.hset(key, "processed_rows", processed_rows)
+
+    try:
+        await redis_client.hset(key, "status", UploadJobStatus.PARSING.value)
+        data = await parse_in_process_pool(UPLOAD_PARSERS[kind], job["file_path"])
+        await redis_client.hset(key, mapping={"status": UploadJobStatus.WRITING.value, "total_rows": len(data)})
+
+        async with local_session() as session:
+            product_service = ProductService(product_repository=ProductRepository(session))
+            if kind == UploadJobKind.PRODUCT:
+                result = await product_service.import_products(data, progress)
+            else:
+                result = await product_service.apply_vegetable_prices(data, dry_run)
+                await progress(len(data))
+
+        await redis_client.hset(key, mapping={
+            "status": UploadJobStatus.COMPLETED.value,
+            "result": result.model_dump_json()
+        })
+    except Exception as e:
+        logger.error(f"upload job {job_id} 실패: {type(e).__name__} - {str(e)}")
+        error = e.error_status.message if isinstance(e, ServiceException) else str(e) or type(e).__name__
+        await redis_client.hset(key, mapping={"status": UploadJobStatus.FAILED.value, "error": error})
+    finally:
+        # 성공/실패와 관계없이 파싱이 끝난 업로드 파일 삭제
+        remove_spooled_upload(job["file_path"])
+
+
+upload_job_worker = JobWorker(run_upload_job, "upload_job", upload_job_key)
@@ -0,0 +1,23 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.db.database import Base
+from tests.fake_redis import FakeRedis
+
+
+@pytest_asyncio.fixture
+async def engine():
+    """ 모든 테이블을 만든 in-memory sqlite 엔진 (테스트 파일별 데이터는 이 fixture 를 받아 추가) """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def fake_redis(monkeypatch, *modules: str) -> FakeRedis:
+    """ 하나의 FakeRedis 를 각 모듈의 redis_client 로 바꾸고 반환 """
+    redis = FakeRedis()
+    for module in modules:
+        monkeypatch.setattr(f"{module}.redis_client", redis)
+    return redis
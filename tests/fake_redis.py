@@ -0,0 +1,191 @@
+import fnmatch
+import time
+from typing import Any, Dict, Optional
+
+
+class FakePipeline:
+    """ 명령을 모아 두었다가 execute() 에서 순서대로 실행하는 pipeline """
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+class FakeRedis:
+    """ 테스트용 in-memory Redis (decode_responses=True 인 redis.asyncio 클라이언트에서 사용하는 명령만 구현) """
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.expires: Dict[str, float] = {}
+        self.published = []
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def _get(self, key: str, default_factory=None):
+        if not self._alive(key):
+            if default_factory is None:
+                return None
+            self.data[key] = default_factory()
+        return self.data[key]
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._get(key)
+
+    async def set(self, key: str, value, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._alive(key):
+            return None
+        self.data[key] = str(value)
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = time.time() + ex
+        return True
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        value = int(self._get(key) or 0) + amount
+        self.data[key] = str(value)
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            if self._alive(key):
+                deleted += 1
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return deleted
+
+    async def exists(self, *keys: str) -> int:
+        return sum(self._alive(x) for x in keys)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self.expires[key] = time.time() + seconds
+        return True
+
+    async def keys(self, pattern: str = "*") -> list:
+        return [x for x in list(self.data) if self._alive(x) and fnmatch.fnmatchcase(x, pattern)]
+
+    async def publish(self, channel: str, message) -> int:
+        self.published.append((channel, str(message)))
+        return 0
+
+    async def hset(self, key: str, field=None, value=None, mapping: Optional[dict] = None) -> int:
+        hash_ = self._get(key, dict)
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        added = sum(str(x) not in hash_ for x in items)
+        hash_.update({str(x): str(y) for x, y in items.items()})
+        return added
+
+    async def hget(self, key: str, field) -> Optional[str]:
+        return (self._get(key) or {}).get(str(field))
+
+    async def hgetall(self, key: str) -> dict:
+        return dict(self._get(key) or {})
+
+    async def hmget(self, key: str, fields) -> list:
+        hash_ = self._get(key) or {}
+        return [hash_.get(str(x)) for x in fields]
+
+    async def hincrby(self, key: str, field, amount: int = 1) -> int:
+        hash_ = self._get(key, dict)
+        value = int(hash_.get(str(field), 0)) + amount
+        hash_[str(field)] = str(value)
+        return value
+
+    async def sadd(self, key: str, *members) -> int:
+        set_ = self._get(key, set)
+        added = sum(str(x) not in set_ for x in members)
+        set_.update(str(x) for x in members)
+        return added
+
+    async def smembers(self, key: str) -> set:
+        return set(self._get(key) or set())
+
+    async def srem(self, key: str, *members) -> int:
+        set_ = self._get(key) or set()
+        removed = sum(str(x) in set_ for x in members)
+        set_.difference_update(str(x) for x in members)
+        return removed
+
+    async def zadd(self, key: str, mapping: dict) -> int:
+        zset = self._get(key, dict)
+        added = sum(str(x) not in zset for x in mapping)
+        zset.update({str(x): float(y) for x, y in mapping.items()})
+        return added
+
+    async def zincrby(self, key: str, amount: float, member) -> float:
+        zset = self._get(key, dict)
+        zset[str(member)] = zset.get(str(member), 0.0) + amount
+        return zset[str(member)]
+
+    async def zscore(self, key: str, member) -> Optional[float]:
+        return (self._get(key) or {}).get(str(member))
+
+    async def zunionstore(self, dest: str, keys: dict) -> int:
+        union = {}
+        for key, weight in keys.items():
+            for member, score in (self._get(key) or {}).items():
+                union[member] = union.get(member, 0.0) + score * weight
+        await self.delete(dest)
+        if union:
+            self.data[dest] = union
+        return len(union)
+
+    async def zrem(self, key: str, *members) -> int:
+        zset = self._get(key) or {}
+        return sum(zset.pop(str(x), None) is not None for x in members)
+
+    async def zcard(self, key: str) -> int:
+        return len(self._get(key) or {})
+
+    def _sorted(self, key: str, reverse: bool = False) -> list:
+        zset = self._get(key) or {}
+        return sorted(zset.items(), key=lambda x: (x[1], x[0]), reverse=reverse)
+
+    async def zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list:
+        items = self._sorted(key)
+        items = items[start:] if end == -1 else items[start:end + 1]
+        return items if withscores else [x for x, _ in items]
+
+    async def zrevrange(self, key: str, start: int, end: int, withscores: bool = False) -> list:
+        items = self._sorted(key, reverse=True)
+        items = items[start:] if end == -1 else items[start:end + 1]
+        return items if withscores else [x for x, _ in items]
+
+    async def zrangebyscore(self, key: str, min, max, withscores: bool = False) -> list:
+        items = [x for x in self._sorted(key) if float(min) <= x[1] <= float(max)]
+        return items if withscores else [x for x, _ in items]
+
+    async def zremrangebyscore(self, key: str, min, max) -> int:
+        zset = self._get(key) or {}
+        removed = [x for x, score in zset.items() if float(min) <= score <= float(max)]
+        for member in removed:
+            del zset[member]
+        return len(removed)
@@ -0,0 +1,47 @@
+import pytest
+from aiohttp import web
+
+from service import alert
+from service.alert import AlertDispatcher
+
+
+class FakeDiscordWebhook:
+    """ 첫 요청은 rate limit(429), 이후는 204 를 응답하는 로컬 webhook """
+    def __init__(self):
+        self.contents = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.contents.append((await request.json())["content"])
+        if len(self.contents) == 1:
+            return web.json_response({"retry_after": 0.1}, status=429)
+        return web.Response(status=204)
+
+
+@pytest.mark.asyncio
+async def test_alert_batched_deduplicated_and_bounded(monkeypatch):
+    """ 알림은 기다리지 않고 큐에 들어가며, 중복 제거/버림 집계 후 하나의 요청으로 묶어 전송 (429 시 재전송) """
+    monkeypatch.setattr(alert, "ALERT_BATCH_INTERVAL", 0.05)
+    webhook = FakeDiscordWebhook()
+    app = web.Application()
+    app.router.add_post("/webhook", webhook.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    dispatcher = AlertDispatcher(f"http://127.0.0.1:{port}/webhook", queue_size=3, send_interval=0)
+    try:
+        results = [dispatcher.alert(f"잘못된 접근 경고: /{x}", sentry=False) for x in ["a", "a", "b", "c", "d"]]
+        assert results == [True, False, True, True, False]
+        # 전송은 worker 가 시작된 뒤에만 일어남
+        assert webhook.contents == []
+
+        dispatcher.start()
+        await dispatcher.stop()
+    finally:
+        await runner.cleanup()
+
+    assert webhook.contents == ["잘못된 접근 경고: /a\n잘못된 접근 경고: /b\n잘못된 접근 경고: /c"] * 2
+    metrics = dispatcher.metrics()
+    assert (metrics.sent, metrics.deduplicated, metrics.dropped, metrics.failed, metrics.queued) == (3, 1, 1, 0, 0)
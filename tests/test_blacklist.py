@@ -0,0 +1,66 @@
+import os
+import re
+import time
+
+from core.blacklist import BlacklistMatcher, literal_prefix
+from core.utils import load_blacklist
+
+
+def test_literal_prefix():
+    assert literal_prefix(r"/cgi-bin/authLogin\.cgi") == ("/cgi-bin/authLogin.cgi", True)
+    assert literal_prefix("/phpMyAdmin-.*/scripts/setup\\.php") == ("/phpMyAdmin-", False)
+    assert literal_prefix("/admin/?login") == ("/admin", False)
+    assert literal_prefix(r"/\d+/x") == ("/", False)
+
+
+def test_matches_same_paths_as_re_match():
+    """ blacklist.txt 의 모든 패턴에 대해 패턴을 하나씩 re.match 하는 기존 방식과 결과가 같은지 테스트 """
+    patterns = load_blacklist("blacklist.txt")
+    matcher = BlacklistMatcher("blacklist.txt", allowed_prefixes=())
+    paths = [literal_prefix(x)[0] for x in patterns] + [x.replace("\\", "") for x in patterns] + [
+        "/", "/api/v1/products", "/.env.bak", "/phpMyAdmin-4.0/scripts/setup.php", "/solr", "/api/session/x"
+    ]
+
+    for path in paths:
+        assert matcher.is_blocked(path) == any(re.match(x, path) for x in patterns), path
+
+
+def test_allowed_prefix_and_reload(tmp_path):
+    file_path = tmp_path / "blacklist.txt"
+    file_path.write_text("/.env\n/api/v1/admin\n")
+    matcher = BlacklistMatcher(str(file_path), allowed_prefixes=("/api/v1/", "/api/v2/"), reload_interval=0)
+
+    assert matcher.skip_prefixes == ("/api/v2/",)
+    assert matcher.is_blocked("/api/v1/admin/users")
+    assert not matcher.is_blocked("/wp-login.php")
+
+    file_path.write_text("/.env\n/wp-login\\.php\n")
+    os.utime(file_path, (time.time() + 10, time.time() + 10))
+    assert matcher.is_blocked("/wp-login.php")
+    assert matcher.skip_prefixes == ("/api/v1/", "/api/v2/")
+
+
+def patterns_on_path(matcher: BlacklistMatcher, path: str) -> int:
+    """ 경로를 trie 로 따라가며 확인하게 되는 패턴 수 """
+    count, node = 0, matcher.trie
+    for char in path:
+        node = node.get(char)
+        if node is None:
+            break
+        count += len(node.get(None, ()))
+    return count
+
+
+def test_large_blacklist(tmp_path):
+    """ 패턴 5,000개에서도 요청마다 경로의 prefix 와 일치하는 패턴만 확인하는지 테스트 """
+    file_path = tmp_path / "blacklist.txt"
+    file_path.write_text("\n".join(f"/scan{i}/.*\\.php" for i in range(5000)))
+    matcher = BlacklistMatcher(str(file_path), allowed_prefixes=())
+
+    assert matcher.size == 5000
+    assert matcher.fallback == []
+    for i in range(1000):
+        assert matcher.is_blocked(f"/scan{i}/x.php")
+        assert not matcher.is_blocked(f"/products/{i}")
+        assert patterns_on_path(matcher, f"/scan{i}/x.php") == 1
+        assert patterns_on_path(matcher, f"/products/{i}") == 0
@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles, deregister
+from sqlalchemy.sql import functions
+
+from api.dependencies import get_current_user
+from api.v1.product import router
+from models import Product, User
+from repository.product.product import ProductRepository
+from service.catalog import CatalogService, CatalogSnapshotCache
+
+
+def sqlite_now(element, compiler, **kw):
+    """ sqlite 의 CURRENT_TIMESTAMP 는 초 단위 문자열이라 SQLAlchemy 가 저장하는 datetime 문자열과 비교되지 않으므로 같은 형식으로 반환 """
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@pytest.fixture(autouse=True)
+def sqlite_now_compiler():
+    """ 이 파일의 테스트 동안만 now()/CURRENT_TIMESTAMP 컴파일을 바꾸고, 끝나면 기본 컴파일로 되돌림 """
+    for function in (functions.now, functions.current_timestamp):
+        compiles(function, "sqlite")(sqlite_now)
+    yield
+    for function in (functions.now, functions.current_timestamp):
+        deregister(function)
+
+
+@pytest_asyncio.fixture
+async def engine(engine):
+    async with AsyncSession(engine) as session:
+        old = datetime.utcnow() - timedelta(days=1)
+        session.add_all([
+            Product(id=i, name=f"물품{i}", category="야채", unit="kg", price=1000 + i, created_at=old)
+            for i in range(1, 6)
+        ])
+        await session.commit()
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_catalog_snapshot_and_delta(engine):
+    """ 전체 스냅샷 캐시와 since 이후 변경/삭제분 조회 테스트 """
+    repository = ProductRepository(session=AsyncSession(engine))
+    service = CatalogService(product_repository=repository)
+
+    with patch("service.catalog.catalog_snapshot_cache", CatalogSnapshotCache()):
+        snapshot = json.loads(await service.get_snapshot("1"))["result"]
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        assert json.loads(await service.get_snapshot("1"))["result"] == snapshot
+        assert statements == []
+
+    assert snapshot["full"] is True
+    assert len(snapshot["products"]) == 5
+
+    since = datetime.fromisoformat(snapshot["synced_at"])
+    await repository.update_product(2, {"price": 9999})
+    await repository.delete_product_by_id(4)
+    await repository.create_product(Product(name="물품6", category="야채", unit="kg", price=1006))
+
+    delta = json.loads(await service.get_snapshot("2", since))["result"]
+    assert delta["full"] is False
+    assert sorted((x["id"], x["price"]) for x in delta["products"]) == [(2, 9999), (6, 1006)]
+    assert delta["deleted_ids"] == [4]
+
+
+@pytest.mark.asyncio
+async def test_catalog_endpoint_not_modified(engine):
+    """ If-None-Match 가 현재 ETag 와 같으면 304 를 반환하는지 테스트 """
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, client_id=1)
+    app.dependency_overrides[ProductRepository] = lambda: ProductRepository(session=AsyncSession(engine))
+
+    with patch("service.catalog.CatalogService.get_catalog_version", AsyncMock(return_value="7")), \
+            patch("service.catalog.catalog_snapshot_cache", CatalogSnapshotCache()):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/products/catalog")
+            etag = response.headers["ETag"]
+            not_modified = await client.get("/products/catalog", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert etag == 'W/"catalog-7"'
+    assert len(response.json()["result"]["products"]) == 5
+    assert not_modified.status_code == 304
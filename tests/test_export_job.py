@@ -0,0 +1,172 @@
+import io
+import os
+import time
+import zipfile
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from openpyxl import load_workbook
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from models import Client, Product, Quotation, QuotationProduct
+from repository.quotation.quotation import QuotationRepository
+from schemas.export_job import ExportJobCreate, ExportJobKind, ExportJobStatus
+from service.export_job import ExportJobService, export_job_worker, cleanup_export_cache, job_key
+from tests.conftest import fake_redis
+
+
+@pytest_asyncio.fixture
+async def engine(engine):
+    async with AsyncSession(engine) as session:
+        session.add(Client(id=1, name="상호명", address="서울"))
+        session.add_all([
+            Product(id=i, name=f"물품{i}", category="야채", unit="kg", price=1000 + i) for i in range(1, 4)
+        ])
+        session.add_all([
+            Quotation(id=i, client_id=1, name=f"2024/05/01-거래처{i}", total_price=0, input_date=date(2024, 5, 1),
+                      created_at=datetime(2024, 5, 1, 9))
+            for i in (1, 2)
+        ])
+        session.add_all([
+            QuotationProduct(quotation_id=i, product_id=j, price=(1000 + j) * i, quantity=i)
+            for i in (1, 2) for j in range(1, 4)
+        ])
+        await session.commit()
+    return engine
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    return fake_redis(monkeypatch, "service.export_job", "service.job_worker")
+
+
+@pytest_asyncio.fixture
+async def export_service(engine, redis, tmp_path, monkeypatch):
+    """ 결과 파일 경로를 tmp_path 로, Redis 를 fake 로 바꾼 추출 작업 서비스와 worker """
+    monkeypatch.setattr("service.export_job.local_session", sessionmaker(engine, class_=AsyncSession))
+    monkeypatch.setattr("service.export_job.EXPORT_CACHE_PATH", str(tmp_path))
+    export_job_worker.start()
+    yield ExportJobService(quotation_repository=QuotationRepository(session=AsyncSession(engine)))
+    await export_job_worker.stop()
+
+
+async def run_job(service: ExportJobService, job_create: ExportJobCreate):
+    job = await service.submit_job(job_create)
+    await export_job_worker.queue.join()
+    return job, await service.get_job(job.job_id)
+
+
+@pytest.mark.asyncio
+async def test_export_job_writes_and_reuses_artifact(export_service, engine):
+    """ 추출 작업 완료 후 결과 파일을 내려받고, 변경되지 않은 견적서는 작업 없이 기존 파일을 재사용하는지 테스트 """
+    job_create = ExportJobCreate(kind=ExportJobKind.DAILY, input_date=date(2024, 5, 1))
+
+    submitted, job = await run_job(export_service, job_create)
+    path, filename, media_type = await export_service.get_job_artifact(job.job_id)
+
+    assert submitted.status == ExportJobStatus.PENDING and not submitted.cached
+    assert job.status == ExportJobStatus.COMPLETED
+    assert (filename, media_type) == ("minifood_2024-05-01.zip", "application/zip")
+    with zipfile.ZipFile(path) as zip_file:
+        assert sorted(zip_file.namelist()) == ["2024/05/01-거래처1 견적서.xlsx", "2024/05/01-거래처2 견적서.xlsx"]
+        rows = list(load_workbook(io.BytesIO(zip_file.read("2024/05/01-거래처2 견적서.xlsx"))).active.values)
+    assert rows == [("물품", "수량", "단가"), ("물품1", "2", "2002"), ("물품2", "2", "2004"), ("물품3", "2", "2006")]
+
+    # 변경되지 않은 견적서는 같은 파일을 바로 반환
+    os.utime(path, (0, 0))
+    cached_job = await export_service.submit_job(job_create)
+    assert cached_job.status == ExportJobStatus.COMPLETED and cached_job.cached
+    assert export_job_worker.queue.empty()
+    assert (await export_service.get_job_artifact(cached_job.job_id))[0] == path
+    assert os.path.getmtime(path) > 0
+
+    # 견적서가 수정되면 새 결과 파일 작성
+    async with AsyncSession(engine) as session:
+        await session.execute(update(Quotation).where(Quotation.id == 2).values(updated_at=datetime(2024, 5, 1, 10)))
+        await session.commit()
+    submitted, job = await run_job(export_service, job_create)
+    assert not submitted.cached and job.status == ExportJobStatus.COMPLETED
+    assert (await export_service.get_job_artifact(job.job_id))[0] != path
+
+
+@pytest.mark.asyncio
+async def test_export_job_reexported_after_particulars_change(export_service, engine):
+    """ 특이사항/완료 처리도 updated_at 을 갱신해 기존 결과 파일을 재사용하지 않는지 테스트 """
+    job_create = ExportJobCreate(kind=ExportJobKind.QUOTATION, quotation_id=1)
+    repository = QuotationRepository(session=AsyncSession(engine))
+
+    for change in (lambda: repository.update_particulars(1, "오전 배송"),
+                   lambda: repository.update_status_completed(1)):
+        # now() 는 초 단위라 같은 초 안의 변경끼리는 구분되지 않으므로, 이전 시각으로 되돌린 결과 파일과 비교
+        async with AsyncSession(engine) as session:
+            await session.execute(update(Quotation).where(Quotation.id == 1).values(updated_at=datetime(2024, 5, 1, 10)))
+            await session.commit()
+        _, job = await run_job(export_service, job_create)
+        path = (await export_service.get_job_artifact(job.job_id))[0]
+
+        await change()
+        _, job = await run_job(export_service, job_create)
+        assert job.status == ExportJobStatus.COMPLETED
+        assert (await export_service.get_job_artifact(job.job_id))[0] != path
+
+
+@pytest.mark.asyncio
+async def test_export_job_recovered_from_stopped_worker(export_service, redis):
+    """ 종료/재시작된 worker 의 대기·실행 중 작업을 다른 worker 가 가져와 실행하는지 테스트 """
+    job_create = ExportJobCreate(kind=ExportJobKind.QUOTATION, quotation_id=1)
+    job = await export_service.submit_job(job_create)
+    await export_job_worker.queue.join()
+    assert (await export_service.get_job(job.job_id)).status == ExportJobStatus.COMPLETED
+    assert await redis.smembers(export_job_worker.active_key) == set()
+
+    # heartbeat 가 끊긴 worker 가 실행하던 작업과 아직 실행 중인 worker 의 작업
+    await redis.hset(job_key("lost"), mapping={**await redis.hgetall(job_key(job.job_id)), "job_id": "lost",
+                                              "status": ExportJobStatus.RUNNING.value, "worker_id": "dead",
+                                              "artifact_key": "lost"})
+    await redis.hset(job_key("alive"), mapping={**await redis.hgetall(job_key("lost")), "job_id": "alive",
+                                               "worker_id": "alive", "artifact_key": "alive"})
+    await redis.set(export_job_worker.heartbeat_key("alive"), 1)
+    await redis.sadd(export_job_worker.active_key, "lost", "alive", "expired")
+
+    assert await export_job_worker.recover() == ["lost"]
+    await export_job_worker.queue.join()
+
+    assert (await export_service.get_job("lost")).status == ExportJobStatus.COMPLETED
+    assert (await export_service.get_job("alive")).status == ExportJobStatus.RUNNING
+    assert await redis.smembers(export_job_worker.active_key) == {"alive"}
+
+    # 종료한 worker 의 heartbeat 는 바로 삭제되어 다른 worker 가 남은 작업을 가져갈 수 있음
+    worker_id = export_job_worker.worker_id
+    await export_job_worker.stop()
+    assert not await redis.exists(export_job_worker.heartbeat_key(worker_id))
+    export_job_worker.start()
+
+
+@pytest.mark.asyncio
+async def test_export_job_single_quotation(export_service):
+    """ 견적서 1개 추출 결과가 excel 파일로 작성되는지 테스트 """
+    _, job = await run_job(export_service, ExportJobCreate(kind=ExportJobKind.QUOTATION, quotation_id=1))
+    path, filename, _ = await export_service.get_job_artifact(job.job_id)
+
+    assert filename == "2024/05/01-거래처1 견적서.xlsx"
+    assert len(list(load_workbook(path).active.values)) == 4
+
+
+def test_cleanup_export_cache(tmp_path, monkeypatch):
+    """ 보관 기간이 지난 파일과 크기 제한을 넘는 오래된 파일부터 삭제되는지 테스트 """
+    monkeypatch.setattr("service.export_job.EXPORT_CACHE_PATH", str(tmp_path))
+    monkeypatch.setattr("service.export_job.EXPORT_CACHE_MAX_AGE", 100)
+    monkeypatch.setattr("service.export_job.EXPORT_CACHE_MAX_BYTES", 25)
+    now = time.time()
+    ages = {"expired.zip": 200, "old.zip": 50, "recent.zip": 10, "new.xlsx": 0, "writing.zip.job.tmp": 150}
+    for name, age in ages.items():
+        (tmp_path / name).write_bytes(b"x" * 10)
+        os.utime(tmp_path / name, (now - age, now - age))
+
+    removed = cleanup_export_cache(now)
+
+    assert sorted(os.path.basename(x) for x in removed) == ["expired.zip", "old.zip", "writing.zip.job.tmp"]
+    assert sorted(os.listdir(tmp_path)) == ["new.xlsx", "recent.zip"]
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from service.ip_ban import IpBanList, IP_BAN_KEY, hit_key
+from tests.conftest import fake_redis
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    return fake_redis(monkeypatch, "service.ip_ban")
+
+
+@pytest.mark.asyncio
+async def test_record_hit_bans_at_threshold_and_syncs(redis):
+    """ 기준 횟수에 도달하면 차단하고, 다른 worker 는 sync 로 차단 목록을 받는지 테스트 """
+    ban_list = IpBanList(threshold=3, window=60, ttl=600, exempt_ips={"127.0.0.1"})
+    other_worker = IpBanList(threshold=3, window=60, ttl=600, exempt_ips={"127.0.0.1"})
+
+    assert [await ban_list.record_hit("10.0.0.1") for _ in range(2)] == [False, False]
+    assert not ban_list.is_banned("10.0.0.1")
+    assert await ban_list.record_hit("10.0.0.1") is True
+    assert await ban_list.record_hit("127.0.0.1") is False
+    assert await ban_list.record_hit(None) is False
+
+    assert ban_list.is_banned("10.0.0.1")
+    assert not await redis.exists(hit_key("10.0.0.1"))
+    assert await redis.zscore(IP_BAN_KEY, "10.0.0.1") == pytest.approx(time.time() + 600, abs=5)
+
+    assert not other_worker.is_banned("10.0.0.1")
+    await other_worker.sync()
+    assert other_worker.is_banned("10.0.0.1")
+    assert [x.ip for x in await other_worker.get_bans()] == ["10.0.0.1"]
+
+    metrics = await ban_list.metrics()
+    assert (metrics.banned, metrics.bans, metrics.unbans, metrics.hits, metrics.rejected) == (1, 1, 0, 3, 1)
+
+
+@pytest.mark.asyncio
+async def test_expired_bans_counted_as_unbans(redis):
+    """ 만료된 차단은 sync 에서 정리되고 해제 건수로 집계되는지 테스트 """
+    ban_list = IpBanList(ttl=600, exempt_ips=set())
+    await ban_list.ban("10.0.0.1")
+    await ban_list.ban("10.0.0.2")
+    # 다시 차단해도 새 차단으로 집계하지 않음
+    await ban_list.ban("10.0.0.2")
+    await redis.zadd(IP_BAN_KEY, {"10.0.0.1": time.time() - 1})
+
+    await ban_list.sync()
+
+    assert not ban_list.is_banned("10.0.0.1") and ban_list.is_banned("10.0.0.2")
+    assert await redis.zrange(IP_BAN_KEY, 0, -1) == ["10.0.0.2"]
+    metrics = await ban_list.metrics()
+    assert (metrics.banned, metrics.bans, metrics.unbans) == (1, 2, 1)
+
+    # 이미 정리된 차단은 다시 집계하지 않음
+    await ban_list.sync()
+    assert (await ban_list.metrics()).unbans == 1
+
+
+@pytest.mark.asyncio
+async def test_unban(redis):
+    """ 수동 해제는 메모리/Redis 목록에서 모두 제거하고 한 번만 집계되는지 테스트 """
+    ban_list = IpBanList(ttl=600, exempt_ips=set())
+    await ban_list.ban("10.0.0.1")
+
+    assert await ban_list.unban("10.0.0.1") is True
+    assert await ban_list.unban("10.0.0.1") is False
+
+    assert not ban_list.is_banned("10.0.0.1")
+    assert await redis.zcard(IP_BAN_KEY) == 0
+    await ban_list.sync()
+    assert ban_list.banned == {}
+    assert (await ban_list.metrics()).unbans == 1
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Product, KamisProductMapping
+from repository.kamis.kamis import KamisProductMappingRepository
+from repository.product.product import ProductRepository
+from service.kamis import KamisService
+from service.kamis_sync import KamisSyncService, parse_kamis_latest_price
+from service.product import ProductService
+
+KAMIS_PRICES = {
+    ("211", "01"): [("01/02", "20,000"), ("01/03", "24,000")],
+    ("246", "00"): [("01/03", "-")],
+}
+
+
+class FakeKamisServer:
+    """ periodProductList 요청에 품목별 고정 시세를 응답하는 로컬 KAMIS 서버 """
+    def __init__(self):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+
+        key = (request.query["p_itemcode"], request.query["p_kindcode"])
+        if key not in KAMIS_PRICES:
+            return web.Response(status=500)
+        items = [{"countyname": "평균", "regday": day, "price": price} for day, price in KAMIS_PRICES[key]]
+        return web.json_response({"condition": [], "data": {"error_code": "000", "item": items}})
+
+
+class MemoryCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key, start_date, end_date):
+        return self.data.get((key, start_date, end_date))
+
+    async def set(self, key, start_date, end_date, response):
+        self.data[(key, start_date, end_date)] = response
+
+
+@pytest_asyncio.fixture
+async def kamis_server():
+    server = FakeKamisServer()
+    app = web.Application()
+    app.router.add_get("/service/price/xml.do", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    server.url = f"http://127.0.0.1:{port}/service/price/xml.do"
+    yield server
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def engine(engine):
+    async with AsyncSession(engine) as session:
+        session.add_all([
+            Product(id=1, name="배추", category="야채", unit="포기", price=3000),
+            Product(id=2, name="배추(kg)", category="야채", unit="kg", price=900),
+            Product(id=3, name="쪽파", category="야채", unit="kg", price=5000),
+            Product(id=4, name="양파", category="야채", unit="kg", price=1000),
+        ])
+        session.add_all([
+            KamisProductMapping(product_id=1, item_category_code="200", item_code="211", kind_code="01",
+                                price_multiplier=1 / 3),
+            KamisProductMapping(product_id=2, item_category_code="200", item_code="211", kind_code="01",
+                                price_multiplier=0.05),
+            KamisProductMapping(product_id=3, item_category_code="200", item_code="246", kind_code="00",
+                                price_multiplier=1),
+            KamisProductMapping(product_id=4, item_category_code="200", item_code="245", kind_code="00",
+                                price_multiplier=1),
+        ])
+        await session.commit()
+    return engine
+
+
+def test_parse_kamis_latest_price():
+    assert parse_kamis_latest_price({"data": {"item": [
+        {"countyname": "평균", "price": "1,000"},
+        {"countyname": "평균", "price": "1,200"},
+        {"countyname": "평년", "price": "9,999"},
+    ]}}) == 1200
+    assert parse_kamis_latest_price({"data": ["001"]}) is None
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_against_fake_kamis(engine, kamis_server, monkeypatch):
+    """ 품목별 1회 요청, 응답 캐시, 동시 요청 제한, 가격 일괄 변경 테스트 """
+    monkeypatch.setattr("service.kamis_sync.kamis_response_cache", MemoryCache())
+    monkeypatch.setattr("service.kamis_sync.KAMIS_SYNC_CONCURRENCY", 2)
+    monkeypatch.setattr("service.product.bump_catalog_version", lambda: asyncio.sleep(0))
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    async with httpx.AsyncClient() as client:
+        service = KamisSyncService(
+            kamis_mapping_repository=KamisProductMappingRepository(session=AsyncSession(engine)),
+            product_service=ProductService(product_repository=ProductRepository(session=AsyncSession(engine))),
+            kamis_service=KamisService(cert_key="key", cert_id="id", client=client, base_url=kamis_server.url)
+        )
+
+        preview = await service.sync_prices(date(2024, 1, 1), date(2024, 1, 3), dry_run=True)
+        statements.clear()
+        result = await service.sync_prices(date(2024, 1, 1), date(2024, 1, 3))
+
+    # 두 번째 동기화는 캐시를 사용하고, 실패한 품목(245)만 다시 요청
+    assert len(kamis_server.requests) == 4
+    assert kamis_server.max_active <= 2
+    assert {x["p_startday"] for x in kamis_server.requests} == {"2024-01-01"}
+
+    assert [(x.product_id, x.new_price) for x in result.changes] == [(1, 8000), (2, 1200)]
+    assert result.changes == preview.changes
+    assert result.missing_items == ["200-246-00"]
+    assert result.failed_items == ["200-245-00"]
+    assert len([x for x in statements if x.startswith("UPDATE")]) == 1
+
+    products = {x.id: x.price for x in await ProductRepository(session=AsyncSession(engine)).get_all_products()}
+    assert products == {1: 8000, 2: 1200, 3: 5000, 4: 1000}
@@ -0,0 +1,71 @@
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from core.middleware import RequestMiddleware, BlacklistMiddleware, URLPatternCheckMiddleware, IpBanMiddleware, \
+    request_id_context, method_context, url_context, ip_context
+from service.ip_ban import ip_ban_list
+
+app = FastAPI()
+
+
+@app.get("/api/v1/context")
+async def get_context():
+    return {"request_id": request_id_context.get(), "method": method_context.get(),
+            "url": url_context.get(), "ip": ip_context.get()}
+
+
+@app.get("/api/v1/stream")
+async def get_stream():
+    async def content():
+        for i in range(3):
+            yield f"{i}".encode()
+    return StreamingResponse(content())
+
+
+app.add_middleware(RequestMiddleware)
+app.add_middleware(BlacklistMiddleware)
+app.add_middleware(URLPatternCheckMiddleware, excluded_paths=["/health"])
+client = TestClient(app)
+
+
+def test_request_context_visible_in_endpoint():
+    result = client.get("/api/v1/context").json()
+
+    assert result["request_id"] and result["method"] == "GET"
+    assert result["url"].endswith("/api/v1/context")
+    assert request_id_context.get() is None
+
+
+def test_blacklist_and_url_pattern():
+    blacklist_client = TestClient(BlacklistMiddleware(app))
+
+    assert blacklist_client.get("/.env").status_code == 403
+    assert client.get("/.env").json() == {"error": "Not Found"}
+    assert client.get("/api/v1/stream").content == b"012"
+
+
+@pytest.mark.asyncio
+async def test_banned_ip_rejected_before_app(monkeypatch):
+    """ 차단된 IP 는 Redis 조회 없이 worker 메모리 목록으로 거절, 만료되면 다시 허용 """
+    monkeypatch.setattr(ip_ban_list, "banned", {"10.0.0.1": time.time() + 60, "10.0.0.2": time.time() - 1})
+    monkeypatch.setattr(ip_ban_list, "rejected", 0)
+    calls = []
+
+    async def inner_app(scope, receive, send):
+        calls.append(scope["path"])
+        await app(scope, receive, send)
+
+    async def request(ip):
+        transport = httpx.ASGITransport(app=IpBanMiddleware(inner_app), client=(ip, 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.get("/api/v1/stream")
+
+    assert (await request("10.0.0.1")).status_code == 403
+    assert (await request("10.0.0.2")).status_code == 200
+    assert calls == ["/api/v1/stream"]
+    assert ip_ban_list.rejected == 1 and "10.0.0.2" not in ip_ban_list.banned
@@ -0,0 +1,98 @@
+import pytest
+from redis.exceptions import RedisError
+
+from service.price_table import PriceTable
+from service.quotation_cache import CATALOG_VERSION_KEY
+from tests.conftest import fake_redis
+
+
+class Loader:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.rows
+
+
+class UnavailableRedis:
+    async def get(self, key):
+        raise RedisError("connection refused")
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    return fake_redis(monkeypatch, "service.price_table")
+
+
+@pytest.mark.asyncio
+async def test_price_table_lookup_and_invalidate(redis):
+    """ 가격표 조회는 메모리에서 처리하고, 만료 후에만 다시 읽는지 테스트 """
+    loader = Loader([(i, i * 10) for i in range(1, 100_001)])
+    table = PriceTable(loader)
+
+    assert await table.get_prices([1, 500, 100_000]) == {1: 10, 500: 5000, 100_000: 1_000_000}
+    assert await table.get_price(42) == 420
+    assert loader.calls == 1
+    assert table.ids.itemsize * len(table.ids) + table.prices.itemsize * len(table.prices) == 16 * 100_000
+
+    loader.rows = [(1, 11)]
+    table.invalidate()
+    assert await table.get_price(1) == 11
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_price_table_missing_product_reload_throttled(redis, monkeypatch):
+    """ 가격표에 없는 제품은 최소 간격을 두고 한 번만 다시 읽는지 테스트 """
+    loader = Loader([(1, 10)])
+    table = PriceTable(loader)
+    await table.get_prices([1])
+
+    loader.rows = [(1, 10), (2, 20)]
+    assert await table.get_prices([1, 2]) == {1: 10}
+    assert loader.calls == 1
+
+    monkeypatch.setattr("service.price_table.PRICE_TABLE_MISS_RELOAD_INTERVAL", 0)
+    assert await table.get_prices([1, 2]) == {1: 10, 2: 20}
+    assert await table.get_prices([3]) == {}
+    assert loader.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_price_table_reloads_on_catalog_version_change(redis, monkeypatch):
+    """ pub/sub 알림 없이도 Redis 의 catalog version 이 바뀌면 확인 간격 후 다시 읽는지 테스트 """
+    await redis.set(CATALOG_VERSION_KEY, 1)
+    loader = Loader([(1, 10)])
+    table = PriceTable(loader)
+    assert await table.get_price(1) == 10
+    assert table.catalog_version == "1"
+
+    loader.rows = [(1, 11)]
+    await redis.incr(CATALOG_VERSION_KEY)
+    assert await table.get_price(1) == 10
+    assert loader.calls == 1
+
+    monkeypatch.setattr("service.price_table.PRICE_TABLE_VERSION_CHECK_INTERVAL", 0)
+    assert await table.get_price(1) == 11
+    assert await table.get_price(1) == 11
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_price_table_max_age_without_redis(monkeypatch):
+    """ catalog version 을 확인할 수 없으면 최대 보관 시간이 지난 뒤 다시 읽는지 테스트 """
+    monkeypatch.setattr("service.price_table.redis_client", UnavailableRedis())
+    monkeypatch.setattr("service.price_table.PRICE_TABLE_VERSION_CHECK_INTERVAL", 0)
+    loader = Loader([(1, 10)])
+    table = PriceTable(loader)
+    assert await table.get_price(1) == 10
+    assert table.catalog_version is None
+
+    loader.rows = [(1, 11)]
+    assert await table.get_price(1) == 10
+
+    monkeypatch.setattr("service.price_table.PRICE_TABLE_MAX_AGE", 0)
+    assert await table.get_price(1) == 11
+    assert loader.calls == 2
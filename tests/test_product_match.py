@@ -0,0 +1,41 @@
+import random
+
+from schemas.product import ProductNameMatchMethod
+from service.product_match import match_product_names, base_product_name
+
+CATALOG = [(1, "양파(kg)"), (2, "양파(망)"), (3, "대파"), (4, "깐마늘"), (5, "청양고추"), (6, "애호박")]
+
+
+def test_base_product_name():
+    assert base_product_name(" 청양 고추 (1kg) ") == "청양고추"
+    assert base_product_name("(특)") == "(특)"
+
+
+def test_match_product_names():
+    """ 정확/별칭/공백 차이/유사도 매칭, 동점 후보는 검토 대상, 후보 없으면 매칭 실패 """
+    names = ["대파", "대파(단)", "깐 마늘", "청양고추 (1kg)", "양파", "브로콜리"]
+    matches, ambiguous, unmatched = match_product_names(names, CATALOG, {"대파(단)": 3})
+
+    assert {x.name: (x.product_id, x.method) for x in matches} == {
+        "대파": (3, ProductNameMatchMethod.EXACT),
+        "대파(단)": (3, ProductNameMatchMethod.ALIAS),
+        "깐 마늘": (4, ProductNameMatchMethod.NORMALIZED),
+        "청양고추 (1kg)": (5, ProductNameMatchMethod.FUZZY),
+    }
+    assert [x.name for x in ambiguous] == ["양파"]
+    assert sorted(x.product_id for x in ambiguous[0].candidates) == [1, 2]
+    assert unmatched == ["브로콜리"]
+
+
+def test_match_product_names_large():
+    """ 2,000개 이름 x 20,000개 제품 매칭 시 단위 표기를 제외한 이름으로 모두 찾는지 테스트 """
+    rng = random.Random(0)
+    syllables = [chr(0xAC00 + x) for x in rng.sample(range(11172), 400)]
+    catalog = [(i, f"{''.join(rng.choices(syllables, k=rng.randint(2, 6)))}{i}") for i in range(20000)]
+    names = [f"{name} (1kg)" for _, name in rng.sample(catalog, 2000)]
+
+    matches, ambiguous, unmatched = match_product_names(names, catalog, {})
+
+    product_ids = {f"{name} (1kg)": product_id for product_id, name in catalog}
+    assert {x.name: x.product_id for x in matches} == {name: product_ids[name] for name in names}
+    assert ambiguous == [] and unmatched == []
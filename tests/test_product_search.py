@@ -0,0 +1,120 @@
+import threading
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from models import Product
+from repository.product.product import ProductRepository
+from service.product import ProductService
+from service.product_search import ProductSearchIndex, to_choseong, refresh_product_search_index
+from tests.conftest import fake_redis
+
+
+def build_index():
+    index = ProductSearchIndex()
+    index.build([(1, "양파"), (2, "적양파"), (3, "대파"), (4, "양배추"), (5, "Tomato Ketchup")], "1")
+    return index
+
+
+def test_to_choseong():
+    assert to_choseong("양파 1kg") == "ㅇㅍ 1kg"
+
+
+def test_search_substring_ranks_prefix_and_shorter_first():
+    """ 부분 문자열 검색 시 접두 일치, 짧은 이름 순으로 정렬되는지 테스트 """
+    index = build_index()
+
+    assert [x for x in index.search("양", 10)] == [1, 4, 2]
+    assert [x for x in index.search("파", 2)] == [3, 1]
+    assert [x for x in index.search("tomato ket", 10)] == [5]
+
+
+def test_search_choseong_and_typo():
+    """ 초성 검색과 오타 허용 검색 테스트 """
+    index = build_index()
+
+    assert [x for x in index.search("ㅇㅍ", 10)] == [1, 2]
+    assert [x for x in index.search("tomatoo", 1)] == [5]
+
+
+def test_incremental_update():
+    """ 제품 추가/이름 변경/삭제가 색인에 반영되는지 테스트 """
+    index = build_index()
+
+    index.upsert(3, "쪽파")
+    index.remove(1)
+
+    assert index.search("ㅉㅍ", 10) == [3]
+    assert 3 not in index.search("대파", 10)
+    assert index.search("양파", 10) == [2]
+
+    index.advance_names_version("2")
+    assert index.names_version == "2"
+    index.advance_names_version("4")
+    assert index.names_version == "2"
+
+
+@pytest_asyncio.fixture
+async def engine(engine):
+    async with AsyncSession(engine) as session:
+        session.add_all([
+            Product(id=1, name="양파", category="야채", unit="kg", price=1000),
+            Product(id=2, name="대파", category="야채", unit="단", price=1500),
+        ])
+        await session.commit()
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_price_changes_do_not_rebuild_index(engine, monkeypatch):
+    """ 가격만 바뀐 경우 색인을 다시 만들지 않고, 검색 결과는 DB 의 최신 가격을 반환하는지 테스트 """
+    redis = fake_redis(monkeypatch, "service.product_search", "service.quotation_cache")
+    index = ProductSearchIndex()
+    for module in ("service.product_search", "service.product"):
+        monkeypatch.setattr(f"{module}.product_search_index", index)
+    # 운영 환경의 local_session 과 같이 commit 후에도 객체를 만료시키지 않음
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr("service.product_search.local_session", session_factory)
+    service = ProductService(product_repository=ProductRepository(session=session_factory()))
+
+    await refresh_product_search_index(force=True)
+    assert index.ready and index.names_version == "0"
+
+    rebuilds = []
+
+    async def rebuild(*args):
+        rebuilds.append(args)
+    monkeypatch.setattr(index, "rebuild", rebuild)
+    await service.apply_product_prices({1: 1200})
+    await refresh_product_search_index()
+    assert rebuilds == []
+    assert [(x.id, x.price) for x in await service.search_products_by_prefix("양", 10)] == [(1, 1200)]
+
+    # 이 worker 의 이름 변경은 색인에 바로 반영되고 버전도 따라가므로 재생성하지 않음
+    await service.create_product({"name": "양배추", "category": "야채", "unit": "통", "price": 3000})
+    await refresh_product_search_index()
+    assert rebuilds == [] and index.names_version == "1"
+    assert [x.name for x in await service.search_products_by_prefix("양", 10)] == ["양파", "양배추"]
+
+    # 다른 worker 의 이름 변경은 이름 버전으로 감지해 재생성
+    await redis.incr("catalog:names:version")
+    await refresh_product_search_index()
+    assert len(rebuilds) == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_runs_off_event_loop(monkeypatch):
+    """ 색인 생성은 thread 에서 실행하고 완료 후 교체하는지 테스트 """
+    index = build_index()
+    threads = []
+    built = ProductSearchIndex._built
+    monkeypatch.setattr(ProductSearchIndex, "_built",
+                        staticmethod(lambda names: threads.append(threading.current_thread()) or built(names)))
+
+    await index.rebuild([(7, "깐마늘")], "2")
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert index.search("마늘", 10) == [7] and index.search("양파", 10) == []
+    assert index.names_version == "2"
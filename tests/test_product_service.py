@@ -0,0 +1,359 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from fastapi import UploadFile
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from openpyxl import Workbook
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.response.handler.exception_handler import ServiceException
+from models import Product, User
+from repository.product.product import ProductRepository
+from schemas.upload_job import UploadJobKind, UploadJobStatus
+from service.product import ProductService, classify_product_rows
+from service.product_file import spool_upload, remove_spooled_upload, parse_in_process_pool, shutdown_parse_pool
+from service.product_parser import read_excel_file_about_product_list, read_excel_file_about_vegetable_price_list, \
+    InvalidPriceError
+from service.recent_purchase import RecentPurchaseCounter, recent_purchase_counter, RECENT_PURCHASE_DECAY_EPOCH, \
+    RECENT_PURCHASE_RESCALE_HALF_LIVES
+from service.upload_job import UploadJobService, run_upload_job
+from tests.conftest import fake_redis
+
+
+def write_product_list(path, sheets):
+    workbook = Workbook(write_only=True)
+    for category, rows in sheets.items():
+        sheet = workbook.create_sheet(category)
+        sheet.append(["이름", "단위", "가격"])
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def test_read_product_list_cleans_prices(tmp_path):
+    """ 문자열 가격 변환, 빈 행 제거, 중복 이름은 마지막 행 기준인지 테스트 """
+    file_path = write_product_list(tmp_path / "products.xlsx", {
+        "야채": [["양파", "kg", "1,200"], ["대파", "단", 1500], [None, None, None]],
+        "과일": [["사과", "개", " 2,000 "], ["양파", "망", 9000]],
+    })
+
+    products = read_excel_file_about_product_list(file_path)
+
+    assert sorted(products, key=lambda x: x["name"]) == [
+        {"name": "대파", "unit": "단", "price": 1500, "category": "야채"},
+        {"name": "사과", "unit": "개", "price": 2000, "category": "과일"},
+        {"name": "양파", "unit": "망", "price": 9000, "category": "과일"},
+    ]
+
+
+def test_read_product_list_invalid_price(tmp_path):
+    file_path = write_product_list(tmp_path / "products.xlsx", {"야채": [["양파", "kg", "시가"]]})
+
+    with pytest.raises(InvalidPriceError):
+        read_excel_file_about_product_list(file_path)
+
+
+def test_read_product_list_category_column(tmp_path):
+    """ 분류 열이 있으면 sheet 이름 대신 사용하고, 비어 있는 행은 sheet 이름을 사용하는지 테스트 """
+    file_path = tmp_path / "products.xlsx"
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("과일_국산")
+    for row in [["이름", "단위", "가격", "분류"], ["사과", "개", 700, "과일/국산"], ["배", "개", 900, None]]:
+        sheet.append(row)
+    workbook.save(file_path)
+
+    products = read_excel_file_about_product_list(str(file_path))
+
+    assert [(x["name"], x["category"]) for x in products] == [("사과", "과일/국산"), ("배", "과일_국산")]
+
+
+def test_read_vegetable_price_list(tmp_path):
+    file_path = tmp_path / "vegetables.xlsx"
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in [["양파", "1,200"], ["대파", 1500], [None, None]]:
+        sheet.append(row)
+    workbook.save(file_path)
+
+    assert read_excel_file_about_vegetable_price_list(str(file_path)) == {"양파": 1200, "대파": 1500}
+
+
+def test_classify_product_rows():
+    """ 기존 제품과 비교해 추가/수정/변경 없음 건수를 집계하는지 테스트 """
+    existing = {
+        "양파": Product(name="양파", unit="kg", price=1200, category="야채"),
+        "대파": Product(name="대파", unit="단", price=1000, category="야채"),
+    }
+    rows = [
+        {"name": "양파", "unit": "kg", "price": 1200, "category": "야채"},
+        {"name": "대파", "unit": "단", "price": 1500, "category": "야채"},
+        {"name": "사과", "unit": "개", "price": 2000, "category": "과일"},
+    ]
+
+    changed_rows, counts = classify_product_rows(rows, existing)
+
+    assert [x["name"] for x in changed_rows] == ["대파", "사과"]
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 1}
+
+
+def test_read_large_product_list(tmp_path):
+    """ 20,000행 제품 목록 파싱 테스트 """
+    file_path = write_product_list(tmp_path / "products.xlsx", {
+        f"분류{c}": [[f"물품{c}-{i}", "kg", f"{1000 + i:,}"] for i in range(5000)] for c in range(4)
+    })
+
+    products = read_excel_file_about_product_list(file_path)
+
+    assert len(products) == 20000
+    assert products[-1] == {"name": "물품3-4999", "unit": "kg", "price": 5999, "category": "분류3"}
+
+
+class RecordingSession:
+    """ 실행한 SQL 문만 기록하는 세션 (sqlite 에서 실행할 수 없는 MySQL 전용 문 확인용) """
+    def __init__(self):
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def begin(self):
+        return self
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+@pytest.mark.asyncio
+async def test_upsert_products_on_duplicate_key_update():
+    """ 제품 일괄 저장이 chunk 마다 INSERT ... ON DUPLICATE KEY UPDATE 한 번으로 실행되는지 테스트 """
+    session = RecordingSession()
+    rows = [{"name": f"물품{i}", "unit": "kg", "price": 1000 + i, "category": "야채"} for i in range(2500)]
+
+    await ProductRepository(session=session).upsert_products(rows, chunk_size=1000)
+    compiled = [x.compile(dialect=mysql.dialect()) for x in session.statements]
+
+    assert len(compiled) == 3
+    assert str(compiled[0]).startswith("INSERT INTO products (name, category, unit, price, created_at) VALUES")
+    assert str(compiled[0]).endswith(
+        "ON DUPLICATE KEY UPDATE category = VALUES(category), unit = VALUES(unit), price = VALUES(price), "
+        "updated_at = now()"
+    )
+    assert [len(x.params) // 4 for x in compiled] == [1000, 1000, 500]
+    assert compiled[2].params["name_m499"] == "물품2499"
+
+
+def test_product_name_unique_migration_rejects_duplicates(monkeypatch):
+    """ 이름이 중복된 제품이 있으면 unique index 생성 전에 중복 이름을 알려주며 실패하는지 테스트 """
+    spec = importlib.util.spec_from_file_location(
+        "product_name_unique", Path(__file__).parent.parent / "migrations/versions/f4b6d21c8e57_product_name_unique.py")
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    monkeypatch.setattr(migration, "context", SimpleNamespace(is_offline_mode=lambda: False))
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(50))")
+        conn.exec_driver_sql("CREATE INDEX ix_products_name ON products (name)")
+        conn.exec_driver_sql("INSERT INTO products (name) VALUES ('양파'), ('양파'), ('대파')")
+        with Operations.context(MigrationContext.configure(conn)):
+            with pytest.raises(RuntimeError, match=r"중복된 제품 1건.*양파\(2개\)"):
+                migration.upgrade()
+
+            conn.exec_driver_sql("DELETE FROM products WHERE id = 2")
+            migration.upgrade()
+
+        indexes = inspect(conn).get_indexes("products")
+        assert [(x["name"], x["column_names"], bool(x["unique"])) for x in indexes] == [
+            ("ix_products_name", ["name"], True)
+        ]
+
+
+@pytest_asyncio.fixture
+async def engine(engine):
+    async with AsyncSession(engine) as session:
+        session.add_all([
+            Product(id=1, name="양파", category="야채", unit="kg", price=1000),
+            Product(id=2, name="대파", category="야채", unit="단", price=1500),
+            Product(id=3, name="감자", category="야채", unit="kg", price=2000),
+        ])
+        await session.commit()
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_update_products_price_dry_run_and_apply(engine):
+    """ 가격 일괄 변경: 조회 1회, UPDATE 1회, 찾지 못한 제품 수집, dry_run 시 미반영 테스트 """
+    repository = ProductRepository(session=AsyncSession(engine))
+    prices = {1: 1200, 2: 1500, 3: 1800, 4: 900}
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    preview = await repository.update_products_price(prices, dry_run=True)
+    assert [(x["name"], x["old_price"], x["new_price"]) for x in preview["changes"]] == \
+        [("양파", 1000, 1200), ("감자", 2000, 1800)]
+    assert preview["unchanged"] == 1
+    assert preview["unmatched"] == [4]
+    assert not [x for x in statements if x.startswith("UPDATE")]
+
+    statements.clear()
+    result = await repository.update_products_price(prices)
+    assert result == preview
+    assert len([x for x in statements if x.startswith("SELECT")]) == 1
+    assert len([x for x in statements if x.startswith("UPDATE")]) == 1
+
+    products = {x.name: x.price for x in await repository.get_all_products()}
+    assert products == {"양파": 1200, "대파": 1500, "감자": 1800}
+
+
+@pytest.mark.asyncio
+async def test_search_products_recent_single_query(engine, monkeypatch):
+    """ 최근 구매 물품을 점수 순서대로 한 번의 IN 쿼리로 조회하는지 테스트 (삭제된 물품 제외) """
+    fake_redis(monkeypatch, "service.recent_purchase")
+    service = ProductService(product_repository=ProductRepository(session=AsyncSession(engine)))
+    for product_ids in ([3, 99, 1], [3, 99], [3, 99], [3], [3, 1]):
+        await recent_purchase_counter.record(1, product_ids)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    products = await service.search_products_recent(3, User(client_id=1))
+
+    assert [(x.name, x.count) for x in products] == [("감자", 5), ("양파", 2)]
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_export_products_round_trip(engine, tmp_path):
+    """ 추출한 파일을 업로드 파서가 그대로 읽을 수 있는지 테스트 (sheet 이름으로 쓸 수 없는 분류도 분류 열로 보존) """
+    async with AsyncSession(engine) as session:
+        session.add_all([
+            Product(id=4, name="사과", category="과일/국산", unit="개", price=700),
+            Product(id=5, name="배", category="과일_국산", unit="개", price=900),
+            Product(id=6, name="쌀", category="곡류 " + "가" * 40, unit="포", price=50000),
+        ])
+        await session.commit()
+    service = ProductService(product_repository=ProductRepository(session=AsyncSession(engine)))
+
+    content, filename = await service.export_products()
+    file_path = tmp_path / filename
+    with open(file_path, "wb") as file:
+        async for chunk in content:
+            file.write(chunk)
+
+    products = read_excel_file_about_product_list(str(file_path))
+    assert sorted((x["category"], x["name"], x["unit"], x["price"]) for x in products) == [
+        ("곡류 " + "가" * 40, "쌀", "포", 50000),
+        ("과일/국산", "사과", "개", 700), ("과일_국산", "배", "개", 900),
+        ("야채", "감자", "kg", 2000), ("야채", "대파", "단", 1500), ("야채", "양파", "kg", 1000),
+    ]
+
+
+def test_recent_purchase_weight_halves_per_half_life():
+    counter = RecentPurchaseCounter(half_life_days=30)
+    now = RECENT_PURCHASE_DECAY_EPOCH + 86400 * 90
+
+    assert counter.weight(now) / counter.weight(now - 86400 * 30) == pytest.approx(2)
+    assert RecentPurchaseCounter(half_life_days=0).weight(now) == 1
+
+
+def test_recent_purchase_weight_bounded():
+    """ 기준 시각에서 오래 지나도 가중치가 주기 안에서만 커지는지 테스트 (반감기 1일, 1024일 부근) """
+    counter = RecentPurchaseCounter(half_life_days=1)
+    for days in (1023.9, 1024, 1024.1, 50 * 365):
+        period, weight = counter.decay(RECENT_PURCHASE_DECAY_EPOCH + 86400 * days)
+        assert 1 <= weight < 2 ** RECENT_PURCHASE_RESCALE_HALF_LIVES
+        assert period == int(days // RECENT_PURCHASE_RESCALE_HALF_LIVES)
+
+
+@pytest.mark.asyncio
+async def test_recent_purchase_rank_carried_over_period(monkeypatch):
+    """ 감쇠 주기가 바뀌어도 이전 주기의 점수가 같은 비율로 이어지는지 테스트 """
+    redis = fake_redis(monkeypatch, "service.recent_purchase")
+    counter = RecentPurchaseCounter(half_life_days=1)
+    boundary = RECENT_PURCHASE_DECAY_EPOCH + 86400 * RECENT_PURCHASE_RESCALE_HALF_LIVES * 32
+
+    # 주기 직전에 3번 구매한 물품은 주기 직후 1번 구매한 물품보다 앞서고, 반감기 2번 뒤의 구매 2번보다는 뒤
+    await counter.record(1, [1, 1, 1], now=boundary - 1)
+    await counter.record(1, [2], now=boundary + 1)
+    assert await counter.top(1, 2, now=boundary + 1) == [(1, 3), (2, 1)]
+    assert not await redis.exists(counter.rank_key(1, 31))
+    assert await redis.zscore(counter.rank_key(1, 32), 1) == pytest.approx(3, rel=1e-4)
+
+    await counter.record(1, [2], now=boundary + 86400 * 2)
+    assert await counter.top(1, 2, now=boundary + 86400 * 2) == [(2, 2), (1, 3)]
+
+
+@pytest.mark.asyncio
+async def test_upload_spooled_and_parsed_in_process_pool(tmp_path, monkeypatch):
+    """ 업로드 파일을 chunk 단위로 임시 파일에 저장하고 별도 프로세스에서 파싱하는지 테스트 """
+    source_path = write_product_list(tmp_path / "source.xlsx", {"야채": [["양파", "kg", "1,200"]]})
+    invalid_path = write_product_list(tmp_path / "invalid.xlsx", {"야채": [["양파", "kg", "시가"]]})
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    monkeypatch.setattr("service.product_file.UPLOAD_SPOOL_CHUNK_SIZE", 1024)
+
+    with open(source_path, "rb") as source:
+        file_path = await spool_upload(UploadFile(source, filename="products.xlsx"))
+
+    try:
+        products = await parse_in_process_pool(read_excel_file_about_product_list, file_path)
+        with pytest.raises(ServiceException):
+            await parse_in_process_pool(read_excel_file_about_product_list, invalid_path)
+    finally:
+        shutdown_parse_pool()
+
+    assert Path(file_path).parent == tmp_path and file_path.endswith(".xlsx")
+    assert open(file_path, "rb").read() == open(source_path, "rb").read()
+    assert products == [{"name": "양파", "unit": "kg", "price": 1200, "category": "야채"}]
+
+    remove_spooled_upload(file_path)
+    remove_spooled_upload(file_path)
+    assert not Path(file_path).exists()
+
+
+@pytest.mark.asyncio
+async def test_spooled_upload_removed_after_parsing(tmp_path, monkeypatch):
+    """ 동기 업로드와 업로드 작업 모두 파싱이 실패해도 임시 파일을 삭제하는지 테스트 """
+    invalid_path = write_product_list(tmp_path / "invalid.xlsx", {"야채": [["양파", "kg", "시가"]]})
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr("tempfile.tempdir", str(spool_dir))
+    fake_redis(monkeypatch, "service.upload_job")
+    monkeypatch.setattr("service.upload_job.upload_job_worker.enqueue", AsyncMock())
+
+    try:
+        with open(invalid_path, "rb") as source:
+            with pytest.raises(ServiceException):
+                await ProductService(product_repository=None).upload_products(UploadFile(source, filename="a.xlsx"))
+        assert list(spool_dir.iterdir()) == []
+
+        with open(invalid_path, "rb") as source:
+            job = await UploadJobService().submit_job(UploadFile(source, filename="a.xlsx"), UploadJobKind.PRODUCT)
+        assert len(list(spool_dir.iterdir())) == 1
+        await run_upload_job(job.job_id)
+    finally:
+        shutdown_parse_pool()
+
+    assert (await UploadJobService().get_job(job.job_id)).status == UploadJobStatus.FAILED
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_product_parser_imports_only_pandas():
+    """ 프로세스 풀의 자식 프로세스가 파서를 불러올 때 fastapi/DB 모듈을 import 하지 않는지 테스트 """
+    code = "import sys, service.product_parser; print(sorted({'fastapi', 'sqlalchemy', 'core'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,440 @@
+import io
+import zipfile
+from datetime import date, datetime
+from unittest.mock import patch, AsyncMock
+
+import pytest
+import pytest_asyncio
+from openpyxl import load_workbook
+from sqlalchemy import event, update
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.response.handler.exception_handler import GeneralException, ServiceException
+from core.utils import encode_cursor, decode_cursor
+from models import Client, Product, Quotation, QuotationProduct
+from repository.quotation.quotation import QuotationRepository, name_search_condition
+from repository.quotation.quotation_product import QuotationProductRepository
+from schemas.quotation import ProductInput, QuotationUpdate, QuotationInfo
+from service.quotation import QuotationService
+from service.quotation_cache import QuotationInfoCache, bump_catalog_version
+from tests.conftest import fake_redis
+
+
+@pytest_asyncio.fixture
+async def seeded_quotations(engine):
+    """ 물품 1개 견적서(id=1)와 물품 30개 견적서(id=2) 생성 """
+    async with AsyncSession(engine) as session:
+        session.add(Client(id=1, name="상호명", address="서울"))
+        session.add_all([
+            Product(id=i, name=f"물품{i}", category="야채", unit="kg", price=1000 + i)
+            for i in range(1, 31)
+        ])
+        session.add(Quotation(id=1, client_id=1, name="2024/05/01-상호명", total_price=0, input_date=date(2024, 5, 1)))
+        session.add(Quotation(id=2, client_id=1, name="2024/05/02-상호명", total_price=0, input_date=date(2024, 5, 2)))
+        session.add(QuotationProduct(quotation_id=1, product_id=1, price=1001, quantity=1))
+        session.add_all([
+            QuotationProduct(quotation_id=2, product_id=i, price=(1000 + i) * 2, quantity=2)
+            for i in range(1, 31)
+        ])
+        await session.commit()
+    return engine
+
+
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_get_quotation_info_query_count(seeded_quotations):
+    """ 견적서 물품 개수와 관계없이 견적서 정보 조회 쿼리 수가 일정한지 테스트 """
+    engine = seeded_quotations
+    statements = count_queries(engine)
+
+    query_counts = {}
+    for quotation_id, line_count in ((1, 1), (2, 30)):
+        cache = AsyncMock()
+        cache.get.return_value = (None, "0")
+        statements.clear()
+        service = QuotationService(
+            quotation_repository=QuotationRepository(session=AsyncSession(engine)),
+            quotation_product_repository=None,
+            product_repository=None,
+            client_repository=None,
+            kakao_service=None
+        )
+        with patch("service.quotation.quotation_info_cache", cache):
+            quotation_info = await service.get_quotation_info(quotation_id)
+
+        assert len(quotation_info.products) == line_count
+        cache.set.assert_awaited_once()
+        query_counts[quotation_id] = len(statements)
+
+    assert query_counts[1] == query_counts[2] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_quotation_info_cache_hit_skips_database(seeded_quotations, monkeypatch):
+    """ 견적서 조회 캐시 적중 시 DB 조회 없이 반환되고, 카탈로그 버전이 바뀌면 다시 조회하는지 테스트 """
+    engine = seeded_quotations
+    fake_redis(monkeypatch, "service.quotation_cache")
+    cache = QuotationInfoCache()
+    monkeypatch.setattr("service.quotation.quotation_info_cache", cache)
+    service = QuotationService(
+        quotation_repository=QuotationRepository(session=AsyncSession(engine)),
+        quotation_product_repository=None,
+        product_repository=None,
+        client_repository=None,
+        kakao_service=None
+    )
+    quotation_info = await service.get_quotation_info(2)
+
+    statements = count_queries(engine)
+    cached_info = await service.get_quotation_info(2)
+
+    assert cached_info == quotation_info
+    assert statements == []
+
+    await bump_catalog_version()
+    assert await service.get_quotation_info(2) == quotation_info
+    assert len(statements) == 1
+
+    metrics = cache.metrics()
+    assert (metrics.hits, metrics.misses, metrics.stale) == (1, 2, 1)
+    assert metrics.hit_rate == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_quotation_info_cache_ignores_document_invalidated_during_read(seeded_quotations, monkeypatch):
+    """ DB 조회 도중 견적서가 변경되면 조회 결과가 캐시되어도 다음 조회에서 사용되지 않는지 테스트 """
+    fake_redis(monkeypatch, "service.quotation_cache")
+    cache = QuotationInfoCache()
+    repository = QuotationRepository(session=AsyncSession(seeded_quotations))
+    _, products = await repository.get_quotation_with_products(1)
+    stale_info = QuotationInfo(products=products, name="이전 이름", total=0, status="CREATED",
+                               input_date=date(2024, 5, 1), created_at=datetime(2024, 5, 1), updated_at=None)
+
+    cached_info, version = await cache.get(1)
+    # 조회 요청이 DB를 읽은 뒤 캐시에 저장하기 전에 수정 요청이 무효화
+    await cache.invalidate(1)
+    await cache.set(1, stale_info, version)
+
+    assert cached_info is None
+    assert (await cache.get(1))[0] is None
+    assert cache.metrics().stale == 1
+
+    _, version = await cache.get(1)
+    await cache.set(1, stale_info, version)
+    assert (await cache.get(1))[0] == stale_info
+
+
+@pytest.mark.asyncio
+async def test_get_quotation_with_products_not_found(seeded_quotations):
+    """ 존재하지 않는 견적서 조회 시 빈 결과 반환 테스트 """
+    repository = QuotationRepository(session=AsyncSession(seeded_quotations))
+
+    quotation, products = await repository.get_quotation_with_products(999)
+
+    assert quotation is None
+    assert products == []
+
+
+@pytest.mark.asyncio
+async def test_stream_today_quotations_to_zip(seeded_quotations):
+    """ 스트리밍으로 전송한 zip 파일에 해당 날짜의 견적서 excel 파일이 모두 들어있는지 테스트 """
+    engine = seeded_quotations
+    async with AsyncSession(engine) as session:
+        await session.execute(update(Quotation).values(created_at=datetime(2024, 5, 1, 9)))
+        await session.commit()
+    service = QuotationService(
+        quotation_repository=QuotationRepository(session=AsyncSession(engine)),
+        quotation_product_repository=None,
+        product_repository=None,
+        client_repository=None,
+        kakao_service=None
+    )
+
+    chunks, filename = await service.stream_today_quotations_to_zip(date(2024, 5, 1))
+    chunks = [chunk async for chunk in chunks]
+
+    assert filename == "minifood_2024-05-01.zip"
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        assert sorted(zip_file.namelist()) == ["2024/05/01-상호명 견적서.xlsx", "2024/05/02-상호명 견적서.xlsx"]
+        rows = list(load_workbook(io.BytesIO(zip_file.read("2024/05/02-상호명 견적서.xlsx"))).active.values)
+
+    assert rows[0] == ("물품", "수량", "단가")
+    assert len(rows) == 31
+    assert rows[1] == ("물품1", "2", "2002")
+
+
+def test_cursor_round_trip():
+    """ 페이지네이션 cursor 변환 및 잘못된 cursor 거부 테스트 """
+    created_at = datetime(2024, 5, 1, 9, 30, 15)
+
+    assert decode_cursor(encode_cursor(created_at, 7)) == (created_at, 7)
+    for cursor in ("not-a-cursor", encode_cursor(created_at, 7)[:-4]):
+        with pytest.raises(GeneralException):
+            decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_and_count_cache(seeded_quotations, monkeypatch):
+    """ (created_at, id) keyset 페이지가 중복/누락 없이 이어지고, 삭제 시 개수 캐시가 무효화되는지 테스트 """
+    engine = seeded_quotations
+    async with AsyncSession(engine) as session:
+        # 같은 created_at 을 가진 견적서가 페이지 경계에 걸치도록 생성
+        session.add_all([
+            Quotation(id=i, client_id=1, name=f"견적서{i}", total_price=0, input_date=date(2024, 5, 1),
+                      created_at=datetime(2024, 5, 1 + i % 3, 9))
+            for i in range(3, 26)
+        ])
+        await session.execute(
+            update(Quotation).where(Quotation.id.in_([1, 2])).values(created_at=datetime(2024, 5, 2, 9)))
+        await session.commit()
+    fake_redis(monkeypatch, "service.quotation", "service.quotation_cache")
+    service = QuotationService(
+        quotation_repository=QuotationRepository(session=AsyncSession(engine)),
+        quotation_product_repository=None,
+        product_repository=None,
+        client_repository=None,
+        kakao_service=None
+    )
+
+    pages, cursor = [], None
+    while True:
+        page = await service.get_paginated_quotations_for_client(1, cursor, page_size=10, include_total=True)
+        pages.append([x.id for x in page.items])
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    created_day = {i: 1 + i % 3 for i in range(3, 26)} | {1: 2, 2: 2}
+    assert [len(x) for x in pages] == [10, 10, 5]
+    assert sum(pages, []) == sorted(created_day, key=lambda x: (created_day[x], x), reverse=True)
+    assert page.total == 25
+
+    range_page = await service.get_paginated_quotations_by_date_range(
+        1, date(2024, 5, 2), date(2024, 5, 2), include_total=True)
+    assert range_page.total == 10
+
+    await service.delete_quotation(4)
+
+    page = await service.get_paginated_quotations_for_client(1, include_total=True)
+    assert page.total == 24
+    range_page = await service.get_paginated_quotations_by_date_range(
+        1, date(2024, 5, 2), date(2024, 5, 2), include_total=True)
+    assert range_page.total == 9
+
+
+def test_name_search_condition():
+    """ ngram 토큰 길이 이상의 검색어는 FULLTEXT 인덱스(boolean mode 구문 검색)를 사용하는지 테스트 """
+    condition = str(name_search_condition('상호"명').compile(dialect=mysql.dialect()))
+    short_condition = str(name_search_condition("상").compile(dialect=mysql.dialect()))
+
+    assert condition == "MATCH (quotations.name) AGAINST (%s IN BOOLEAN MODE)"
+    assert name_search_condition('상호"명').right.value == '"상호명"'
+    assert "LIKE" in short_condition
+    # 따옴표/공백만 있는 검색어는 빈 부분 일치(전체 견적서)가 되지 않도록 거부
+    for query in ['""', " ", '" "']:
+        with pytest.raises(ValueError):
+            name_search_condition(query)
+
+
+@pytest.mark.asyncio
+async def test_search_quotations_by_name_pages(seeded_quotations, monkeypatch):
+    """ 이름 검색이 최신순으로 limit 개씩 반환되고, 페이지 사이에 추가된 견적서로 중복/누락이 생기지 않는지 테스트 """
+    engine = seeded_quotations
+    # sqlite 에는 FULLTEXT 인덱스가 없으므로 부분 일치 검색으로 확인
+    monkeypatch.setattr("repository.quotation.quotation.NGRAM_TOKEN_SIZE", 100)
+    async with AsyncSession(engine) as session:
+        session.add_all([
+            Quotation(id=i, client_id=1, name=f"2024/05/{i:02d}-{'상호명' if i % 2 else '다른곳'}", total_price=0,
+                      input_date=date(2024, 5, i), created_at=datetime(2024, 5, i, 9))
+            for i in range(3, 12)
+        ])
+        await session.commit()
+    service = QuotationService(
+        quotation_repository=QuotationRepository(session=AsyncSession(engine)),
+        quotation_product_repository=None,
+        product_repository=None,
+        client_repository=None,
+        kakao_service=None
+    )
+
+    first_page = await service.search_quotations_by_name("상호명", limit=3)
+    async with AsyncSession(engine) as session:
+        session.add(Quotation(id=12, client_id=1, name="2024/05/12-상호명", total_price=0, input_date=date(2024, 5, 12)))
+        await session.commit()
+    second_page = await service.search_quotations_by_name("상호명", cursor=first_page.next_cursor, limit=3)
+    last_page = await service.search_quotations_by_name("상호명", cursor=second_page.next_cursor, limit=3)
+
+    assert [x.id for x in first_page.items] == [11, 9, 7]
+    assert [x.id for x in second_page.items] == [5, 3, 2]
+    assert [x.id for x in last_page.items] == [1]
+    assert first_page.has_next and second_page.has_next and not last_page.has_next
+    assert last_page.next_cursor is None
+
+    ranged = await service.search_quotations_by_name("상호명", start="2024-05-05", end="2024-05-09")
+    assert [x.id for x in ranged.items] == [9, 7, 5]
+
+    with pytest.raises(GeneralException):
+        await service.search_quotations_by_name("상호명", cursor=encode_cursor(datetime(2024, 5, 1), 3))
+    with pytest.raises(ServiceException):
+        await service.search_quotations_by_name('" "')
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_quotation_product_single_insert(seeded_quotations):
+    """ 견적서 물품 일괄 추가가 단일 INSERT로 처리되는지 테스트 """
+    engine = seeded_quotations
+    repository = QuotationProductRepository(session=AsyncSession(engine))
+    statements = count_queries(engine)
+
+    await repository.bulk_create_quotation_product([
+        QuotationProduct(quotation_id=1, product_id=i, price=1000 + i, quantity=1)
+        for i in range(2, 31)
+    ])
+
+    inserts = [x for x in statements if x.startswith("INSERT")]
+    assert len(inserts) == 1
+
+    existing_keys = await repository.get_existing_quotation_product_keys([(1, 2), (1, 30), (2, 31)])
+    assert sorted(existing_keys) == [(1, 2), (1, 30)]
+
+
+@pytest.mark.asyncio
+async def test_total_price_maintained_by_delta(seeded_quotations):
+    """ 견적서 물품 추가/수정/삭제 시 견적서 합계 금액이 함께 갱신되는지 테스트 """
+    engine = seeded_quotations
+    quotation_repository = QuotationRepository(session=AsyncSession(engine))
+    quotation_product_repository = QuotationProductRepository(session=AsyncSession(engine))
+
+    # 시드 데이터는 합계 금액이 0으로 저장되어 있어 보정 대상
+    drifts = await quotation_repository.reconcile_total_prices(dry_run=True)
+    assert sorted(x["quotation_id"] for x in drifts) == [1, 2]
+    assert await quotation_repository.get_total_price(1) == 0
+
+    await quotation_repository.reconcile_total_prices()
+    assert await quotation_repository.reconcile_total_prices(dry_run=True) == []
+    assert await quotation_repository.get_total_price(1) == 1001
+
+    await quotation_product_repository.bulk_create_quotation_product([
+        QuotationProduct(quotation_id=1, product_id=2, price=2004, quantity=2)
+    ])
+    assert await quotation_repository.get_total_price(1) == 3005
+
+    await quotation_product_repository.update_quotation_product(1, 2, {"quantity": 1, "price": 1002})
+    assert await quotation_repository.get_total_price(1) == 2003
+
+    await quotation_repository.delete_quotation_product(1, 1)
+    assert await quotation_repository.get_total_price(1) == 1002
+
+    assert await quotation_repository.reconcile_total_prices(dry_run=True) == []
+
+
+LARGE_QUOTATION_COUNT = 2_000
+
+
+@pytest_asyncio.fixture
+async def large_quotations(engine):
+    """ 1000개 거래처에 걸친 견적서 생성 (인덱스는 적재 후 생성, ANALYZE 통계로 실행 계획을 고정하므로 수천 건이면 충분) """
+    indexes = Quotation.__table__.indexes
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(index.drop)
+        await conn.exec_driver_sql(
+            "WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq WHERE x < 1000) "
+            "INSERT INTO clients (id, name, address) SELECT x, 'client' || x, 'address' FROM seq"
+        )
+        await conn.exec_driver_sql(
+            f"WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq WHERE x < {LARGE_QUOTATION_COUNT}) "
+            "INSERT INTO quotations (id, client_id, name, total_price, status, input_date, created_at) "
+            "SELECT x, x % 1000 + 1, 'quotation' || x, 0, 'CREATED', "
+            "date('2024-01-01', '+' || (x % 365) || ' days'), "
+            "datetime('2024-01-01', '+' || (x % 365) || ' days', '+' || (x % 86400) || ' seconds') FROM seq"
+        )
+        for index in indexes:
+            await conn.run_sync(index.create)
+        await conn.exec_driver_sql("ANALYZE")
+    return engine
+
+
+async def explain_query_plans(engine, call):
+    """ repository 호출 시 실행된 SELECT 문의 실행 계획 목록 반환 """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    await call()
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append(" / ".join(row[-1] for row in result.all()))
+    return plans
+
+
+@pytest.mark.asyncio
+async def test_date_lookups_use_index(large_quotations):
+    """ 날짜 기반 견적서 조회가 전체 테이블 스캔 없이 인덱스를 사용하는지 테스트 """
+    engine = large_quotations
+    repository = QuotationRepository(session=AsyncSession(engine))
+    lookups = {
+        "get_today_quotation_ids": lambda: repository.get_today_quotation_ids(date(2024, 3, 1)),
+        "get_quotation_by_client_and_date":
+            lambda: repository.get_quotation_by_client_and_date(7, date(2024, 3, 1)),
+        "exist_quotation_by_client_id_and_today_date":
+            lambda: repository.exist_quotation_by_client_id_and_today_date(7, date(2024, 3, 1)),
+    }
+
+    for name, call in lookups.items():
+        plans = await explain_query_plans(engine, call)
+
+        assert plans, name
+        for plan in plans:
+            assert "SCAN quotations" not in plan, f"{name}: {plan}"
+            assert "USING" in plan and "INDEX" in plan, f"{name}: {plan}"
+
+
+@pytest.mark.asyncio
+async def test_update_quotation_writes_only_changed_lines(seeded_quotations):
+    """ 견적서 수정 시 변경된 물품만 INSERT/UPDATE/DELETE 하는지 테스트 """
+    engine = seeded_quotations
+    repository = QuotationRepository(session=AsyncSession(engine))
+    _, products = await repository.get_quotation_with_products(2)
+
+    # 1번 물품 수량 변경, 30번 물품 삭제, 나머지 유지
+    lines = [
+        ProductInput(id=x["id"], price=x["price"], quantity=x["quantity"])
+        for x in products if x["id"] != 30
+    ]
+    lines[0] = ProductInput(id=1, price=1001 * 5, quantity=5)
+    quotation_data = QuotationUpdate(
+        client_id=1, name="2024/05/02-상호명", total_price=0, status="UPDATED", products=lines
+    )
+    statements = count_queries(engine)
+
+    result = await repository.update_quotation(2, quotation_data)
+
+    assert result == {"inserted": 0, "updated": 1, "deleted": 1}
+    assert not [x for x in statements if x.startswith("INSERT")]
+    assert len([x for x in statements if x.startswith("DELETE")]) == 1
+    assert len([x for x in statements if x.startswith("UPDATE quotation_product")]) == 1
+
+    quotation, products = await repository.get_quotation_with_products(2)
+    assert len(products) == 29
+    assert products[0]["quantity"] == 5
+    assert quotation.total_price == sum(x.price for x in lines)
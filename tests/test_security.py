@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from api.dependencies import get_current_user
+from core.middleware import RequestMiddleware
+from core.security import create_access_token, decode_access_token, get_token_payload, VerifiedTokenCache
+from models import User
+from service.user import UserService
+
+
+def test_decode_access_token_verifies_once():
+    token = create_access_token({"sub": "user@minifood.com", "user_id": 1})
+
+    with patch("core.security.jwt.decode", wraps=jwt.decode) as decode:
+        assert decode_access_token(token)["user_id"] == 1
+        assert decode_access_token(token)["sub"] == "user@minifood.com"
+    assert decode.call_count == 1
+    assert get_token_payload("invalid") is None
+
+
+def test_verified_token_cache_bounded_by_exp_and_size():
+    cache = VerifiedTokenCache(max_size=2, ttl=300)
+    cache.set("expired", {"exp": time.time() - 1})
+    cache.set("a", {"exp": time.time() + 60})
+    cache.set("b", {})
+    cache.set("c", {})
+
+    assert cache.get("expired") is None and cache.get("a") is None
+    assert cache.get("b") == {} and cache.get("c") == {}
+
+
+def test_current_user_uses_token_verified_by_middleware():
+    """ middleware 에서 한 번 검증한 결과를 get_current_user 가 재사용 (요청당 검증 1회) """
+    app = FastAPI()
+    user_service = AsyncMock()
+    user_service.get_user_by_email.return_value = User(id=1, email="user@minifood.com")
+    app.dependency_overrides[UserService] = lambda: user_service
+
+    @app.get("/api/v1/me")
+    async def me(current_user: User = Depends(get_current_user)):
+        return {"id": current_user.id}
+
+    app.add_middleware(RequestMiddleware)
+    client = TestClient(app)
+    token = create_access_token({"sub": "user@minifood.com", "user_id": 1}, timedelta(minutes=5))
+
+    with patch("core.security.jwt.decode", wraps=jwt.decode) as decode:
+        assert client.get("/api/v1/me", headers={"access-token": token}).json() == {"id": 1}
+        assert client.get("/api/v1/me", headers={"access-token": "invalid"}).status_code == 401
+    assert decode.call_count == 2